@@ -1,10 +1,14 @@
+import json
+import logging
 from fastapi import APIRouter, HTTPException, Depends
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.responses import event_stream_response, sse_event
 from app.models.chat import ChatMessage, ChatResponse
 from app.services.chat_service import ChatService
 from app.core.database import get_database
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 def get_chat_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> ChatService:
@@ -25,7 +29,9 @@ async def send_message(
     """
     try:
         # Verify the session exists
-        session = await chat_service.collection.find_one({"session_id": message.session_id})
+        session = await chat_service.collection.find_one(
+            {"session_id": message.session_id}, {"_id": 1}
+        )
         if not session:
             raise HTTPException(status_code=404, detail=f"Session {message.session_id} not found")
         
@@ -37,6 +43,36 @@ async def send_message(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/message/stream")
+async def stream_message(
+    message: ChatMessage,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Process a chat message and stream the response as Server-Sent Events.
+    
+    Emits `delta` events with chunks of the assistant message (as the model
+    generates them), then a single `done` event carrying the ChatResponse
+    (`refine`/`finish` code and the complete message), or an `error` event.
+    """
+    session = await chat_service.collection.find_one(
+        {"session_id": message.session_id}, {"_id": 1}
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail=f"Session {message.session_id} not found")
+    
+    async def event_stream():
+        try:
+            async for event in chat_service.stream_message(message.session_id, message.content):
+                name = "done" if isinstance(event, ChatResponse) else "delta"
+                yield sse_event(name, event.model_dump_json())
+        except Exception as e:
+            logger.exception(f"Streaming chat reply for session {message.session_id} failed")
+            yield sse_event("error", json.dumps({"detail": str(e)}))
+    
+    return event_stream_response(event_stream())
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
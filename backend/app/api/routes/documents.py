@@ -2,21 +2,32 @@
 Document generation API endpoints.
 """
 
+import asyncio
+import json
+import logging
+from typing import Set
 from fastapi import APIRouter, HTTPException, Depends
 from app.models.document_generation import (
     GenerateDocumentsRequest,
+    GenerateDocumentsRequestLegacy,
     GenerateDocumentsResponse,
+    GeneratedDocument,
     ProofreadDocumentRequest,
-    ProofreadDocumentResponse,
-    RequiredDocumentInput,
-    ChatMessageInput
+    ProofreadDocumentResponse
 )
-from app.services.document_generation_service import DocumentGenerationService
+from app.services.document_generation_service import (
+    GENERATION_SESSION_PARTS,
+    DocumentGenerationService,
+    generation_summary_message,
+    get_document_generation_service,
+)
+from app.core.responses import event_stream_response, sse_event
 from app.services.session_service import SessionService
 from app.core.database import get_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 def get_session_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> SessionService:
@@ -51,123 +62,131 @@ async def generate_documents(
     ```
     """
     try:
+        doc_service = get_document_generation_service()
+        
         # Fetch session data
-        session_data = await session_service.get_session(request.session_id)
+        session_data = await session_service.get_session(
+            request.session_id, include=GENERATION_SESSION_PARTS
+        )
         if not session_data:
             raise HTTPException(
                 status_code=404,
                 detail=f"Session {request.session_id} not found"
             )
         
-        # Find the foundation in the session's foundation_results
-        foundation = None
-        for f in session_data.foundation_results:
-            if f.get("id") == request.foundation_id:
-                foundation = f
-                break
-        
-        if not foundation:
+        internal_request = doc_service.build_request(session_data, request.foundation_id)
+        if internal_request is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Foundation {request.foundation_id} not found in session results"
             )
         
-        # Extract required documents from foundation
-        antragsprozess = foundation.get("antragsprozess", {})
-        required_docs = antragsprozess.get("required_documents", [])
-        
-        # Log foundation structure for debugging
-        print(f"🔍 Foundation data structure:")
-        print(f"  - Foundation ID: {foundation.get('id')}")
-        print(f"  - Foundation name: {foundation.get('name')}")
-        print(f"  - Has antragsprozess: {bool(antragsprozess)}")
-        print(f"  - Antragsprozess keys: {list(antragsprozess.keys()) if isinstance(antragsprozess, dict) else 'Not a dict'}")
-        print(f"  - Required docs found: {len(required_docs) if required_docs else 0}")
-        
-        # If no required documents found, use default set
-        if not required_docs:
-            print(f"⚠️ No required documents found, using default documents")
-            required_docs = [
-                {
-                    "document_type": "projektbeschreibung",
-                    "description": "Detaillierte Beschreibung des Projekts, seiner Ziele, Zielgruppe und geplanten Wirkung",
-                    "required": True
-                },
-                {
-                    "document_type": "budgetplan",
-                    "description": "Detaillierte Kostenaufstellung mit allen Ausgaben und Einnahmen des Projekts",
-                    "required": True
-                },
-                {
-                    "document_type": "zeitplan",
-                    "description": "Projektzeitplan mit Meilensteinen und wichtigen Terminen",
-                    "required": True
-                }
-            ]
-        
-        # Convert to RequiredDocumentInput format
-        required_documents = [
-            RequiredDocumentInput(
-                document_type=doc.get("document_type", ""),
-                description=doc.get("description", ""),
-                required=doc.get("required", True)
-            )
-            for doc in required_docs
-        ]
-        
-        # Convert chat messages to the format expected by the service
-        # Limit to last 10 messages to reduce token usage
-        recent_messages = session_data.chat_messages[-10:] if len(session_data.chat_messages) > 10 else session_data.chat_messages
-        chat_messages = [
-            ChatMessageInput(
-                role=msg.role,
-                content=msg.content
-            )
-            for msg in recent_messages
-        ]
-        
-        # Build foundation details - only essential information
-        foundation_details = {
-            "purpose": foundation.get("purpose"),
-            "foerderhoehe": foundation.get("foerderhoehe"),
-            "foerderbereich": foundation.get("foerderbereich"),
-        }
-        
-        # Truncate project query if too long (max 500 chars)
-        project_query = session_data.project_query or ""
-        if len(project_query) > 500:
-            project_query = project_query[:500] + "..."
-        
-        # Create the internal request for the service
-        from app.models.document_generation import GenerateDocumentsRequestLegacy
-        internal_request = GenerateDocumentsRequestLegacy(
-            required_documents=required_documents,
-            chat_messages=chat_messages,
-            project_query=project_query,
-            foundation_name=foundation.get("name"),
-            foundation_details=foundation_details
-        )
-        
         # Generate documents
-        doc_service = DocumentGenerationService()
-        generated_docs = await doc_service.generate_documents(internal_request)
+        generated_docs = await doc_service.generate_documents(
+            internal_request, request.session_id, request.foundation_id
+        )
         
         return GenerateDocumentsResponse(
             success=True,
             documents=generated_docs,
-            message=f"Successfully generated {len(generated_docs)} document(s)"
+            message=generation_summary_message(generated_docs)
         )
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Generating documents for session {request.session_id} failed")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate documents: {str(e)}"
         )
 
 
+# Generation tasks outlive dropped stream connections; keep references here
+_generation_tasks: Set[asyncio.Task] = set()
+
+
+async def _generate_and_store(
+    doc_service: DocumentGenerationService,
+    session_service: SessionService,
+    internal_request: GenerateDocumentsRequestLegacy,
+    session_id: str,
+    foundation_id: str,
+    queue: "asyncio.Queue[GeneratedDocument | None]"
+):
+    """Generate documents, persisting each to the session as soon as it is done."""
+    try:
+        async for generated in doc_service.iter_documents(internal_request):
+            await session_service.store_generated_document(session_id, foundation_id, generated)
+            queue.put_nowait(generated)
+    finally:
+        queue.put_nowait(None)
+
+
+@router.post("/generate/stream")
+async def generate_documents_stream(
+    request: GenerateDocumentsRequest,
+    session_service: SessionService = Depends(get_session_service)
+):
+    """
+    Generate application documents, streamed as Server-Sent Events.
+    
+    Emits a `document` event (GeneratedDocument) as soon as each document is
+    finished, then a `done` event with the complete GenerateDocumentsResponse
+    (documents in required order), or an `error` event. Every generated
+    document is stored in the session's `application_documents` when it
+    lands, and generation continues if the client disconnects, so finished
+    documents are never lost.
+    """
+    doc_service = get_document_generation_service()
+    
+    session_data = await session_service.get_session(
+        request.session_id, include=GENERATION_SESSION_PARTS
+    )
+    if not session_data:
+        raise HTTPException(status_code=404, detail=f"Session {request.session_id} not found")
+    
+    internal_request = doc_service.build_request(session_data, request.foundation_id)
+    if internal_request is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Foundation {request.foundation_id} not found in session results"
+        )
+    
+    queue: "asyncio.Queue[GeneratedDocument | None]" = asyncio.Queue()
+    task = asyncio.create_task(_generate_and_store(
+        doc_service,
+        session_service,
+        internal_request,
+        request.session_id,
+        request.foundation_id,
+        queue
+    ))
+    _generation_tasks.add(task)
+    task.add_done_callback(_generation_tasks.discard)
+    
+    async def event_stream():
+        generated_docs = []
+        while (generated := await queue.get()) is not None:
+            generated_docs.append(generated)
+            yield sse_event("document", generated.model_dump_json())
+        
+        try:
+            task.result()
+        except Exception as e:
+            logger.exception(f"Streaming documents for session {request.session_id} failed")
+            yield sse_event("error", json.dumps({"detail": f"Failed to generate documents: {str(e)}"}))
+            return
+        
+        summary = GenerateDocumentsResponse(
+            success=True,
+            documents=doc_service.in_required_order(internal_request, generated_docs),
+            message=generation_summary_message(generated_docs)
+        )
+        yield sse_event("done", summary.model_dump_json())
+    
+    return event_stream_response(event_stream())
+
+
 @router.post("/proofread", response_model=ProofreadDocumentResponse)
 async def proofread_document(request: ProofreadDocumentRequest):
     """
@@ -180,9 +199,12 @@ async def proofread_document(request: ProofreadDocumentRequest):
     - document_text: The current document content
     - document_type: Type of document (e.g., "projektbeschreibung")
     - existing_improvements: Previously suggested improvements (optional)
+    - mode: "full" (default) analyzes the whole text; "diff" only analyzes
+      paragraphs that changed since they were last proofread and merges in
+      the earlier suggestions for unchanged paragraphs
     
     Returns:
-    - List of new improvement suggestions (max 5)
+    - List of improvement suggestions (max 5)
     
     Example:
     ```
@@ -194,11 +216,12 @@ async def proofread_document(request: ProofreadDocumentRequest):
     ```
     """
     try:
-        service = DocumentGenerationService()
+        service = get_document_generation_service()
         improvements = await service.proofread_document(
             document_text=request.document_text,
             document_type=request.document_type,
-            existing_improvements=request.existing_improvements
+            existing_improvements=request.existing_improvements,
+            mode=request.mode
         )
         
         return ProofreadDocumentResponse(
@@ -1,12 +1,31 @@
-from fastapi import APIRouter, HTTPException, Query, Body
+import base64
+import hashlib
+import json
+import logging
+from fastapi import APIRouter, HTTPException, Query, Body, Request, Response
 from typing import List, Optional
-from pydantic import BaseModel
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel, ValidationError
+from app.core.config import settings
 from app.core.database import get_database
+from app.core.responses import (
+    event_stream_response,
+    fast_json_response,
+    sse_event,
+    streaming_json_object,
+)
 from app.models.scores import FoundationScoresResponse
 from app.models.project_description import ProjectDescription, CharitablePurpose
-from app.services.scoring_service import score_foundations
+from app.services.foundation_catalog import get_catalog_version
+from app.services.foundation_projections import FoundationView, projection_for
+from app.services.scoring_service import (
+    ScoringService,
+    score_foundations,
+    stream_foundation_scores,
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 class FoundationScoresRequest(BaseModel):
@@ -14,27 +33,213 @@ class FoundationScoresRequest(BaseModel):
     session_id: str
 
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_STREAM_PAGE_SIZE = 10000
+
+# Views that may be requested by API clients
+LISTING_VIEWS = {FoundationView.LIST, FoundationView.SUMMARY, FoundationView.DETAIL}
+
+# Top-level foundation fields selectable via `fields`
+SPARSE_FIELDS = {
+    "name",
+    "short_description",
+    "long_description",
+    "legal_form",
+    "gemeinnuetzige_zwecke",
+    "past_projects",
+    "antragsprozess",
+    "foerderbereich",
+    "foerderhoehe",
+    "contact",
+    "logo_url",
+    "website",
+}
+
+
+def _encode_cursor(last_id: str) -> str:
+    """Opaque pagination cursor pointing after `last_id`."""
+    return base64.urlsafe_b64encode(json.dumps({"after": last_id}).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> str:
+    """Foundation ID encoded in a cursor from _encode_cursor."""
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))["after"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _sparse_projection(fields: str) -> dict:
+    """Inclusion projection for a comma-separated list of fields."""
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - SPARSE_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return {field: 1 for field in requested}
+
+
+async def _load_session_project(db: AsyncIOMotorDatabase, session_id: str) -> ProjectDescription:
+    """
+    The session's project description, validated like the scoring job does.
+
+    Raises 404 if the session does not exist, 409 if it has no project
+    description yet and 400 if the stored description is invalid.
+    """
+    session = await db.sessions.find_one(
+        {"session_id": session_id}, {"project_description": 1}
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not session.get("project_description"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Session {session_id} has no project description yet"
+        )
+    try:
+        return ProjectDescription(**session["project_description"])
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid project description: {e}")
+
+
 @router.get("/")
-async def get_foundations():
+async def get_foundations(
+    request: Request,
+    response: Response,
+    view: FoundationView = Query(
+        FoundationView.LIST,
+        description="Fields to return: list (cards), summary (up to 3 past projects) or detail (full documents)"
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated top-level fields to return (overrides view)"
+    ),
+    purpose: Optional[List[str]] = Query(
+        None,
+        description="Charitable purposes (gemeinnuetzige_zwecke), matches ANY"
+    ),
+    scope: Optional[str] = Query(None, description="foerderbereich.scope, e.g. local"),
+    category: Optional[str] = Query(None, description="foerderhoehe.category, e.g. medium"),
+    min_amount: Optional[float] = Query(
+        None, ge=0, description="Only foundations funding at least this amount"
+    ),
+    max_amount: Optional[float] = Query(
+        None, ge=0, description="Only foundations whose minimum funding is at most this amount"
+    ),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=MAX_STREAM_PAGE_SIZE,
+        description=f"Page size (default {DEFAULT_PAGE_SIZE}, max {MAX_PAGE_SIZE}; streamed responses are unpaged by default)"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    stream: bool = Query(
+        False,
+        description="Stream the page as it is read from MongoDB (for large pages)"
+    ),
+):
     """
-    Get all foundations with embedded projects.
-    Returns foundations with their past projects included.
+    List foundations page by page (keyset pagination on the foundation ID).
+    
+    Pass the returned `next_cursor` to fetch the next page; it is null on the
+    last page. Responses carry an ETag derived from the catalog version and
+    the query, so a request with a matching `If-None-Match` returns 304.
+    Use `view=detail` to include all embedded past projects.
+    
+    With `stream=true` foundations are serialized one by one as they come
+    off the database cursor instead of building the whole page in memory.
     """
+    if view not in LISTING_VIEWS:
+        raise HTTPException(status_code=400, detail=f"Unsupported view: {view}")
+    if limit is None:
+        limit = MAX_STREAM_PAGE_SIZE if stream else DEFAULT_PAGE_SIZE
+    elif not stream and limit > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit must be at most {MAX_PAGE_SIZE} unless stream=true"
+        )
+    
     db = get_database()
     
-    # Fetch all foundations (projects are already embedded in the document)
-    cursor = db.foundations.find({})
-    foundations = await cursor.to_list(length=None)
+    # The catalog version changes on every foundation write, so it
+    # identifies the content of any page
+    catalog_version = await get_catalog_version(db)
+    etag_source = json.dumps(
+        [catalog_version, sorted(request.query_params.multi_items())],
+        ensure_ascii=False
+    )
+    etag = f'W/"{hashlib.sha256(etag_source.encode()).hexdigest()[:32]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    query: dict = {}
+    if purpose:
+        query["gemeinnuetzige_zwecke"] = {"$in": purpose}
+    if scope:
+        query["foerderbereich.scope"] = scope
+    if category:
+        query["foerderhoehe.category"] = category
+    if min_amount is not None:
+        query["foerderhoehe.max_amount"] = {"$gte": min_amount}
+    if max_amount is not None:
+        query["foerderhoehe.min_amount"] = {"$lte": max_amount}
+    if cursor:
+        query["_id"] = {"$gt": _decode_cursor(cursor)}
+    
+    projection = _sparse_projection(fields) if fields else projection_for(view)
+    
+    # Fetch one extra document to know whether another page exists
+    db_cursor = db.foundations.find(query, projection).sort("_id", 1).limit(limit + 1)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    
+    if stream:
+        page_state = {"last_id": None, "has_more": False}
+        
+        async def page_items():
+            count = 0
+            async for foundation in db_cursor:
+                if count == limit:
+                    page_state["has_more"] = True
+                    break
+                foundation['id'] = foundation.pop('_id')
+                page_state["last_id"] = foundation['id']
+                count += 1
+                yield foundation
+        
+        return streaming_json_object(
+            {"success": True},
+            "foundations",
+            page_items(),
+            lambda count: {
+                "count": count,
+                "next_cursor": _encode_cursor(page_state["last_id"])
+                if page_state["has_more"] else None
+            },
+            headers=headers
+        )
+    
+    foundations = await db_cursor.to_list(length=limit + 1)
+    has_more = len(foundations) > limit
+    foundations = foundations[:limit]
     
     # Convert _id to id for JSON serialization
     for foundation in foundations:
         foundation['id'] = foundation.pop('_id')
     
-    return {
+    content = {
         "success": True,
         "count": len(foundations),
-        "foundations": foundations
+        "foundations": foundations,
+        "next_cursor": _encode_cursor(foundations[-1]["id"]) if has_more else None
     }
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(content, headers=headers)
+    
+    response.headers.update(headers)
+    return content
 
 
 @router.get("/scores", response_model=FoundationScoresResponse)
@@ -50,17 +255,13 @@ async def get_foundation_scores_get(
     """
     try:
         db = get_database()
-        session = await db.sessions.find_one({"session_id": session_id})
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-
-        project_description = session["project_description"]
+        project = await _load_session_project(db, session_id)
         
         # Score foundations using AI
-        scored_foundations = await score_foundations(project_description, limit, db)
+        scored_foundations = await score_foundations(project, limit, db, session_id)
 
-        project_name = project_description["name"]
-        project_description = project_description["description"]
+        project_name = project.name
+        project_description = project.description
         
         # Generate query summary
         query_summary = f"Found {len(scored_foundations)} matching foundations"
@@ -69,24 +270,30 @@ async def get_foundation_scores_get(
         if project_description and project_description != "No description provided":
             query_summary += f" ({project_description[:50]}...)" if len(project_description) > 50 else f" ({project_description})"
         
-        return FoundationScoresResponse(
+        scores_response = FoundationScoresResponse(
             success=True,
             count=len(scored_foundations),
             foundations=scored_foundations,
             query_summary=query_summary
         )
+        if settings.FAST_JSON_RESPONSES:
+            return fast_json_response(scores_response)
+        return scores_response
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error in get_foundation_scores_get: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Scoring foundations for session {session_id} failed")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to score foundations: {str(e)}"
         )
 
 
+def scores_query_summary(count: int) -> str:
+    """Summary line shared by POST /scores and the /scores/stream summary event."""
+    return f"Found {count} matching foundations"
+
+
 @router.post("/scores", response_model=FoundationScoresResponse)
 async def get_foundation_scores_post(
     request: FoundationScoresRequest = Body(...),
@@ -98,7 +305,7 @@ async def get_foundation_scores_post(
     This endpoint uses AI to analyze the project and match it with foundations:
     - Filters by exact charitable purpose match
     - Uses text search on foundation descriptions and past projects
-    - Scores and ranks using Gemini AI with structured outputs
+    - Scores and ranks with the LLM using structured outputs
     - Returns foundations with:
       - Match score (0.0 to 1.0)
       - Fits (positive matches)
@@ -107,32 +314,74 @@ async def get_foundation_scores_post(
     """
     try:
         db = get_database()
-        
-        session = await db.sessions.find_one({"session_id": request.session_id})
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-
-        project_description = session["project_description"]
+        project = await _load_session_project(db, request.session_id)
 
-          # Score foundations using AI
-        scored_foundations = await score_foundations(ProjectDescription(**project_description), limit, db)
+        # Score foundations using AI
+        scored_foundations = await score_foundations(
+            project, limit, db, request.session_id
+        )
         
-        return FoundationScoresResponse(
+        scores_response = FoundationScoresResponse(
             success=True,
             count=len(scored_foundations),
             foundations=scored_foundations,
-            query_summary="Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua."
+            query_summary=scores_query_summary(len(scored_foundations))
         )
+        if settings.FAST_JSON_RESPONSES:
+            return fast_json_response(scores_response)
+        return scores_response
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Error in get_foundation_scores_post: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Scoring foundations for session {request.session_id} failed")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to score foundations: {str(e)}"
         )
 
 
+@router.post("/scores/stream")
+async def stream_foundation_scores_post(
+    request: FoundationScoresRequest = Body(...),
+    limit: int = Query(5, description="Number of top matches to return", ge=1, le=20)
+):
+    """
+    Stream foundation scores as Server-Sent Events.
+    
+    Same matching pipeline as `POST /scores`, but every candidate is sent as
+    soon as its evaluation finishes instead of after the whole batch:
+    - `score`: one FoundationScore (in completion order, not ranked)
+    - `summary`: the final ranked FoundationScoresResponse with the top `limit`
+    - `error`: emitted instead of `summary` if scoring fails
+    """
+    db = get_database()
+    project_description = await _load_session_project(db, request.session_id)
+    
+    async def event_stream():
+        scored_foundations = []
+        try:
+            async for scored in stream_foundation_scores(project_description, limit, db):
+                scored_foundations.append(scored)
+                yield sse_event("score", scored.model_dump_json())
+            
+            ranked = ScoringService.rank_scores(scored_foundations, limit)
+            summary = FoundationScoresResponse(
+                success=True,
+                count=len(ranked),
+                foundations=ranked,
+                query_summary=scores_query_summary(len(ranked))
+            )
+            yield sse_event("summary", summary.model_dump_json())
+        except Exception as e:
+            logger.exception(f"Streaming foundation scores for session {request.session_id} failed")
+            yield sse_event(
+                "error",
+                json.dumps({"detail": f"Failed to score foundations: {str(e)}"})
+            )
+    
+    return event_stream_response(event_stream())
+
+
 @router.get("/{foundation_id}")
 async def get_foundation(foundation_id: str):
     """
@@ -140,15 +389,21 @@ async def get_foundation(foundation_id: str):
     """
     db = get_database()
     
-    foundation = await db.foundations.find_one({"_id": foundation_id})
+    foundation = await db.foundations.find_one(
+        {"_id": foundation_id},
+        projection_for(FoundationView.DETAIL)
+    )
     if not foundation:
         raise HTTPException(status_code=404, detail="Foundation not found")
     
     # Convert _id to id
     foundation['id'] = foundation.pop('_id')
     
-    return {
+    content = {
         "success": True,
         "foundation": foundation
     }
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(content)
+    return content
 
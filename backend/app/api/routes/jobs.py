@@ -0,0 +1,100 @@
+"""
+Background job API endpoints.
+"""
+
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Response
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.responses import event_stream_response, sse_event
+from app.models.jobs import JobResponse, JobType, SubmitJobRequest
+from app.services.job_service import JobService, TERMINAL_STATUSES
+
+router = APIRouter()
+
+
+def get_job_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> JobService:
+    """Dependency to get job service."""
+    return JobService(db)
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: SubmitJobRequest,
+    response: Response,
+    service: JobService = Depends(get_job_service)
+):
+    """
+    Submit a long-running operation as a background job.
+    
+    - **type**: `score_foundations` or `generate_documents`
+    - **session_id**: The session to work on
+    - **foundation_id**: Required for `generate_documents`
+    - **limit**: Number of matches for `score_foundations`
+    
+    Submitting an operation that is already queued or running for the same
+    session (and foundation) returns the existing job instead of a new one.
+    Poll `GET /jobs/{job_id}` or subscribe to `GET /jobs/{job_id}/events`.
+    """
+    if request.type == JobType.GENERATE_DOCUMENTS and not request.foundation_id:
+        raise HTTPException(status_code=400, detail="foundation_id is required for generate_documents")
+    
+    session = await service.db.sessions.find_one({"session_id": request.session_id}, {"_id": 1})
+    if not session:
+        raise HTTPException(status_code=404, detail=f"Session {request.session_id} not found")
+    
+    try:
+        job, created = await service.submit(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to submit job: {str(e)}")
+    
+    response.headers["Location"] = f"{settings.API_V1_PREFIX}/jobs/{job.job_id}"
+    return JobResponse(
+        success=True,
+        job=job,
+        message="Job submitted" if created else "Identical job already in progress"
+    )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    service: JobService = Depends(get_job_service)
+):
+    """Get the status (and, once finished, the result) of a job."""
+    job = await service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return JobResponse(success=True, job=job)
+
+
+@router.get("/{job_id}/events")
+async def job_events(
+    job_id: str,
+    service: JobService = Depends(get_job_service)
+):
+    """
+    Subscribe to a job's status as Server-Sent Events.
+    
+    Emits a `status` event (the Job) whenever its status or attempt count
+    changes; the stream ends after the job succeeded or failed.
+    """
+    job = await service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    async def event_stream():
+        current = job
+        last_state = None
+        while True:
+            state = (current.status, current.attempts)
+            if state != last_state:
+                yield sse_event("status", current.model_dump_json())
+                last_state = state
+            if current.status in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+            current = await service.get_job(job_id) or current
+    
+    return event_stream_response(event_stream())
@@ -2,14 +2,17 @@
 Session API endpoints for managing user sessions.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from app.models.session import (
     CreateSessionRequest, 
     SessionResponse, 
     SessionData,
-    UpdateApplicationDocumentsRequest
+    UpdateApplicationDocumentsRequest,
+    PatchSessionRequest,
+    PatchSessionResponse,
+    SessionSummaryListResponse
 )
-from app.services.session_service import SessionService
+from app.services.session_service import SessionService, SessionVersionConflict
 from app.core.database import get_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -76,6 +79,86 @@ async def update_session(
         raise HTTPException(status_code=500, detail=f"Failed to update session: {str(e)}")
 
 
+@router.patch("/sessions/{session_id}", response_model=PatchSessionResponse)
+async def patch_session(
+    session_id: str,
+    request: PatchSessionRequest,
+    service: SessionService = Depends(get_session_service)
+):
+    """
+    Apply a delta to an existing session.
+    
+    Operations are applied in order, in one MongoDB transaction (all or
+    nothing):
+    - `append_messages`: append chat messages
+    - `set_current_foundation` / `set_project_query` / `set_foundation_results`
+    - `set_documents`: replace all documents of one foundation
+    - `replace_document`: replace one document (by document_type), adding it if missing
+    
+    With `expected_version`, the update is rejected with 409 if the session
+    was modified in the meantime. Returns the new version, not the session.
+    
+    Example:
+    ```
+    {
+      "expected_version": 4,
+      "operations": [
+        {"op": "set_current_foundation", "foundation_id": "foundation_abc123"},
+        {"op": "replace_document", "foundation_id": "foundation_abc123",
+         "document": {"document_type": "budgetplan", "content": "...", "improvements": []}}
+      ]
+    }
+    ```
+    """
+    try:
+        result = await service.patch_session(
+            session_id,
+            request.operations,
+            request.expected_version
+        )
+        
+        if not result:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        return PatchSessionResponse(
+            success=True,
+            session_id=session_id,
+            version=result["version"],
+            updated_at=result["updated_at"],
+            message="Session updated successfully"
+        )
+    except HTTPException:
+        raise
+    except SessionVersionConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Session was modified concurrently (current version: {e.current_version})"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update session: {str(e)}")
+
+
+@router.get("/sessions/summaries", response_model=SessionSummaryListResponse)
+async def list_session_summaries(
+    limit: int = Query(10, ge=1, le=100),
+    service: SessionService = Depends(get_session_service)
+):
+    """
+    List recent sessions as lightweight summaries.
+    
+    Each entry has the session's title, message count, last update and the
+    foundation last worked on. Use this for session pickers; fetch the full
+    session with GET /sessions/{session_id} once one is selected.
+    """
+    try:
+        summaries = await service.list_session_summaries(limit)
+        return SessionSummaryListResponse(success=True, count=len(summaries), sessions=summaries)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list sessions: {str(e)}")
+
+
 @router.get("/sessions/{session_id}", response_model=SessionResponse)
 async def get_session(
     session_id: str,
@@ -164,7 +247,8 @@ async def update_application_documents(
     Update application documents for a specific foundation in a session.
     
     This endpoint allows updating the document drafts (content and improvements)
-    for a specific foundation without replacing the entire session.
+    for a specific foundation without replacing the entire session. The
+    returned session data only contains this foundation's documents.
     """
     try:
         session_data = await service.update_application_documents(
@@ -184,6 +268,8 @@ async def update_application_documents(
         )
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -0,0 +1,222 @@
+"""
+Measure peak RSS and latency of listing a large foundation catalog.
+
+Seeds a separate benchmark database (<MONGODB_DB_NAME>_benchmark, dropped
+afterwards) with synthetic copies of the seed foundations, then starts the
+API once per response path and fetches the whole catalog repeatedly:
+
+- buffered:  pages of MAX_PAGE_SIZE with the default JSON encoder
+- fast_json: the same pages with FAST_JSON_RESPONSES=true (orjson)
+- stream:    stream=true requests of up to MAX_STREAM_PAGE_SIZE (one for 10k)
+
+Reports p50/p99 latency of a full catalog fetch, time to first byte and the
+server's peak RSS (VmHWM, so Linux only). Each path runs in a fresh server
+process, so the peaks are comparable.
+
+Run with: python -m app.benchmark_listing [--foundations 10000] [--repeat 20] [--view detail]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from app.api.routes.foundations import MAX_PAGE_SIZE, MAX_STREAM_PAGE_SIZE
+from app.benchmark_search import percentile
+from app.core.config import settings
+from app.seed_data import MOCK_FOUNDATIONS
+from app.services.foundation_catalog import bump_catalog_version
+
+# name -> (FAST_JSON_RESPONSES, stream)
+RESPONSE_PATHS = {
+    "buffered": (False, False),
+    "fast_json": (True, False),
+    "stream": (False, True),
+}
+
+
+def synthetic_foundations(count: int) -> List[Dict]:
+    """`count` foundations cycled from the seed data, with unique IDs."""
+    foundations = []
+    for number in range(count):
+        foundation = copy.deepcopy(MOCK_FOUNDATIONS[number % len(MOCK_FOUNDATIONS)])
+        foundation["_id"] = f"bench-{number:06d}"
+        foundation["name"] = f"{foundation['name']} #{number}"
+        for project in foundation.get("past_projects", []):
+            project["foundation_id"] = foundation["_id"]
+        foundations.append(foundation)
+    return foundations
+
+
+async def seed_benchmark_database(db: AsyncIOMotorDatabase, count: int):
+    """Replace the benchmark database's catalog with `count` synthetic foundations."""
+    await db.foundations.delete_many({})
+    batch_size = 1000
+    foundations = synthetic_foundations(count)
+    for start in range(0, count, batch_size):
+        await db.foundations.insert_many(foundations[start:start + batch_size])
+    await bump_catalog_version(db)
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """Current (VmRSS) and peak (VmHWM) resident set size of a process in kB."""
+    values = {}
+    with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = int(value.split()[0])
+    return values
+
+
+def start_server(db_name: str, port: int, fast_json: bool) -> subprocess.Popen:
+    """Start the API on `port` against the benchmark database."""
+    env = dict(
+        os.environ,
+        MONGODB_DB_NAME=db_name,
+        FAST_JSON_RESPONSES="true" if fast_json else "false",
+        JOB_WORKERS="0",
+    )
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        env=env,
+    )
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30.0):
+    """Poll /health until the server answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become healthy in time")
+
+
+async def fetch_catalog(client: httpx.AsyncClient, view: str, count: int, stream: bool) -> Dict[str, float]:
+    """Fetch every foundation once; returns foundations read, TTFB and total time (ms)."""
+    params: Dict[str, object] = {"view": view}
+    if stream:
+        params.update(stream="true", limit=min(count, MAX_STREAM_PAGE_SIZE))
+    else:
+        params["limit"] = MAX_PAGE_SIZE
+
+    start = time.perf_counter()
+    first_byte_ms: Optional[float] = None
+    received = 0
+    cursor: Optional[str] = None
+    while True:
+        page_params = dict(params, cursor=cursor) if cursor else params
+        async with client.stream("GET", "/api/v1/foundations/", params=page_params) as response:
+            response.raise_for_status()
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                if first_byte_ms is None:
+                    first_byte_ms = (time.perf_counter() - start) * 1000
+                body.extend(chunk)
+        page = json.loads(body)
+        received += page["count"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    return {
+        "foundations": received,
+        "ttfb_ms": first_byte_ms or 0.0,
+        "total_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+async def benchmark_path(name: str, db_name: str, port: int, view: str, count: int, repeat: int) -> Dict:
+    """Run one response path in a fresh server process."""
+    fast_json, stream = RESPONSE_PATHS[name]
+    server = start_server(db_name, port, fast_json)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120.0) as client:
+            await wait_until_healthy(client, server)
+            idle_kb = memory_kb(server.pid)["VmRSS"]
+
+            # Warm-up run, not timed
+            warm = await fetch_catalog(client, view, count, stream)
+            if warm["foundations"] != count:
+                raise RuntimeError(f"{name}: read {warm['foundations']} of {count} foundations")
+
+            runs = [await fetch_catalog(client, view, count, stream) for _ in range(repeat)]
+            peak_kb = memory_kb(server.pid)["VmHWM"]
+    finally:
+        server.terminate()
+        server.wait()
+
+    total = [run["total_ms"] for run in runs]
+    ttfb = [run["ttfb_ms"] for run in runs]
+    return {
+        "path": name,
+        "p50_ms": percentile(total, 0.5),
+        "p99_ms": percentile(total, 0.99),
+        "ttfb_p50_ms": percentile(ttfb, 0.5),
+        "idle_mb": idle_kb / 1024,
+        "peak_mb": peak_kb / 1024,
+    }
+
+
+async def benchmark_listing(count: int, repeat: int, view: str, port: int, paths: List[str]):
+    """Seed the benchmark database, measure every response path and print the results."""
+    db_name = f"{settings.MONGODB_DB_NAME}_benchmark"
+    print("Connecting to MongoDB...")
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[db_name]
+
+    try:
+        print(f"Seeding {count} foundations into {db_name}...")
+        await seed_benchmark_database(db, count)
+        print(f"✅ Seeded; view={view}, {repeat} full fetches per path\n")
+
+        results = []
+        for name in paths:
+            print(f"Measuring {name}...")
+            results.append(await benchmark_path(name, db_name, port, view, count, repeat))
+
+        print(
+            f"\n{'path':<10} {'p50 ms':>10} {'p99 ms':>10} {'ttfb ms':>10} "
+            f"{'idle MB':>10} {'peak MB':>10}"
+        )
+        for result in results:
+            print(
+                f"{result['path']:<10} {result['p50_ms']:>10.1f} {result['p99_ms']:>10.1f} "
+                f"{result['ttfb_p50_ms']:>10.1f} {result['idle_mb']:>10.1f} {result['peak_mb']:>10.1f}"
+            )
+
+    finally:
+        await client.drop_database(db_name)
+        print(f"\n🗑️  Dropped {db_name}")
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--foundations", type=int, default=10000, help="catalog size (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=20, help="timed full fetches per path (default: 20)")
+    parser.add_argument(
+        "--view", default="detail", choices=["list", "summary", "detail"],
+        help="listing view to fetch (default: detail)"
+    )
+    parser.add_argument("--port", type=int, default=8765, help="port for the benchmark server (default: 8765)")
+    parser.add_argument(
+        "--paths", nargs="+", default=list(RESPONSE_PATHS), choices=list(RESPONSE_PATHS),
+        help="response paths to measure (default: all)"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(benchmark_listing(args.foundations, args.repeat, args.view, args.port, args.paths))
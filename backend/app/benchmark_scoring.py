@@ -0,0 +1,213 @@
+"""
+Check that concurrent scoring requests do not stall the event loop.
+
+Runs the API in-process against a separate benchmark database
+(<MONGODB_DB_NAME>_benchmark, dropped afterwards) seeded with synthetic
+foundations, with the scoring LLM replaced by a stub that answers after
+--llm-latency seconds. Fires --concurrency POST /scores requests at once
+(each for its own session and project text, so the scoring caches do not
+short-circuit them) and polls /health while they run. /health only waits for the event loop, so
+its latency shows whether the LLM calls block it. --blocking makes the stub
+sleep synchronously, which is what a blocking LLM client would look like.
+
+Exits with status 1 if the /health p99 exceeds --max-health-ms.
+
+Run with: python -m app.benchmark_scoring [--concurrency 20] [--llm-latency 2.0] [--blocking]
+"""
+import argparse
+import asyncio
+import re
+import sys
+import time
+import uuid
+from typing import Dict, List
+import httpx
+from langchain_core.runnables import RunnableLambda
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.benchmark_listing import synthetic_foundations
+from app.benchmark_search import percentile
+from app.core.config import settings
+from app.core.database import get_database
+from app.main import app
+from app.models.project_description import CharitablePurpose, ProjectDescription
+from app.models.scores import FoundationEvaluation, ScoringResponse
+from app.models.session import CreateSessionRequest
+from app.services.chat_service import project_fields
+from app.services.foundation_catalog import bump_catalog_version
+from app.services.scoring_service import get_scoring_service
+from app.services.session_service import SessionService
+
+FOUNDATION_ID_LINE = re.compile(r"^ID: (\S+)$", re.MULTILINE)
+
+# Every benchmark project and foundation shares these, so all pass the purpose filter
+BENCHMARK_PURPOSES = [
+    CharitablePurpose.YOUTH_AND_ELDERLY_CARE,
+    CharitablePurpose.EDUCATION_AND_VOCATIONAL_TRAINING,
+]
+
+
+def stub_scoring_llm(latency: float, blocking: bool) -> RunnableLambda:
+    """A stand-in for the structured scoring LLM that evaluates every foundation in the prompt."""
+
+    def evaluate(prompt_value) -> ScoringResponse:
+        return ScoringResponse(evaluations=[
+            FoundationEvaluation(
+                foundation_id=foundation_id,
+                match_score=0.5,
+                fits=["Benchmark"],
+                mismatches=[],
+                questions=[],
+            )
+            for foundation_id in FOUNDATION_ID_LINE.findall(prompt_value.to_string())
+        ])
+
+    async def answer(prompt_value) -> ScoringResponse:
+        if blocking:
+            time.sleep(latency)
+        else:
+            await asyncio.sleep(latency)
+        return evaluate(prompt_value)
+
+    return RunnableLambda(evaluate, afunc=answer)
+
+
+async def seed_benchmark_catalog(db: AsyncIOMotorDatabase, count: int):
+    """Replace the benchmark database's catalog with `count` foundations matching BENCHMARK_PURPOSES."""
+    foundations = synthetic_foundations(count)
+    for foundation in foundations:
+        foundation["gemeinnuetzige_zwecke"] = [purpose.value for purpose in BENCHMARK_PURPOSES]
+    await db.foundations.delete_many({})
+    await db.foundations.insert_many(foundations)
+    await bump_catalog_version(db)
+
+
+async def create_sessions(session_service: SessionService, count: int) -> List[str]:
+    """Temporary sessions with distinct project descriptions."""
+    run_id = uuid.uuid4().hex[:8]
+    session_ids = []
+    for number in range(count):
+        session = await session_service.create_session(CreateSessionRequest())
+        project = ProjectDescription(
+            name=f"Lastprojekt {run_id}-{number}",
+            description=f"Nachhilfe und Mentoring für Jugendliche in München ({run_id}-{number})",
+            target_group="Jugendliche",
+            charitable_purpose=BENCHMARK_PURPOSES,
+        )
+        await session_service.collection.update_one(
+            {"session_id": session.session_id}, {"$set": project_fields(project)}
+        )
+        session_ids.append(session.session_id)
+    return session_ids
+
+
+async def score(client: httpx.AsyncClient, session_id: str) -> Dict:
+    """POST /scores for one session; returns status and latency (ms)."""
+    start = time.perf_counter()
+    response = await client.post(f"{settings.API_V1_PREFIX}/foundations/scores", json={"session_id": session_id})
+    return {"status": response.status_code, "ms": (time.perf_counter() - start) * 1000}
+
+
+async def poll_health_once(client: httpx.AsyncClient) -> float:
+    """Latency (ms) of one GET /health."""
+    start = time.perf_counter()
+    await client.get("/health")
+    return (time.perf_counter() - start) * 1000
+
+
+async def poll_health(client: httpx.AsyncClient, done: asyncio.Event, interval: float) -> List[float]:
+    """
+    GET /health every `interval` seconds until `done` is set; returns latencies (ms).
+
+    Latency counts from when the poll was due, not from when it was sent, so a
+    blocked event loop (which also delays the poller) shows up in full.
+    """
+    latencies = []
+    due = time.perf_counter()
+    while not done.is_set():
+        await client.get("/health")
+        latencies.append((time.perf_counter() - due) * 1000)
+        due = max(due + interval, time.perf_counter())
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+    return latencies
+
+
+async def benchmark_scoring(
+    foundations: int, concurrency: int, llm_latency: float, blocking: bool, interval: float, max_health_ms: float
+) -> bool:
+    """Run the load test and print the results; returns whether /health stayed responsive."""
+    db_name = f"{settings.MONGODB_DB_NAME}_benchmark"
+    settings.MONGODB_DB_NAME = db_name
+    # Job workers would compete with the requests for the event loop
+    settings.JOB_WORKERS = 0
+
+    print(f"Starting the API in-process against {db_name}...")
+    await app.router.startup()
+    db = get_database()
+    session_service = SessionService(db)
+
+    try:
+        print(f"Seeding {foundations} foundations...")
+        await seed_benchmark_catalog(db, foundations)
+        get_scoring_service().structured_llm = stub_scoring_llm(llm_latency, blocking)
+        session_ids = await create_sessions(session_service, concurrency)
+        mode = "blocking" if blocking else "async"
+        print(
+            f"Scoring {concurrency} sessions at once, stub LLM {llm_latency}s ({mode}), "
+            f"SCORING_MAX_CONCURRENCY={settings.SCORING_MAX_CONCURRENCY}\n"
+        )
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            baseline = await poll_health_once(client)
+            done = asyncio.Event()
+            health_task = asyncio.create_task(poll_health(client, done, interval))
+            start = time.perf_counter()
+            results = await asyncio.gather(*(score(client, session_id) for session_id in session_ids))
+            wall_ms = (time.perf_counter() - start) * 1000
+            done.set()
+            health_ms = await health_task
+
+        failed = [result for result in results if result["status"] != 200]
+        scores_ms = [result["ms"] for result in results]
+        print(f"/scores:  {len(results) - len(failed)}/{len(results)} OK in {wall_ms:.0f} ms wall")
+        print(f"          p50 {percentile(scores_ms, 0.5):.0f} ms, p99 {percentile(scores_ms, 0.99):.0f} ms")
+        if failed:
+            print(f"          failed with status {sorted({result['status'] for result in failed})}")
+        if not health_ms:
+            health_ms = [baseline]
+        health_p99 = percentile(health_ms, 0.99)
+        print(f"/health:  idle {baseline:.1f} ms; under load {len(health_ms)} samples,")
+        print(
+            f"          p50 {percentile(health_ms, 0.5):.1f} ms, p99 {health_p99:.1f} ms, "
+            f"max {max(health_ms):.1f} ms"
+        )
+
+        responsive = health_p99 <= max_health_ms and not failed
+        if responsive:
+            print(f"\n✅ /health p99 within {max_health_ms:.0f} ms")
+        else:
+            print(f"\n❌ /health p99 above {max_health_ms:.0f} ms or /scores failed")
+        return responsive
+
+    finally:
+        await db.client.drop_database(db_name)
+        print(f"🗑️  Dropped {db_name}")
+        await app.router.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--foundations", type=int, default=50, help="benchmark catalog size (default: 50)")
+    parser.add_argument("--concurrency", type=int, default=20, help="simultaneous /scores requests (default: 20)")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="seconds per stub LLM call (default: 2.0)")
+    parser.add_argument("--blocking", action="store_true", help="make the stub LLM block the event loop")
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between /health polls (default: 0.05)")
+    parser.add_argument(
+        "--max-health-ms", type=float, default=100.0, help="allowed /health p99 under load (default: 100)"
+    )
+    args = parser.parse_args()
+
+    ok = asyncio.run(benchmark_scoring(
+        args.foundations, args.concurrency, args.llm_latency, args.blocking, args.interval, args.max_health_ms
+    ))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,137 @@
+"""
+Compare candidate retrieval with the local BM25 index against MongoDB $text.
+
+Reports recall@k and latency (p50/p95) of both retrievers on the seeded
+catalog, using the judged queries below (or a JSON file of
+[{"query": ..., "relevant": [foundation_id, ...]}, ...] via --queries).
+BM25 runs in-process; $text latency includes the round-trip to MongoDB.
+
+Run with: python -m app.benchmark_search [--k 3] [--repeat 50] [--queries file.json]
+(requires the seeded catalog and its text index: python -m app.seed_data)
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List, Sequence, Set
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from app.core.config import settings
+from app.services.foundation_catalog import FoundationCatalog
+
+# Project texts (name, description, target group, as scoring searches them)
+# with the seeded foundations judged relevant for each
+SEED_QUERIES = [
+    {
+        "query": "Lernhilfe für Jugendliche in München Nachhilfe nach der Schule",
+        "relevant": ["stiftung-001", "stiftung-005"],
+    },
+    {
+        "query": "Mentoring für Grundschüler mit Migrationshintergrund",
+        "relevant": ["stiftung-001"],
+    },
+    {
+        "query": "Innovative Bildungskonzepte für bayerische Schulen",
+        "relevant": ["stiftung-003"],
+    },
+    {
+        "query": "Soziale Innovation und nachhaltige Entwicklung international",
+        "relevant": ["stiftung-002"],
+    },
+    {
+        "query": "Kulturelles Projekt für Kinder in München",
+        "relevant": ["stiftung-005", "stiftung-001"],
+    },
+    {
+        "query": "Gesundheitsprojekt einer großen Stiftung in Deutschland",
+        "relevant": ["stiftung-004"],
+    },
+]
+
+
+def recall_at_k(ranked: Sequence[str], relevant: Set[str], k: int) -> float:
+    """Share of the relevant foundations among the top k results."""
+    if not relevant:
+        return 1.0
+    return len(set(ranked[:k]) & relevant) / len(relevant)
+
+
+def percentile(samples: List[float], share: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+async def text_search(db: AsyncIOMotorDatabase, query: str, ids: List[str], k: int) -> List[str]:
+    """The $text ranking of ScoringService._text_search_foundations (IDs only)."""
+    cursor = (
+        db.foundations.find(
+            {"$text": {"$search": query}, "_id": {"$in": ids}},
+            {"_id": 1, "score": {"$meta": "textScore"}},
+        )
+        .sort([("score", {"$meta": "textScore"})])
+        .limit(k)
+    )
+    return [doc["_id"] async for doc in cursor]
+
+
+async def benchmark_search(k: int, repeat: int, queries: List[Dict]):
+    """Run every query `repeat` times against both retrievers and print the results."""
+    print("Connecting to MongoDB...")
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+
+    try:
+        catalog = FoundationCatalog()
+        await catalog.load(db)
+        ids = sorted(catalog.records)
+        print(f"Catalog: {len(ids)} foundations, {len(queries)} queries, k={k}, {repeat} runs each\n")
+
+        recall: Dict[str, List[float]] = {"bm25": [], "$text": []}
+        latency_ms: Dict[str, List[float]] = {"bm25": [], "$text": []}
+        for judged in queries:
+            relevant = set(judged["relevant"])
+            for run in range(repeat):
+                start = time.perf_counter()
+                bm25_ranked = [
+                    foundation_id
+                    for foundation_id, _ in catalog.search_index.search(
+                        judged["query"], limit=k, candidate_ids=ids
+                    )
+                ]
+                latency_ms["bm25"].append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                text_ranked = await text_search(db, judged["query"], ids, k)
+                latency_ms["$text"].append((time.perf_counter() - start) * 1000)
+
+                if run == 0:
+                    recall["bm25"].append(recall_at_k(bm25_ranked, relevant, k))
+                    recall["$text"].append(recall_at_k(text_ranked, relevant, k))
+                    print(f"  {judged['query'][:60]!r}")
+                    print(f"    bm25:  {bm25_ranked}")
+                    print(f"    $text: {text_ranked}")
+
+        print(f"\n{'retriever':<10} {'recall@' + str(k):>10} {'p50 ms':>10} {'p95 ms':>10}")
+        for name in ("bm25", "$text"):
+            print(
+                f"{name:<10} {statistics.mean(recall[name]):>10.2f} "
+                f"{percentile(latency_ms[name], 0.5):>10.3f} {percentile(latency_ms[name], 0.95):>10.3f}"
+            )
+
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=3, help="cut-off for recall@k (default: 3)")
+    parser.add_argument("--repeat", type=int, default=50, help="runs per query for latency (default: 50)")
+    parser.add_argument("--queries", help="JSON file of judged queries (default: the seeded catalog's)")
+    args = parser.parse_args()
+
+    judged_queries = SEED_QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            judged_queries = json.load(f)
+    asyncio.run(benchmark_search(args.k, args.repeat, judged_queries))
@@ -0,0 +1,53 @@
+"""
+Embed all foundations into the vector index used for semantic retrieval.
+Run with: python -m app.build_vector_index
+"""
+import asyncio
+from pathlib import Path
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.services.foundation_catalog import get_catalog_version
+from app.services.foundation_projections import FoundationView, projection_for
+from app.services.vector_index import (
+    VectorIndex,
+    foundation_embedding_text,
+    get_embeddings,
+)
+
+
+async def build_vector_index():
+    """Embed every foundation and write the index to VECTOR_INDEX_PATH."""
+    print("Connecting to MongoDB...")
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    try:
+        foundations = await db.foundations.find(
+            {}, projection_for(FoundationView.EMBEDDING)
+        ).to_list(length=None)
+        print(f"Embedding {len(foundations)} foundations with {settings.EMBEDDING_MODEL}...")
+        
+        embeddings = get_embeddings()
+        vectors = await embeddings.aembed_documents(
+            [foundation_embedding_text(f) for f in foundations]
+        )
+        
+        index = VectorIndex.from_vectors(
+            [f["_id"] for f in foundations],
+            vectors,
+            meta={
+                "model": settings.EMBEDDING_MODEL,
+                "dimensions": len(vectors[0]) if vectors else 0,
+                "catalog_version": await get_catalog_version(db),
+            },
+        )
+        path = Path(settings.VECTOR_INDEX_PATH)
+        index.save(path)
+        print(f"✅ Vector index written to {path}.npy / {path}.json")
+        
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(build_vector_index())
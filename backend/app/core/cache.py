@@ -0,0 +1,53 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Small in-process LRU cache with an optional per-entry TTL."""
+    
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+    
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value and mark it as recently used, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, value = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key: K) -> Optional[V]:
+        """Remove a key and return its value, if present."""
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+    
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None  # type: ignore[arg-type]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
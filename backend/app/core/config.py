@@ -19,6 +19,73 @@ class Settings(BaseSettings):
     REQUESTY_API_KEY: str
     REQUESTY_BASE_URL: str = "https://router.requesty.ai/v1"
     
+    # Shared HTTP connection pool for LLM calls
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    
+    # Serialize foundation/score responses with orjson / pydantic-core directly,
+    # skipping FastAPI's jsonable_encoder and response_model re-validation
+    FAST_JSON_RESPONSES: bool = False
+    
+    # Foundation catalog
+    FOUNDATION_CATALOG_REFRESH_SECONDS: float = 30.0  # how often to check for catalog changes
+    
+    # Foundation scoring
+    SCORING_CANDIDATE_SOURCE: str = "bm25"  # "bm25" (local index) or "mongo_text"
+    SEMANTIC_RETRIEVAL_ENABLED: bool = False  # fuse embedding similarity into candidate ranking
+    SEMANTIC_WEIGHT: float = 1.0  # weight of the semantic ranking in rank fusion
+    EMBEDDING_MODEL: str = "openai/text-embedding-3-small"  # or "local-hashing"
+    VECTOR_INDEX_PATH: str = "data/foundation_vectors"
+    EMBEDDING_TIMEOUT: float = 10.0  # seconds per query embedding; BM25 ranking is used on failure
+    SCORING_MAX_CONCURRENCY: int = 4  # concurrent LLM calls per worker
+    SCORING_LLM_TIMEOUT: float = 60.0  # seconds per LLM call
+    SCORING_FANOUT_ENABLED: bool = True  # evaluate candidates in small parallel batches
+    SCORING_BATCH_SIZE: int = 2  # foundations per LLM call in fan-out mode
+    SCORING_MAX_RETRIES: int = 1  # retry rounds for foundations the LLM skipped
+    SCORING_CACHE_ENABLED: bool = True
+    SCORING_CACHE_TTL_SECONDS: int = 86400  # MongoDB TTL and in-process expiry
+    SCORING_CACHE_MAX_ENTRIES: int = 256  # in-process LRU size
+    EVALUATION_MEMO_ENABLED: bool = True  # reuse per-foundation evaluations
+    EVALUATION_MEMO_TTL_SECONDS: int = 604800
+    EVALUATION_MEMO_MAX_ENTRIES: int = 2048
+    
+    # Share one execution between concurrent identical scoring/generation calls
+    SINGLE_FLIGHT_ENABLED: bool = True
+    
+    # Document generation
+    DOCUMENT_GENERATION_PARALLEL: bool = True  # one LLM call per document instead of one for all
+    DOCUMENT_GENERATION_MAX_CONCURRENCY: int = 4  # concurrent per-document LLM calls per worker
+    DOCUMENT_GENERATION_TIMEOUT: float = 90.0  # seconds per document LLM call
+    DOCUMENT_GENERATION_MAX_RETRIES: int = 1
+    PROOFREAD_CACHE_MAX_ENTRIES: int = 1024  # cached documents and paragraphs
+    PROOFREAD_CACHE_TTL_SECONDS: int = 86400
+    
+    # Background jobs
+    JOB_WORKERS: int = 2  # worker loops per process (0 = submit only, no execution)
+    JOB_LEASE_SECONDS: int = 120  # renewed while a job runs; expired leases are re-claimed
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_DELAY_SECONDS: float = 5.0  # doubled after every failed attempt
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_TTL_SECONDS: int = 604800  # finished jobs are removed after this time
+    
+    # Sessions
+    SESSION_DEBUG_VERIFY_WRITES: bool = False  # read back document saves and log mismatches
+    
+    # Chat conversation cache (parsed transcripts per session)
+    CONVERSATION_CACHE_MAX_ENTRIES: int = 512
+    CONVERSATION_CACHE_TTL_SECONDS: int = 3600
+    
+    # Rolling conversation summary (replaces early messages in LLM prompts)
+    CONVERSATION_SUMMARY_ENABLED: bool = True
+    CONVERSATION_SUMMARY_KEEP_MESSAGES: int = 6  # most recent messages always sent verbatim
+    CONVERSATION_SUMMARY_MIN_NEW_MESSAGES: int = 4  # messages to accumulate before re-summarizing
+    
+    # Logging and tracing
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" (one object per line) or "text"
+    TRACE_SAMPLE_RATE: float = 0.05  # fraction of requests whose spans are all logged
+    TRACE_SLOW_SPAN_MS: float = 2000.0  # spans slower than this are always logged
+    
     # CORS Origins - comma-separated string
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
     
@@ -1,6 +1,9 @@
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 class Database:
     client: AsyncIOMotorClient = None
     
@@ -9,12 +12,12 @@ database = Database()
 async def connect_to_mongo():
     """Connect to MongoDB."""
     database.client = AsyncIOMotorClient(settings.MONGODB_URL)
-    print(f"Connected to MongoDB: {settings.MONGODB_DB_NAME}")
+    logger.info(f"Connected to MongoDB: {settings.MONGODB_DB_NAME}")
 
 async def close_mongo_connection():
     """Close MongoDB connection."""
     database.client.close()
-    print("Closed MongoDB connection")
+    logger.info("Closed MongoDB connection")
 
 def get_database():
     """Get database instance."""
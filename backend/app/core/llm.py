@@ -0,0 +1,48 @@
+import httpx
+from langchain_openai import ChatOpenAI
+from pydantic import SecretStr
+from app.core.config import settings
+
+LLM_MODEL = "anthropic/claude-haiku-4-5"
+
+
+class LLMClients:
+    """HTTP connection pools and chat model shared by chat, scoring and documents."""
+    http_client: httpx.Client = None
+    http_async_client: httpx.AsyncClient = None
+    chat_model: ChatOpenAI = None
+
+llm_clients = LLMClients()
+
+def init_llm_clients():
+    """Create the shared HTTP pools and chat model (idempotent)."""
+    if llm_clients.chat_model is not None:
+        return
+    limits = httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    llm_clients.http_client = httpx.Client(limits=limits)
+    llm_clients.http_async_client = httpx.AsyncClient(limits=limits)
+    llm_clients.chat_model = ChatOpenAI(
+        model=LLM_MODEL,
+        api_key=SecretStr(settings.REQUESTY_API_KEY),
+        base_url=settings.REQUESTY_BASE_URL,
+        http_client=llm_clients.http_client,
+        http_async_client=llm_clients.http_async_client,
+    )
+
+async def close_llm_clients():
+    """Close the shared HTTP pools."""
+    if llm_clients.http_async_client is not None:
+        await llm_clients.http_async_client.aclose()
+    if llm_clients.http_client is not None:
+        llm_clients.http_client.close()
+    llm_clients.http_client = None
+    llm_clients.http_async_client = None
+    llm_clients.chat_model = None
+
+def get_chat_model() -> ChatOpenAI:
+    """Get the shared chat model (created on first use outside the app lifespan)."""
+    init_llm_clients()
+    return llm_clients.chat_model
@@ -0,0 +1,211 @@
+"""
+Structured logging and lightweight tracing.
+
+`setup_logging()` routes all log records through a QueueHandler: the
+request path only enqueues the record, and a QueueListener thread formats
+it (JSON lines by default) and writes it to stdout.
+
+Every HTTP request (and every background job) gets a request ID, taken
+from the `X-Request-ID` header or generated, which is attached to all
+records logged while handling it and echoed in the response header.
+
+`span(name, **fields)` times a stage (Mongo call, prompt building, LLM
+call). Spans are logged to the `app.trace` logger for a sampled fraction
+of requests (TRACE_SAMPLE_RATE), and always when they fail or take longer
+than TRACE_SLOW_SPAN_MS, so unsampled requests pay only for a clock read.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+trace_logger = logging.getLogger("app.trace")
+
+# Request context, inherited by tasks spawned while handling a request
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_sampled_var: ContextVar[bool] = ContextVar("trace_sampled", default=False)
+_span_var: ContextVar[Optional[str]] = ContextVar("span", default=None)
+
+# Attributes of every LogRecord; anything else was passed via `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "request_id"
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records with the current request ID before they leave the calling thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; `extra` fields are included as-is."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the record intact for the listener's formatter."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The default prepare() formats the whole record in the calling thread;
+        # only resolve what cannot cross threads (message args, traceback)
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging() -> None:
+    """Install the queue-backed root handler (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    enqueue = _EnqueueHandler(log_queue)
+    enqueue.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [enqueue]
+    root.setLevel(settings.LOG_LEVEL)
+    # Route uvicorn's own loggers through the same handler
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+@contextmanager
+def request_context(request_id: Optional[str] = None) -> Iterator[str]:
+    """Bind a request ID (and the sampling decision for its spans)."""
+    request_id = request_id or uuid.uuid4().hex
+    id_token = request_id_var.set(request_id)
+    sampled_token = _sampled_var.set(random.random() < settings.TRACE_SAMPLE_RATE)
+    try:
+        yield request_id
+    finally:
+        _sampled_var.reset(sampled_token)
+        request_id_var.reset(id_token)
+
+
+@contextmanager
+def span(name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a stage of the current request.
+
+    Yields a dict that can be extended with fields only known at the end
+    (e.g. result counts). Usable in sync and async code alike.
+    """
+    parent = _span_var.get()
+    _span_var.set(name)
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        status = type(e).__name__
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        # Not reset(): a span around a streaming generator may end in another context
+        _span_var.set(parent)
+        if (
+            _sampled_var.get()
+            or status != "ok"
+            or duration_ms >= settings.TRACE_SLOW_SPAN_MS
+        ):
+            trace_logger.info(
+                name,
+                extra={
+                    "span": name,
+                    "parent": parent,
+                    "duration_ms": round(duration_ms, 2),
+                    "status": status,
+                    **fields,
+                },
+            )
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware binding a request ID to each HTTP request and timing it.
+
+    Implemented at the ASGI level (not BaseHTTPMiddleware) so streaming
+    responses are passed through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        incoming = headers.get(b"x-request-id", b"").decode("latin-1")[:128] or None
+        with request_context(incoming) as request_id:
+            async def send_with_request_id(message):
+                if message["type"] == "http.response.start":
+                    timing["status_code"] = message["status"]
+                    message.setdefault("headers", [])
+                    message["headers"] = [
+                        *message["headers"], (b"x-request-id", request_id.encode("latin-1"))
+                    ]
+                await send(message)
+
+            with span("http.request", method=scope["method"], path=scope["path"]) as timing:
+                await self.app(scope, receive, send_with_request_id)
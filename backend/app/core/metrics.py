@@ -0,0 +1,24 @@
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+    """In-process counters, exposed via GET /metrics."""
+    
+    def __init__(self):
+        self._counters: Dict[str, int] = defaultdict(int)
+    
+    def increment(self, name: str, value: int = 1) -> None:
+        """Increase a counter by `value`."""
+        self._counters[name] += value
+    
+    def get(self, name: str) -> int:
+        """Current value of a counter (0 if never incremented)."""
+        return self._counters.get(name, 0)
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Copy of all counters, sorted by name."""
+        return dict(sorted(self._counters.items()))
+
+
+metrics = Metrics()
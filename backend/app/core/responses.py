@@ -0,0 +1,75 @@
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson cannot serialize natively (e.g. ObjectId)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson (pydantic models use their own serializer)."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    return orjson.dumps(content, default=_default)
+
+
+def fast_json_response(
+    content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    JSON response that bypasses FastAPI's jsonable_encoder and response_model
+    re-validation.
+    """
+    return Response(
+        content=dumps(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def streaming_json_object(
+    head: Dict[str, Any],
+    array_key: str,
+    items: AsyncIterator[Any],
+    tail: Callable[[int], Dict[str, Any]],
+    headers: Optional[Dict[str, str]] = None,
+) -> StreamingResponse:
+    """
+    Stream a JSON object whose `array_key` array is written item by item.
+
+    `head` fields are written before the array; `tail(count)` is called after
+    the last item, so it can include totals such as the item count.
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        yield dumps(head)[:-1] + (b"," if head else b"") + b'"' + array_key.encode() + b'":['
+        count = 0
+        async for item in items:
+            yield (b"," if count else b"") + dumps(item)
+            count += 1
+        trailer = dumps(tail(count))
+        yield b"]" + (b"," + trailer[1:] if len(trailer) > 2 else b"}")
+
+    return StreamingResponse(body(), headers=headers, media_type="application/json")
+
+
+def sse_event(event: str, data: str) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """Stream pre-formatted Server-Sent Events without proxy buffering."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
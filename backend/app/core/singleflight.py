@@ -0,0 +1,78 @@
+"""
+Single-flight coalescing of identical in-flight work.
+
+Concurrent calls with the same key share one execution: the first caller
+starts it, later callers await the same result (or exception). Once it
+finishes the key is released, so a subsequent call runs again.
+"""
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+SingleFlightKey = Tuple[str, Optional[str], Optional[str], str]
+
+
+def input_hash(*parts: Any) -> str:
+    """Stable hash of JSON-serializable inputs (pydantic models via model_dump)."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def flight_key(
+    operation: str,
+    session_id: Optional[str],
+    foundation_id: Optional[str],
+    *inputs: Any,
+) -> SingleFlightKey:
+    """Key of an operation: (operation, session_id, foundation_id, input hash)."""
+    return (operation, session_id, foundation_id, input_hash(*inputs))
+
+
+class SingleFlight:
+    """Per-process registry of in-flight calls."""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: SingleFlightKey, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn()` unless a call with the same key is already in flight, in
+        which case wait for that call's result instead.
+
+        The shared call runs in its own task, so a caller that is cancelled
+        (e.g. a dropped connection) does not cancel it for the others.
+        """
+        operation = key[0]
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return await fn()
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+            metrics.increment(f"singleflight.{operation}.calls")
+        else:
+            metrics.increment(f"singleflight.{operation}.coalesced")
+
+        return await asyncio.shield(task)
+
+    def _release(self, key: SingleFlightKey, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._in_flight)
+
+
+singleflight = SingleFlight()
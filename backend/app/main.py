@@ -1,8 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
-from app.api.routes import chat, foundations, sessions, documents
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database
+from app.core.llm import init_llm_clients, close_llm_clients
+from app.core.logging import RequestContextMiddleware, setup_logging, shutdown_logging
+from app.core.metrics import metrics
+from app.api.routes import chat, foundations, sessions, documents, jobs
+from app.services.chat_service import get_chat_agent
+from app.services.document_generation_service import get_document_generation_service
+from app.services.evaluation_memo import ensure_evaluation_memo_indexes
+from app.services.foundation_catalog import get_foundation_catalog
+from app.services.job_handlers import JOB_HANDLERS
+from app.services.job_service import ensure_job_indexes, get_job_worker_pool
+from app.services.scoring_cache import ensure_scoring_cache_indexes
+from app.services.scoring_service import get_scoring_service
+from app.services.session_storage import ensure_session_indexes
+
+setup_logging()
 
 # Create FastAPI app
 app = FastAPI(
@@ -17,19 +31,59 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+# Request IDs and request/stage timing for logs
+app.add_middleware(RequestContextMiddleware)
+
 # Startup/Shutdown events
 @app.on_event("startup")
 async def startup_db_client():
     """Connect to MongoDB on startup."""
     await connect_to_mongo()
+    db = get_database()
+    await ensure_scoring_cache_indexes(db)
+    await ensure_evaluation_memo_indexes(db)
+    await ensure_session_indexes(db)
+    await get_foundation_catalog().load(db)
+
+@app.on_event("startup")
+async def startup_llm_clients():
+    """Create the shared LLM clients and warm the services that use them."""
+    init_llm_clients()
+    get_chat_agent()
+    get_scoring_service()
+    get_document_generation_service()
+
+@app.on_event("startup")
+async def startup_job_workers():
+    """Create job indexes and start this process's job workers."""
+    db = get_database()
+    await ensure_job_indexes(db)
+    if settings.JOB_WORKERS > 0:
+        get_job_worker_pool().start(db, JOB_HANDLERS, settings.JOB_WORKERS)
+
+@app.on_event("shutdown")
+async def shutdown_job_workers():
+    """Stop job workers before the database connection closes."""
+    await get_job_worker_pool().stop()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     """Close MongoDB connection on shutdown."""
     await close_mongo_connection()
 
+@app.on_event("shutdown")
+async def shutdown_llm_clients():
+    """Close the shared LLM HTTP connection pools."""
+    await close_llm_clients()
+
+@app.on_event("shutdown")
+async def shutdown_log_listener():
+    """Flush queued log records."""
+    shutdown_logging()
+
 # Include routers
 app.include_router(
     chat.router,
@@ -55,6 +109,12 @@ app.include_router(
     tags=["documents"]
 )
 
+app.include_router(
+    jobs.router,
+    prefix=f"{settings.API_V1_PREFIX}/jobs",
+    tags=["jobs"]
+)
+
 
 @app.get("/")
 async def root():
@@ -72,3 +132,9 @@ async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+
+@app.get("/metrics")
+async def get_metrics():
+    """In-process counters (cache hits/misses etc.) of this worker."""
+    return metrics.snapshot()
+
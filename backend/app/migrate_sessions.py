@@ -0,0 +1,95 @@
+"""
+Move chat messages, foundation results and application documents of
+sessions written with the embedded layout into their own collections, and
+fill in the summary fields (title, last foundation, has_documents, last
+foundation with documents) of sessions written before they existed.
+Run with: python -m app.migrate_sessions [--dry-run]
+"""
+import argparse
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.services.session_storage import (
+    SESSION_PARTS,
+    ensure_session_indexes,
+    initial_title_fields,
+    load_documents,
+    load_messages,
+    summary_fields,
+    write_parts,
+)
+
+
+async def migrate_sessions(dry_run: bool = False):
+    """Split every session that still embeds its parts and backfill summary fields."""
+    print("Connecting to MongoDB...")
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    try:
+        await ensure_session_indexes(db)
+        query = {
+            "$or": [
+                *({part: {"$exists": True}} for part in SESSION_PARTS),
+                {"has_documents": {"$exists": False}},
+                {"last_document_foundation_id": {"$exists": False}},
+            ]
+        }
+        total = await db.sessions.count_documents(query)
+        print(f"{total} sessions to migrate{' (dry run)' if dry_run else ''}")
+        
+        migrated = 0
+        async for session in db.sessions.find(query):
+            session_id = session["session_id"]
+            embedded = any(part in session for part in SESSION_PARTS)
+            if embedded:
+                chat_messages = session.get("chat_messages") or []
+                application_documents = session.get("application_documents") or {}
+            else:
+                chat_messages = (await load_messages(db, [session_id]))[session_id]
+                application_documents = (await load_documents(db, [session_id]))[session_id]
+            if dry_run:
+                print(
+                    f"  {session_id}: {len(chat_messages)} messages, "
+                    f"{len(session.get('foundation_results') or [])} results, "
+                    f"{len(application_documents)} foundations with documents"
+                    f"{'' if embedded else ' (summary fields only)'}"
+                )
+                continue
+            
+            update = {
+                "$set": {
+                    "message_count": len(chat_messages),
+                    **initial_title_fields(
+                        session.get("project_description"),
+                        session.get("project_query"),
+                        chat_messages,
+                    ),
+                    **summary_fields(session.get("current_foundation_id"), application_documents),
+                },
+            }
+            if embedded:
+                # Parts first: a session interrupted here is simply migrated again
+                await write_parts(
+                    db,
+                    session_id,
+                    chat_messages,
+                    session.get("foundation_results") or [],
+                    application_documents,
+                )
+                update["$unset"] = {part: "" for part in SESSION_PARTS}
+            await db.sessions.update_one({"_id": session["_id"]}, update)
+            migrated += 1
+        
+        if not dry_run:
+            print(f"✅ Migrated {migrated} sessions")
+        
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be migrated")
+    args = parser.parse_args()
+    asyncio.run(migrate_sessions(args.dry_run))
@@ -14,3 +14,9 @@ class ChatResponse(BaseModel):
     code: Literal["refine", "finish"]
     message: str
 
+
+
+class ChatDelta(BaseModel):
+    """Incremental text of the assistant message (streaming chat)."""
+    session_id: str
+    content: str
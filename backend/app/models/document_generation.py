@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
+from app.models.session import ConversationSummary
 
 class RequiredDocumentInput(BaseModel):
     """A required document that needs to be generated."""
@@ -21,6 +22,7 @@ class GenerateDocumentsRequestLegacy(BaseModel):
     """Legacy request format (deprecated) - for backward compatibility."""
     required_documents: List[RequiredDocumentInput]
     chat_messages: List[ChatMessageInput]
+    conversation_summary: Optional[ConversationSummary] = None  # covers messages before chat_messages
     project_query: Optional[str] = None
     foundation_name: Optional[str] = None
     foundation_details: Optional[Dict[str, Any]] = None
@@ -30,6 +32,7 @@ class GeneratedDocument(BaseModel):
     document: str  # document_type
     text: str      # generated content
     improvements: List[str] = []  # list of improvement suggestions
+    source: Literal["model", "fallback"] = "model"  # "fallback" = placeholder after the LLM failed
 
 class GenerateDocumentsResponse(BaseModel):
     """Response containing generated documents."""
@@ -42,6 +45,7 @@ class ProofreadDocumentRequest(BaseModel):
     document_text: str
     document_type: str
     existing_improvements: Optional[List[str]] = None
+    mode: Literal["full", "diff"] = "full"  # "diff" re-analyzes only changed paragraphs
 
 class ProofreadDocumentResponse(BaseModel):
     """Response containing new improvement suggestions."""
@@ -0,0 +1,47 @@
+from enum import StrEnum
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+
+
+class JobType(StrEnum):
+    """Long-running operations that can be run as background jobs."""
+    SCORE_FOUNDATIONS = "score_foundations"
+    GENERATE_DOCUMENTS = "generate_documents"
+
+
+class JobStatus(StrEnum):
+    """Lifecycle of a job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class SubmitJobRequest(BaseModel):
+    """Request to run an operation as a background job."""
+    type: JobType
+    session_id: str
+    foundation_id: Optional[str] = None  # required for generate_documents
+    limit: int = Field(default=5, ge=1, le=20)  # number of matches for score_foundations
+
+
+class Job(BaseModel):
+    """A background job and its outcome."""
+    job_id: str
+    type: JobType
+    status: JobStatus
+    session_id: str
+    foundation_id: Optional[str] = None
+    params: Dict[str, Any] = {}
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None  # response of the equivalent endpoint
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+
+class JobResponse(BaseModel):
+    """Response containing a job."""
+    success: bool
+    job: Job
+    message: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Literal, Optional, Dict, Any, Union
 from datetime import datetime
 
 class ChatMessage(BaseModel):
@@ -14,6 +14,19 @@ class ApplicationDocument(BaseModel):
     content: str  # current text/content of the document
     improvements: List[str] = []  # list of improvement suggestions
 
+class ConversationSummaryContent(BaseModel):
+    """Structured summary of a project interview, as produced by the LLM."""
+    project_name: str = Field(default="", description="Name of the project, empty if not known yet")
+    facts: List[str] = Field(default=[], description="Concrete facts about the project (scope, location, budget, timeline, resources, motivation), one short statement each")
+    target_group: str = Field(default="", description="Target group of the project, empty if not known yet")
+    charitable_purposes: List[str] = Field(default=[], description="Charitable purposes the project serves")
+    open_questions: List[str] = Field(default=[], description="Important details the user has not provided yet")
+
+class ConversationSummary(ConversationSummaryContent):
+    """Rolling summary of a session's chat, stored on the session."""
+    summarized_messages: int = 0  # number of leading chat messages covered by the summary
+    updated_at: Optional[str] = None
+
 class SessionData(BaseModel):
     """Session data stored in the database."""
     session_id: str
@@ -22,9 +35,27 @@ class SessionData(BaseModel):
     current_foundation_id: Optional[str] = None
     project_query: Optional[str] = None
     application_documents: Dict[str, List[ApplicationDocument]] = {}  # foundation_id -> list of documents
+    conversation_summary: Optional[ConversationSummary] = None
+    version: int = 0  # incremented by every session write except chat transcript appends
     created_at: str
     updated_at: str
 
+class SessionSummary(BaseModel):
+    """Precomputed view of a session for listing recent sessions."""
+    session_id: str
+    title: Optional[str] = None  # project name, else project query, else first user message
+    message_count: int = 0
+    updated_at: str
+    last_foundation_id: Optional[str] = None  # foundation most recently selected or worked on
+    has_documents: bool = False
+    last_document_foundation_id: Optional[str] = None  # foundation whose documents were saved last
+
+class SessionSummaryListResponse(BaseModel):
+    """Response listing session summaries."""
+    success: bool
+    count: int
+    sessions: List[SessionSummary]
+
 class CreateSessionRequest(BaseModel):
     """Request to create or update a session."""
     chat_messages: List[ChatMessage] = []
@@ -37,6 +68,63 @@ class UpdateApplicationDocumentsRequest(BaseModel):
     """Request to update application documents for a foundation."""
     documents: List[ApplicationDocument]
 
+class AppendMessagesOperation(BaseModel):
+    """Append chat messages to the transcript."""
+    op: Literal["append_messages"]
+    messages: List[ChatMessage] = Field(min_length=1)
+
+class SetCurrentFoundationOperation(BaseModel):
+    """Set the foundation currently being worked on."""
+    op: Literal["set_current_foundation"]
+    foundation_id: Optional[str] = None
+
+class SetProjectQueryOperation(BaseModel):
+    """Set the project query."""
+    op: Literal["set_project_query"]
+    project_query: Optional[str] = None
+
+class SetFoundationResultsOperation(BaseModel):
+    """Replace the foundation search results."""
+    op: Literal["set_foundation_results"]
+    foundation_results: List[Dict[str, Any]] = []
+
+class SetDocumentsOperation(BaseModel):
+    """Replace all application documents of one foundation."""
+    op: Literal["set_documents"]
+    foundation_id: str
+    documents: List[ApplicationDocument] = []
+
+class ReplaceDocumentOperation(BaseModel):
+    """Replace one application document (by document_type), adding it if missing."""
+    op: Literal["replace_document"]
+    foundation_id: str
+    document: ApplicationDocument
+
+SessionOperation = Annotated[
+    Union[
+        AppendMessagesOperation,
+        SetCurrentFoundationOperation,
+        SetProjectQueryOperation,
+        SetFoundationResultsOperation,
+        SetDocumentsOperation,
+        ReplaceDocumentOperation,
+    ],
+    Field(discriminator="op"),
+]
+
+class PatchSessionRequest(BaseModel):
+    """Delta update of a session, applied in order."""
+    operations: List[SessionOperation] = Field(min_length=1)
+    expected_version: Optional[int] = None  # reject with 409 if the session's version differs
+
+class PatchSessionResponse(BaseModel):
+    """Response to a delta update (the session itself is not sent back)."""
+    success: bool
+    session_id: str
+    version: int
+    updated_at: str
+    message: Optional[str] = None
+
 class SessionResponse(BaseModel):
     """Response containing session data."""
     success: bool
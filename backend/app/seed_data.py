@@ -5,6 +5,7 @@ Run with: python -m app.seed_data
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.services.foundation_catalog import bump_catalog_version
 
 # Mock data based on DATA_SCHEMA.md
 MOCK_FOUNDATIONS = [
@@ -318,9 +319,26 @@ async def seed_database():
         await db.foundations.create_index("gemeinnuetzige_zwecke")
         await db.foundations.create_index("foerderbereich.scope")
         await db.foundations.create_index("foerderhoehe.category")
-        await db.foundations.create_index([("name", "text"), ("short_description", "text")])
+        # Only one text index per collection is allowed, so replace the old one
+        async for index in db.foundations.list_indexes():
+            if "textIndexVersion" in index:
+                await db.foundations.drop_index(index["name"])
+        await db.foundations.create_index(
+            [
+                ("name", "text"),
+                ("short_description", "text"),
+                ("long_description", "text"),
+                ("past_projects.name", "text"),
+                ("past_projects.description", "text"),
+            ],
+            default_language="german",
+        )
         print("✅ Indexes created")
         
+        # Invalidate caches derived from the previous catalog
+        version = await bump_catalog_version(db)
+        print(f"✅ Foundation catalog version: {version}")
+        
         # Verify
         count = await db.foundations.count_documents({})
         print(f"\n📊 Total foundations in database: {count}")
@@ -0,0 +1,194 @@
+"""
+Local BM25 ranking over foundation texts.
+
+Replaces the MongoDB $text dependency for candidate generation: the index
+is built from the foundation catalog (name, descriptions, charitable
+purposes and past projects) and updated incrementally when the catalog
+reloads. Text is analyzed for German: umlaut folding, stopword removal and
+a light CISTEM-style stemmer.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Relative weight of each indexed field (BM25F-style term frequency boost)
+FIELD_WEIGHTS: Dict[str, float] = {
+    "name": 3.0,
+    "short_description": 2.0,
+    "long_description": 1.0,
+    "purposes": 1.0,
+    "past_projects": 1.0,
+}
+
+GERMAN_STOPWORDS = frozenset(
+    """
+    aber alle allem allen aller alles als also am an ander andere anderem anderen
+    anderer anderes auch auf aus bei bin bis bist da damit dann das dass dasselbe
+    dazu dein deine deinem deinen deiner dem den denn der des desselben dessen
+    dich die dies diese dieselbe dieselben diesem diesen dieser dieses dir doch
+    dort du durch ein eine einem einen einer eines einig einige einigem einigen
+    einiger einiges einmal er es etwas euch euer eure eurem euren eurer für gegen
+    gewesen hab habe haben hat hatte hatten hier hin hinter ich ihm ihn ihnen ihr
+    ihre ihrem ihren ihrer im in indem ins ist jede jedem jeden jeder jedes jene
+    jenem jenen jener jenes jetzt kann kein keine keinem keinen keiner man manche
+    manchem manchen mancher manches mein meine meinem meinen meiner mich mir mit
+    muss musste nach nicht nichts noch nun nur ob oder ohne sehr sein seine seinem
+    seinen seiner selbst sich sie sind so solche solchem solchen solcher soll
+    sollte sondern sonst über um und uns unser unsere unter viel vom von vor
+    während war waren warst was weg weil weiter welche welchem welchen welcher
+    welches wenn werde werden wie wieder will wir wird wirst wo wollen wollte
+    würde würden zu zum zur zwar zwischen sowie bzw insbesondere
+    """.split()
+)
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_TOKEN_RE = re.compile(r"[a-zäöüß0-9]+")
+
+
+def fold_umlauts(text: str) -> str:
+    """Replace German umlauts and ß with their ASCII transliterations."""
+    return text.translate(_UMLAUTS)
+
+
+def stem_german(token: str) -> str:
+    """
+    Light German stemmer based on CISTEM (Weissweiler & Fraser, 2017).
+
+    Expects lowercase, umlaut-folded input.
+    """
+    if len(token) > 6 and token.startswith("ge"):
+        token = token[2:]
+
+    # Protect multi-letter sequences and doubled letters from suffix stripping
+    token = token.replace("sch", "$").replace("ei", "%").replace("ie", "&")
+    token = re.sub(r"(.)\1", r"\1*", token)
+
+    while len(token) > 3:
+        if len(token) > 5 and token[-2:] in ("em", "er", "nd"):
+            token = token[:-2]
+        elif token[-1] in ("t", "e", "s", "n"):
+            token = token[:-1]
+        else:
+            break
+
+    token = re.sub(r"(.)\*", r"\1\1", token)
+    return token.replace("$", "sch").replace("%", "ei").replace("&", "ie")
+
+
+def analyze(text: str) -> List[str]:
+    """Tokenize German text into stemmed, stopword-free terms."""
+    terms = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) < 2 or token in GERMAN_STOPWORDS:
+            continue
+        terms.append(stem_german(fold_umlauts(token)))
+    return terms
+
+
+class BM25Index:
+    """In-memory BM25 index with incremental add/remove of documents."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._doc_hashes: Dict[str, str] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    @staticmethod
+    def content_hash(fields: Dict[str, str]) -> str:
+        """Hash of a document's indexed fields, used to skip unchanged updates."""
+        raw = "\x1f".join(f"{name}={fields.get(name, '')}" for name in FIELD_WEIGHTS)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def upsert(self, doc_id: str, fields: Dict[str, str]) -> bool:
+        """
+        Index a document, replacing any previous version.
+
+        Returns:
+            False if the document was already indexed with identical content
+        """
+        content_hash = self.content_hash(fields)
+        if self._doc_hashes.get(doc_id) == content_hash:
+            return False
+        self.remove(doc_id)
+
+        weighted_tf: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in analyze(fields.get(field) or ""):
+                weighted_tf[term] += weight
+
+        for term, tf in weighted_tf.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+        length = sum(weighted_tf.values())
+        self._doc_terms[doc_id] = tuple(weighted_tf)
+        self._doc_lengths[doc_id] = length
+        self._doc_hashes[doc_id] = content_hash
+        self._total_length += length
+        return True
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document from the index if present."""
+        if doc_id not in self._doc_lengths:
+            return
+        for term in self._doc_terms.pop(doc_id):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._doc_hashes.pop(doc_id, None)
+
+    def retain(self, doc_ids: Set[str]) -> None:
+        """Remove every document whose ID is not in `doc_ids`."""
+        for doc_id in [d for d in self._doc_lengths if d not in doc_ids]:
+            self.remove(doc_id)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        candidate_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank documents for a free-text query.
+
+        Args:
+            query: Free text (e.g. project name, description and target group)
+            limit: Maximum number of results
+            candidate_ids: Optional whitelist of document IDs to rank
+
+        Returns:
+            (doc_id, score) pairs with score > 0, best first
+        """
+        doc_count = len(self._doc_lengths)
+        if not doc_count:
+            return []
+
+        allowed = set(candidate_ids) if candidate_ids is not None else None
+        avg_length = self._total_length / doc_count
+        scores: Dict[str, float] = {}
+
+        for term, query_tf in Counter(analyze(query)).items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
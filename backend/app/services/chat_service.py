@@ -1,28 +1,65 @@
+import logging
 from datetime import datetime
-from typing import Literal, Union, cast, Any
+from typing import AsyncIterator, Literal, Union, cast, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import SecretStr
-from app.models.chat import ChatResponse
+from app.models.chat import ChatDelta, ChatResponse
 from app.models.project_description import ProjectDescription, ProjectDescriptionWrapper
 from app.models.session import ChatMessage as SessionChatMessage
 from app.core.config import settings
-from langchain_openai import ChatOpenAI
+from app.core.llm import get_chat_model
+from app.core.logging import span
 from langchain.agents import create_agent
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
+from langchain_core.messages import SystemMessage
+from app.services.conversation_store import get_conversation_store
+from app.services.conversation_summary_service import (
+    get_conversation_summary_service,
+    summary_context,
+)
 from app.services.prompt_service import get_project_idea_prompt
+from app.services.session_storage import project_title, title_fields
 
+logger = logging.getLogger(__name__)
+
+
+# Agent graph and streaming model are built once, on first use
+_agent = None
+_streaming_llm = None
+
+
+def get_chat_agent():
+    """Get or create the project interview agent."""
+    global _agent
+    if _agent is None:
+        _agent = create_agent(
+            model=get_chat_model(),
+            system_prompt=get_project_idea_prompt(),
+            response_format=ProjectDescriptionWrapper,
+        ) # type: ignore
+    return _agent
 
-llm = ChatOpenAI(
-    model="anthropic/claude-haiku-4-5",
-    api_key=SecretStr(settings.REQUESTY_API_KEY),
-    base_url=settings.REQUESTY_BASE_URL,
-)
 
-agent = create_agent(
-    model=llm,
-    system_prompt=get_project_idea_prompt(),
-    response_format=ProjectDescriptionWrapper,
-) # type: ignore
+def get_streaming_llm():
+    """
+    Get the chat model bound to the ProjectDescriptionWrapper as a plain JSON
+    schema, so that streaming yields partial argument dicts (the pydantic
+    parser only emits complete objects).
+    """
+    global _streaming_llm
+    if _streaming_llm is None:
+        _streaming_llm = get_chat_model().with_structured_output(
+            ProjectDescriptionWrapper.model_json_schema(),
+            method="function_calling",
+        )
+    return _streaming_llm
+
+
+def project_fields(project: ProjectDescription) -> dict[str, Any]:
+    """Session fields to store with a (draft or final) project description."""
+    project_description = project.model_dump()
+    return {
+        "project_description": project_description,
+        **title_fields(project_title(project_description), "project_description"),
+    }
 
 
 class ChatService:
@@ -31,6 +68,8 @@ class ChatService:
     def __init__(self, database: AsyncIOMotorDatabase):
         self.db = database
         self.collection = self.db.sessions
+        self.conversations = get_conversation_store()
+        self.summaries = get_conversation_summary_service()
     
     async def process_message(self, session_id: str, content: str) -> ChatResponse:
         """
@@ -53,45 +92,66 @@ class ChatService:
                 timestamp=now
             )
             
-            # Store user message in session
-            await self.collection.update_one(
-                {"session_id": session_id},
-                {
-                    "$push": {"chat_messages": user_message.model_dump()},
-                    "$set": {"updated_at": now}
-                }
-            )
-
-            # Get messages from session
-            session_doc = await self.collection.find_one({"session_id": session_id}, {"chat_messages": 1})
-            
-            # Transform MongoDB messages to LangChain message format
-            langchain_messages: list[BaseMessage] = []
-            if session_doc and "chat_messages" in session_doc:
-                for msg in session_doc["chat_messages"]:
-                    if msg["role"] == "user":
-                        langchain_messages.append(HumanMessage(content=msg["content"]))
-                    elif msg["role"] == "assistant":
-                        langchain_messages.append(AIMessage(content=msg["content"]))
+            # Store user message and get the conversation (cached across turns)
+            conversation = await self.conversations.append(self.db, session_id, user_message)
+            # Summary of earlier turns + the most recent messages
+            with span("prompt.chat_context"):
+                langchain_messages = summary_context(
+                    conversation, settings.CONVERSATION_SUMMARY_KEEP_MESSAGES
+                )
             
-            print(f"🔍 DEBUG: Invoking agent with {len(langchain_messages)} messages")
-            response = await agent.ainvoke({"messages": cast(Any, langchain_messages)})
-            print(f"🔍 DEBUG: Agent response: {response}")
+            with span("llm.chat_agent", messages=len(langchain_messages)):
+                response = await get_chat_agent().ainvoke({"messages": cast(Any, langchain_messages)})
 
             llm_response = response.get("structured_response")
             if llm_response is None:
-                print("ERROR: No structured output from LLM")
                 raise ValueError("No structured output from LLM")
             else:
                 return await self.handle_llm_response(llm_response, session_id)
 
-        except Exception as e:
-            print(f"❌ ERROR in process_message: {type(e).__name__}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception(f"Failed to process chat message of session {session_id}")
             raise
 
 
+    async def stream_message(
+        self, session_id: str, content: str
+    ) -> AsyncIterator[Union[ChatDelta, ChatResponse]]:
+        """
+        Process a chat message, streaming the assistant's reply as it is generated.
+        
+        Yields ChatDelta chunks of the `message` field while the model produces
+        it, then the final ChatResponse once the full ProjectDescriptionWrapper
+        is available and stored (same modes as process_message).
+        """
+        user_message = SessionChatMessage(
+            role="user",
+            content=content,
+            timestamp=datetime.utcnow().isoformat()
+        )
+        conversation = await self.conversations.append(self.db, session_id, user_message)
+        
+        with span("prompt.chat_context"):
+            prompt = [
+                SystemMessage(content=get_project_idea_prompt()),
+                *summary_context(conversation, settings.CONVERSATION_SUMMARY_KEEP_MESSAGES)
+            ]
+        streamed = ""
+        partial: dict[str, Any] = {}
+        with span("llm.chat_stream", messages=len(prompt)) as stream_span:
+            async for partial in get_streaming_llm().astream(prompt):
+                message = (partial or {}).get("message") or ""
+                # Partial JSON only ever grows, so the new text is the suffix
+                if len(message) > len(streamed) and message.startswith(streamed):
+                    yield ChatDelta(session_id=session_id, content=message[len(streamed):])
+                    streamed = message
+            stream_span["chars"] = len(streamed)
+        
+        if not partial:
+            raise ValueError("No structured output from LLM")
+        llm_response = ProjectDescriptionWrapper.model_validate(partial)
+        yield await self.handle_llm_response(llm_response, session_id)
+
     async def handle_llm_response(self, llm_response: ProjectDescriptionWrapper, session_id: str):
         """
         Handle the three possible response modes:
@@ -99,7 +159,8 @@ class ChatService:
         2. Both message + projectDescription -> Show proposal for review (refine)
         3. ProjectDescription only -> Final confirmation (finish)
         """
-        update_doc: dict[str, Any]
+        assistant_message: SessionChatMessage | None
+        fields: dict[str, Any]
         response_code: Literal["refine", "finish"]
         message: str
         
@@ -108,58 +169,55 @@ class ChatService:
         
         if has_message and has_project_desc:
             # MODE 2: Proposing extraction - show both message and store draft
-            print("📝 MODE 2: Proposing extraction with draft project description")
+            logger.debug(f"Session {session_id}: proposing draft project description")
             assistant_message = SessionChatMessage(
                 role="assistant",
                 content=llm_response.message,
                 timestamp=datetime.utcnow().isoformat()
             )
-            update_doc = {
-                "$push": {"chat_messages": assistant_message.model_dump()},
-                "$set": {
-                    "updated_at": datetime.utcnow().isoformat(),
-                    "project_description": llm_response.projectDescription.model_dump()
-                }
-            }
+            fields = project_fields(llm_response.projectDescription)
             response_code = "finish"
             message = llm_response.message
             
         elif has_message:
             # MODE 1: Gathering info - continue conversation
-            print("💬 MODE 1: Gathering information")
+            logger.debug(f"Session {session_id}: gathering information")
             assistant_message = SessionChatMessage(
                 role="assistant",
                 content=llm_response.message,
                 timestamp=datetime.utcnow().isoformat()
             )
-            update_doc = {
-                "$push": {"chat_messages": assistant_message.model_dump()},
-                "$set": {"updated_at": datetime.utcnow().isoformat()}
-            }
+            fields = {}
             response_code = "refine"
             message = llm_response.message
             
         elif has_project_desc:
             # MODE 3: Final confirmation - save as final
-            print("✅ MODE 3: Final confirmation")
-            update_doc = {
-                "$set": {
-                    "project_description": llm_response.projectDescription.model_dump(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
+            logger.debug(f"Session {session_id}: project description confirmed")
+            assistant_message = None
+            fields = {
+                **project_fields(llm_response.projectDescription),
+                "updated_at": datetime.utcnow().isoformat()
             }
             response_code = "finish"
             message = "Perfekt! Ich verstehe jetzt dein Projekt und kann dir helfen, die beste Förderung zu finden."
             
         else:
             # Should not happen, but handle gracefully
-            print("⚠️ WARNING: LLM returned empty response")
+            logger.warning(f"Chat model returned an empty response for session {session_id}")
             raise ValueError("LLM returned neither message nor projectDescription")
 
-        await self.collection.update_one(
-            {"session_id": session_id},
-            update_doc
-        )
+        if assistant_message is not None:
+            conversation = await self.conversations.append(
+                self.db, session_id, assistant_message, fields
+            )
+            self.summaries.schedule(self.db, session_id, conversation)
+        else:
+            with span("mongo.session_update"):
+                await self.collection.update_one(
+                    {"session_id": session_id},
+                    {"$set": fields}
+                )
         
         return ChatResponse(
             session_id=session_id,
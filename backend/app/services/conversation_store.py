@@ -0,0 +1,166 @@
+"""
+In-process conversation state for chat sessions.
+
+Keeps each session's parsed LangChain message list (and its rolling
+summary) in an LRU so a chat turn appends to it in place instead of
+re-reading and re-parsing the whole transcript. MongoDB stays the source of
+truth: every message is still stored as a row of `session_messages`, with
+its sequence number taken from the session's `message_count` in the same
+transaction. If that number is not the one the cache expects, another
+worker (or a session update) changed the transcript in between and the
+cache entry is rebuilt from the stored messages.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.logging import span
+from app.core.metrics import metrics
+from app.models.session import ChatMessage, ConversationSummary
+from app.services.session_storage import (
+    in_transaction,
+    insert_messages,
+    load_messages,
+    set_title,
+    title_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def to_langchain_message(message: Dict[str, Any]) -> Optional[BaseMessage]:
+    """Convert a stored chat message into a LangChain message (None for unknown roles)."""
+    if message.get("role") == "user":
+        return HumanMessage(content=message["content"])
+    if message.get("role") == "assistant":
+        return AIMessage(content=message["content"])
+    return None
+
+
+class ConversationStore:
+    """LRU of per-session LangChain message lists, backed by session_messages."""
+
+    def __init__(self):
+        self._memory: LRUCache[str, "Conversation"] = LRUCache(
+            max_size=settings.CONVERSATION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.CONVERSATION_CACHE_TTL_SECONDS,
+        )
+
+    async def append(
+        self,
+        db: AsyncIOMotorDatabase,
+        session_id: str,
+        message: ChatMessage,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> "Conversation":
+        """
+        Push a message to the session and return the updated conversation.
+
+        Args:
+            db: Database handle
+            session_id: The session ID
+            message: Message to append to the transcript
+            fields: Additional top-level fields to $set in the same write
+
+        Returns:
+            The session's conversation, including the new message
+        """
+        async def write(mongo_session: AsyncIOMotorClientSession) -> Optional[int]:
+            # Reserve the message's sequence number and update the session fields
+            session_doc = await db.sessions.find_one_and_update(
+                {"session_id": session_id},
+                {
+                    "$inc": {"message_count": 1},
+                    "$set": {"updated_at": message.timestamp, **(fields or {})},
+                },
+                projection={"_id": 0, "message_count": 1},
+                return_document=ReturnDocument.AFTER,
+                session=mongo_session,
+            )
+            if session_doc is None:
+                return None
+            seq = session_doc["message_count"] - 1
+            await insert_messages(db, session_id, seq, [message.model_dump()], mongo_session)
+            if seq == 0 and message.role == "user":
+                await set_title(
+                    db, session_id, title_fields(message.content, "first_message"), mongo_session
+                )
+            return seq
+
+        with span("mongo.conversation_append"):
+            # One transaction, so a concurrent transcript replacement (PUT) can
+            # never see the reserved number without its message or vice versa
+            seq = await in_transaction(db, write)
+        if seq is None:
+            return await self.load(db, session_id)
+
+        conversation = self._memory.get(session_id)
+        if conversation is not None:
+            # Only extend the cache if it holds exactly the messages before this one
+            if conversation.stored_count == seq:
+                metrics.increment("conversation_store.hits")
+                conversation.add(message.model_dump())
+                return conversation
+            logger.info(f"Cached conversation of session {session_id} is stale; reloading")
+
+        metrics.increment("conversation_store.misses")
+        return await self.load(db, session_id)
+
+    async def load(self, db: AsyncIOMotorDatabase, session_id: str) -> "Conversation":
+        """Read a session's transcript (and summary) from MongoDB and cache it."""
+        with span("mongo.conversation_load") as load_span:
+            session_doc = await db.sessions.find_one(
+                {"session_id": session_id},
+                {"_id": 0, "conversation_summary": 1}
+            )
+            stored_messages = (
+                (await load_messages(db, [session_id]))[session_id] if session_doc is not None else []
+            )
+            load_span["messages"] = len(stored_messages)
+        conversation = Conversation()
+        if session_doc is None:
+            return conversation
+        for stored in stored_messages:
+            conversation.add(stored)
+        if session_doc.get("conversation_summary"):
+            conversation.summary = ConversationSummary(**session_doc["conversation_summary"])
+        self._memory.set(session_id, conversation)
+        return conversation
+
+    def invalidate(self, session_id: str) -> None:
+        """Forget the cached conversation (after the transcript was replaced or deleted)."""
+        self._memory.pop(session_id)
+
+
+class Conversation:
+    """Parsed messages, the length of the stored transcript and its summary."""
+
+    __slots__ = ("messages", "stored_count", "summary")
+
+    def __init__(self):
+        self.messages: List[BaseMessage] = []
+        self.stored_count = 0
+        self.summary: Optional[ConversationSummary] = None
+
+    def add(self, stored: Dict[str, Any]) -> None:
+        self.stored_count += 1
+        message = to_langchain_message(stored)
+        if message is not None:
+            self.messages.append(message)
+
+
+# Global store instance
+_conversation_store = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get or create the global conversation store instance."""
+    global _conversation_store
+    if _conversation_store is None:
+        _conversation_store = ConversationStore()
+    return _conversation_store
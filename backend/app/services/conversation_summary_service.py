@@ -0,0 +1,189 @@
+"""
+Rolling summary of project interviews.
+
+After a chat turn, messages that are not yet covered by the session's
+summary are folded into it by a small LLM call in the background. Prompts
+(chat agent, document generation) then send the summary plus only the most
+recent messages instead of the complete transcript.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional, Set
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from app.core.config import settings
+from app.core.llm import get_chat_model
+from app.core.metrics import metrics
+from app.models.session import ConversationSummary, ConversationSummaryContent
+from app.services.conversation_store import Conversation
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = """Du fasst ein Interview über ein gemeinnütziges Projekt zusammen.
+Du erhältst die bisherige Zusammenfassung (JSON) und die neuen Nachrichten seit dieser Zusammenfassung.
+Gib die aktualisierte Zusammenfassung zurück:
+- Übernimm alle bisherigen Fakten, sofern sie nicht durch neue Nachrichten korrigiert wurden
+- Ergänze neue Fakten als kurze, eigenständige Aussagen (Umfang, Ort, Budget, Zeitplan, Ressourcen, Motivation)
+- Entferne offene Fragen, die inzwischen beantwortet wurden
+- Erfinde nichts, was der Nutzer nicht gesagt hat"""
+
+
+def format_summary(summary: ConversationSummary) -> str:
+    """Render a summary as plain German text for LLM prompts."""
+    lines = []
+    if summary.project_name:
+        lines.append(f"Projektname: {summary.project_name}")
+    if summary.target_group:
+        lines.append(f"Zielgruppe: {summary.target_group}")
+    if summary.charitable_purposes:
+        lines.append(f"Gemeinnützige Zwecke: {'; '.join(summary.charitable_purposes)}")
+    if summary.facts:
+        lines.append("Fakten:")
+        lines.extend(f"- {fact}" for fact in summary.facts)
+    if summary.open_questions:
+        lines.append("Offene Fragen:")
+        lines.extend(f"- {question}" for question in summary.open_questions)
+    return "\n".join(lines)
+
+
+def summary_context(conversation: Conversation, keep_last: int) -> List[BaseMessage]:
+    """
+    Messages to send to the chat agent: the summary plus unsummarized messages.
+
+    At least the last `keep_last` messages are always included verbatim.
+    Replacing the transcript (PUT /sessions) removes the summary; one that
+    still covers more messages than the transcript holds is ignored.
+    """
+    messages = conversation.messages
+    summary = conversation.summary
+    if (
+        not settings.CONVERSATION_SUMMARY_ENABLED
+        or summary is None
+        or not 0 < summary.summarized_messages <= len(messages)
+    ):
+        return list(messages)
+
+    start = min(summary.summarized_messages, max(len(messages) - keep_last, 0))
+    note = SystemMessage(
+        content=f"Zusammenfassung des bisherigen Gesprächs:\n{format_summary(summary)}"
+    )
+    return [note, *messages[start:]]
+
+
+class ConversationSummaryService:
+    """Maintains `sessions.conversation_summary` incrementally."""
+
+    def __init__(self):
+        self.summarizer = get_chat_model().with_structured_output(ConversationSummaryContent)
+        self._running: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def schedule(
+        self, db: AsyncIOMotorDatabase, session_id: str, conversation: Conversation
+    ) -> None:
+        """Update the summary in the background if enough new messages piled up."""
+        if not settings.CONVERSATION_SUMMARY_ENABLED or session_id in self._running:
+            return
+        if not self._needs_update(conversation):
+            return
+
+        task = asyncio.create_task(self.update(db, session_id, conversation))
+        # Keep a reference so the task is not garbage-collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _needs_update(conversation: Conversation) -> bool:
+        total = len(conversation.messages)
+        if total <= settings.CONVERSATION_SUMMARY_KEEP_MESSAGES:
+            return False
+        covered = conversation.summary.summarized_messages if conversation.summary else 0
+        if covered > total:
+            return True  # transcript was replaced; start over
+        return total - covered >= settings.CONVERSATION_SUMMARY_MIN_NEW_MESSAGES
+
+    async def update(
+        self, db: AsyncIOMotorDatabase, session_id: str, conversation: Conversation
+    ) -> Optional[ConversationSummary]:
+        """
+        Fold the messages not yet covered into the summary and store it.
+
+        The write is conditioned on the summary it was based on, so a
+        concurrent update from another worker is never overwritten by an
+        older one.
+        """
+        self._running.add(session_id)
+        try:
+            previous = conversation.summary
+            end = len(conversation.messages)
+            if previous is not None and previous.summarized_messages > end:
+                previous_covered: Optional[int] = previous.summarized_messages
+                previous = None
+            else:
+                previous_covered = previous.summarized_messages if previous else None
+            start = previous.summarized_messages if previous else 0
+            new_messages = conversation.messages[start:end]
+
+            content = await self.summarizer.ainvoke([
+                SystemMessage(content=SUMMARY_PROMPT),
+                HumanMessage(content=self._build_input(previous, new_messages)),
+            ])
+            summary = ConversationSummary(
+                **ConversationSummaryContent.model_validate(content).model_dump(),
+                summarized_messages=end,
+                updated_at=datetime.utcnow().isoformat(),
+            )
+
+            condition = (
+                {"conversation_summary.summarized_messages": previous_covered}
+                if previous_covered is not None
+                else {"conversation_summary": None}
+            )
+            result = await db.sessions.update_one(
+                {"session_id": session_id, **condition},
+                {"$set": {"conversation_summary": summary.model_dump()}},
+            )
+            if not result.matched_count:
+                logger.info(f"Summary of session {session_id} changed concurrently; skipped")
+                return None
+
+            conversation.summary = summary
+            metrics.increment("conversation_summary.updates")
+            return summary
+        except Exception:
+            # Summaries are an optimization; the full transcript remains usable
+            metrics.increment("conversation_summary.failures")
+            logger.exception(f"Failed to update conversation summary of session {session_id}")
+            return None
+        finally:
+            self._running.discard(session_id)
+
+    @staticmethod
+    def _build_input(
+        previous: Optional[ConversationSummary], new_messages: List[BaseMessage]
+    ) -> str:
+        previous_json = (
+            ConversationSummaryContent(**previous.model_dump()).model_dump_json()
+            if previous
+            else "{}"
+        )
+        transcript = "\n".join(
+            f"{'Assistent' if isinstance(message, AIMessage) else 'Nutzer'}: {message.content}"
+            for message in new_messages
+        )
+        return f"BISHERIGE ZUSAMMENFASSUNG:\n{previous_json}\n\nNEUE NACHRICHTEN:\n{transcript}"
+
+
+# Global service instance
+_conversation_summary_service = None
+
+
+def get_conversation_summary_service() -> ConversationSummaryService:
+    """Get or create the global conversation summary service instance."""
+    global _conversation_summary_service
+    if _conversation_summary_service is None:
+        _conversation_summary_service = ConversationSummaryService()
+    return _conversation_summary_service
@@ -1,22 +1,33 @@
 """
-Document generation service using Gemini AI for creating application documents.
+Document generation service that drafts application documents with the shared LLM (app.core.llm).
 """
 
-from typing import List, cast, Any
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple, cast, Any
+import asyncio
+import hashlib
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+import logging
+import re
 from langchain.agents import create_agent
-from langchain_core.messages import HumanMessage, BaseMessage
-from pydantic import BaseModel, Field, SecretStr
+from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage
+from pydantic import BaseModel, Field
 
 from app.models.document_generation import (
+    ChatMessageInput,
     GenerateDocumentsRequestLegacy,
     GeneratedDocument,
     RequiredDocumentInput
 )
+from app.core.cache import LRUCache
 from app.core.config import settings
+from app.core.llm import get_chat_model
+from app.core.logging import span
+from app.core.metrics import metrics
+from app.core.singleflight import flight_key, singleflight
+from app.models.session import ConversationSummary, SessionData
+from app.services.conversation_summary_service import format_summary
+
+logger = logging.getLogger(__name__)
 
 
 class DocumentOutput(BaseModel):
@@ -31,19 +42,70 @@ class DocumentsListOutput(BaseModel):
     documents: List[DocumentOutput] = Field(description="List of generated documents")
 
 
+class ParagraphReview(BaseModel):
+    """Suggestions for one reviewed paragraph."""
+    paragraph: int = Field(description="Number of the paragraph as given in the input, e.g. 1 for [1]")
+    improvements: List[str] = Field(default=[], description="Up to 2 concrete improvement suggestions for this paragraph; empty if it needs none", max_length=2)
+
+
+class ParagraphReviewOutput(BaseModel):
+    """Schema for a paragraph-wise proofreading review."""
+    paragraphs: List[ParagraphReview] = Field(description="One entry per paragraph in the input")
+
+
+ProofreadMode = Literal["full", "diff"]
+
+# Session parts build_request reads (documents are not needed to generate new ones)
+GENERATION_SESSION_PARTS = ("chat_messages", "foundation_results")
+
+# Upper bound of merged suggestions returned in diff mode
+PROOFREAD_MAX_IMPROVEMENTS = 5
+
+PROOFREAD_SYSTEM_PROMPT = """Du bist ein erfahrener Lektor und Experte für Stiftungsanträge.
+Deine Aufgabe ist es, konstruktive Verbesserungsvorschläge für Antragsunterlagen zu geben.
+
+RICHTLINIEN:
+1. Analysiere den Text auf Verbesserungspotenziale
+2. Fokussiere auf: Klarheit, Präzision, Überzeugungskraft, Vollständigkeit
+3. Gib GENAU 3 konkrete Verbesserungsvorschläge
+4. Jeder Vorschlag sollte umsetzbar und spezifisch sein
+5. Vermeide bereits gemachte Vorschläge
+6. Priorisiere die 3 wichtigsten Verbesserungen"""
+
+PARAGRAPH_REVIEW_SYSTEM_PROMPT = """Du bist ein erfahrener Lektor und Experte für Stiftungsanträge.
+Du prüfst einzelne, nummerierte Absätze eines Antragsdokuments.
+
+RICHTLINIEN:
+1. Fokussiere auf: Klarheit, Präzision, Überzeugungskraft, Vollständigkeit
+2. Jeder Vorschlag sollte umsetzbar und spezifisch für den jeweiligen Absatz sein
+3. Vermeide bereits gemachte Vorschläge
+4. Gib einem Absatz keine Vorschläge, wenn er bereits gut ist
+5. Gib für JEDEN Absatz einen Eintrag zurück, auch wenn er keine Vorschläge hat"""
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split a document into non-empty paragraphs (separated by blank lines)."""
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+def generation_summary_message(documents: List[GeneratedDocument]) -> str:
+    """Summary line of a generation run; placeholders are not counted as generated."""
+    fallback_count = sum(1 for doc in documents if doc.source == "fallback")
+    message = f"Successfully generated {len(documents) - fallback_count} document(s)"
+    if fallback_count:
+        message += f" ({fallback_count} placeholder(s) - generation failed)"
+    return message
+
+
 class DocumentGenerationService:
-    """Service for generating application documents using Gemini AI."""
+    """Service for generating application documents with the shared LLM."""
     
     def __init__(self):
         """Initialize the AI model with structured output using agent."""
         if not settings.REQUESTY_API_KEY:
-            print("❌ WARNING: REQUESTY_API_KEY is not set!")
+            logger.warning("REQUESTY_API_KEY is not set")
         
-        self.llm = ChatOpenAI(
-            model="anthropic/claude-haiku-4-5",
-            api_key=SecretStr(settings.REQUESTY_API_KEY),
-            base_url=settings.REQUESTY_BASE_URL,
-        )
+        self.llm = get_chat_model()
         
         # Create agent with structured output for document generation
         system_prompt = self._get_system_prompt()
@@ -52,22 +114,267 @@ class DocumentGenerationService:
             system_prompt=system_prompt,
             response_format=DocumentsListOutput,
         )  # type: ignore
+        
+        # Single-document structured output for per-document generation
+        self.document_llm = self.llm.with_structured_output(DocumentOutput)
+        
+        # Bound concurrent per-document LLM calls across all requests
+        self._semaphore = asyncio.Semaphore(settings.DOCUMENT_GENERATION_MAX_CONCURRENCY)
+        
+        # Paragraph-wise structured output for diff-mode proofreading
+        self.paragraph_review_llm = self.llm.with_structured_output(ParagraphReviewOutput)
+        
+        # Proofreading results by document (and by paragraph in diff mode)
+        self._proofread_cache: LRUCache[str, List[str]] = LRUCache(
+            max_size=settings.PROOFREAD_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PROOFREAD_CACHE_TTL_SECONDS,
+        )
+    
+    def build_request(
+        self,
+        session_data: SessionData,
+        foundation_id: str
+    ) -> GenerateDocumentsRequestLegacy | None:
+        """
+        Assemble the generation request for a foundation from the session
+        (required documents, chat context, project and foundation details).
+        
+        Returns:
+            The request, or None if the foundation is not in the session's results
+        """
+        # Find the foundation in the session's foundation_results
+        foundation = None
+        for f in session_data.foundation_results:
+            if f.get("id") == foundation_id:
+                foundation = f
+                break
+        
+        if not foundation:
+            return None
+        
+        # Extract required documents from foundation
+        antragsprozess = foundation.get("antragsprozess", {})
+        required_docs = antragsprozess.get("required_documents", [])
+        
+        logger.debug(
+            f"Foundation {foundation.get('id')} lists {len(required_docs or [])} required documents",
+            extra={"antragsprozess_keys": list(antragsprozess) if isinstance(antragsprozess, dict) else None}
+        )
+        
+        # If no required documents found, use default set
+        if not required_docs:
+            logger.info(f"Foundation {foundation.get('id')} lists no required documents; using defaults")
+            required_docs = [
+                {
+                    "document_type": "projektbeschreibung",
+                    "description": "Detaillierte Beschreibung des Projekts, seiner Ziele, Zielgruppe und geplanten Wirkung",
+                    "required": True
+                },
+                {
+                    "document_type": "budgetplan",
+                    "description": "Detaillierte Kostenaufstellung mit allen Ausgaben und Einnahmen des Projekts",
+                    "required": True
+                },
+                {
+                    "document_type": "zeitplan",
+                    "description": "Projektzeitplan mit Meilensteinen und wichtigen Terminen",
+                    "required": True
+                }
+            ]
+        
+        # Convert to RequiredDocumentInput format
+        required_documents = [
+            RequiredDocumentInput(
+                document_type=doc.get("document_type", ""),
+                description=doc.get("description", ""),
+                required=doc.get("required", True)
+            )
+            for doc in required_docs
+        ]
+        
+        # Earlier messages are covered by the rolling conversation summary
+        # (if it still matches the transcript); send the rest, at most 10
+        summary = session_data.conversation_summary
+        if summary and 0 < summary.summarized_messages <= len(session_data.chat_messages):
+            unsummarized = session_data.chat_messages[summary.summarized_messages:]
+        else:
+            summary = None
+            unsummarized = session_data.chat_messages
+        recent_messages = unsummarized[-10:]
+        chat_messages = [
+            ChatMessageInput(
+                role=msg.role,
+                content=msg.content
+            )
+            for msg in recent_messages
+        ]
+        
+        # Build foundation details - only essential information
+        foundation_details = {
+            "purpose": foundation.get("purpose"),
+            "foerderhoehe": foundation.get("foerderhoehe"),
+            "foerderbereich": foundation.get("foerderbereich"),
+        }
+        
+        # Truncate project query if too long (max 500 chars)
+        project_query = session_data.project_query or ""
+        if len(project_query) > 500:
+            project_query = project_query[:500] + "..."
+        
+        return GenerateDocumentsRequestLegacy(
+            required_documents=required_documents,
+            chat_messages=chat_messages,
+            conversation_summary=summary,
+            project_query=project_query,
+            foundation_name=foundation.get("name"),
+            foundation_details=foundation_details
+        )
     
     async def generate_documents(
         self, 
-        request: GenerateDocumentsRequestLegacy
+        request: GenerateDocumentsRequestLegacy,
+        session_id: Optional[str] = None,
+        foundation_id: Optional[str] = None
     ) -> List[GeneratedDocument]:
         """
-        Generate content for required documents using Gemini AI.
+        Generate content for required documents.
+        
+        With DOCUMENT_GENERATION_PARALLEL each document is written by its own
+        concurrent LLM call (see iter_documents); otherwise all documents are
+        requested in a single structured response. Concurrent calls with an
+        identical request for the same session and foundation share one
+        generation (single-flight).
         
         Args:
             request: The generation request with context (legacy format with all data)
+            session_id: Session the request belongs to (scopes coalescing)
+            foundation_id: Foundation the documents are for (scopes coalescing)
             
         Returns:
-            List of generated documents with AI-generated content
+            List of generated documents, in the order of request.required_documents
+        """
+        key = flight_key(
+            "generate_documents", session_id, foundation_id, request.model_dump(mode="json")
+        )
+        generated = await singleflight.do(key, lambda: self._generate_documents(request))
+        return list(generated)
+    
+    async def _generate_documents(
+        self,
+        request: GenerateDocumentsRequestLegacy
+    ) -> List[GeneratedDocument]:
+        if not settings.DOCUMENT_GENERATION_PARALLEL:
+            return await self._generate_combined(request)
+        
+        tasks = self._start_document_tasks(request)
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def iter_documents(
+        self,
+        request: GenerateDocumentsRequestLegacy
+    ) -> AsyncIterator[GeneratedDocument]:
+        """
+        Generate each required document in its own LLM call, yielding
+        documents as they complete.
+        
+        Each document is retried up to DOCUMENT_GENERATION_MAX_RETRIES times
+        and falls back to a placeholder (source="fallback") on its own,
+        without affecting the other documents.
         """
+        tasks = self._start_document_tasks(request)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    @staticmethod
+    def in_required_order(
+        request: GenerateDocumentsRequestLegacy,
+        documents: List[GeneratedDocument]
+    ) -> List[GeneratedDocument]:
+        """Sort documents (e.g. collected from iter_documents) into request order."""
+        order = {doc.document_type: i for i, doc in enumerate(request.required_documents)}
+        return sorted(documents, key=lambda doc: order.get(doc.document, len(order)))
+    
+    def _start_document_tasks(
+        self,
+        request: GenerateDocumentsRequestLegacy
+    ) -> List["asyncio.Task[GeneratedDocument]"]:
+        """Start one generation task per required document (shared context built once)."""
+        project_query = request.project_query or "Unbekanntes Projekt"
+        with span("prompt.document_context", messages=len(request.chat_messages)):
+            chat_context = self._build_chat_context(request.chat_messages, request.conversation_summary)
+            foundation_context = self._build_foundation_context(
+                request.foundation_name,
+                request.foundation_details
+            )
+        return [
+            asyncio.create_task(
+                self._generate_single(doc, project_query, chat_context, foundation_context)
+            )
+            for doc in request.required_documents
+        ]
+    
+    async def _generate_single(
+        self,
+        document: RequiredDocumentInput,
+        project_query: str,
+        chat_context: str,
+        foundation_context: str
+    ) -> GeneratedDocument:
+        """Generate one document, retrying before falling back to a placeholder."""
+        messages: list[BaseMessage] = [
+            SystemMessage(content=self._get_system_prompt()),
+            HumanMessage(content=self._build_human_message(
+                project_query,
+                chat_context,
+                foundation_context,
+                self._build_documents_info([document])
+            ))
+        ]
+        
+        attempts = settings.DOCUMENT_GENERATION_MAX_RETRIES + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                async with self._semaphore:
+                    with span("llm.generate_document", document=document.document_type, attempt=attempt):
+                        output = await asyncio.wait_for(
+                            self.document_llm.ainvoke(messages),
+                            timeout=settings.DOCUMENT_GENERATION_TIMEOUT
+                        )
+                if not isinstance(output, DocumentOutput):
+                    output = DocumentOutput(**output)
+                if not output.text.strip():
+                    raise ValueError("Empty document text")
+                
+                return GeneratedDocument(
+                    document=document.document_type,
+                    text=output.text,
+                    improvements=output.improvements or self._generate_fallback_improvements(document.document_type),
+                    source="model"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Generating {document.document_type} failed (attempt {attempt}/{attempts}): {type(e).__name__}: {e}"
+                )
+        
+        return self._generate_placeholder_document(document)
+    
+    async def _generate_combined(
+        self,
+        request: GenerateDocumentsRequestLegacy
+    ) -> List[GeneratedDocument]:
+        """Generate all documents in a single structured agent response."""
         # Build context from chat messages
-        chat_context = self._build_chat_context(request.chat_messages)
+        chat_context = self._build_chat_context(
+            request.chat_messages, request.conversation_summary
+        )
         
         # Build foundation context
         foundation_context = self._build_foundation_context(
@@ -80,8 +387,7 @@ class DocumentGenerationService:
         
         # Generate documents using agent with structured output
         try:
-            print(f"📝 Generating documents with AI...")
-            print(f"Documents to generate: {len(request.required_documents)}")
+            logger.debug(f"Generating {len(request.required_documents)} documents in one call")
             
             # Build the human message with all context
             human_message_content = self._build_human_message(
@@ -97,21 +403,19 @@ class DocumentGenerationService:
             ]
             
             # Invoke agent
-            response = await self.agent.ainvoke({"messages": cast(Any, messages)})
-            print(f"🔍 DEBUG: Agent response: {response}")
+            with span("llm.generate_documents", documents=len(request.required_documents)):
+                response = await self.agent.ainvoke({"messages": cast(Any, messages)})
             
             # Extract structured response
             parsed_output = response.get("structured_response")
             if parsed_output is None:
-                print("ERROR: No structured output from LLM")
                 raise ValueError("No structured output from LLM")
             
             if not isinstance(parsed_output, DocumentsListOutput):
                 # If it's a dict, convert it
                 parsed_output = DocumentsListOutput(**parsed_output)
             
-            print(f"✅ Successfully generated {len(parsed_output.documents)} documents")
-           
+            logger.debug(f"Generated {len(parsed_output.documents)} documents")
             
             # Convert to GeneratedDocument objects
             generated_docs = []
@@ -128,8 +432,8 @@ class DocumentGenerationService:
             
             return generated_docs
             
-        except Exception as e:
-            print(f"Error generating documents with Gemini: {e}")
+        except Exception:
+            logger.exception("Generating documents failed; returning placeholders")
             # Fallback to placeholder if AI fails
             return self._generate_placeholder_documents(request.required_documents)
     
@@ -251,9 +555,11 @@ FORMATIERUNG:
 
 WICHTIG: Das improvements-Array MUSS für JEDES Dokument GENAU 3 Einträge haben!"""
     
-    def _build_chat_context(self, messages: List) -> str:
-        """Build context from chat messages - limited to reduce token usage."""
-        if not messages:
+    def _build_chat_context(
+        self, messages: List, summary: ConversationSummary | None = None
+    ) -> str:
+        """Build context from the conversation summary and recent chat messages - limited to reduce token usage."""
+        if not messages and not summary:
             return "Keine zusätzlichen Informationen aus dem Chat vorhanden."
         
         # Limit to last 8 messages and truncate long messages
@@ -267,6 +573,8 @@ WICHTIG: Das improvements-Array MUSS für JEDES Dokument GENAU 3 Einträge haben
                 content = content[:300] + "..."
             context_parts.append(f"{role}: {content}")
         
+        if summary:
+            context_parts.insert(0, f"Zusammenfassung des Gesprächs:\n{format_summary(summary)}\n")
         return "\n".join(context_parts)
     
     def _build_foundation_context(self, foundation_name: str | None, foundation_details: dict | None) -> str:
@@ -309,93 +617,6 @@ WICHTIG: Das improvements-Array MUSS für JEDES Dokument GENAU 3 Einträge haben
         
         return "\n".join(docs_info)
     
-    def _parse_response(self, content: str) -> DocumentsListOutput:
-        """Parse the AI response to extract structured output."""
-        try:
-            # Remove markdown code blocks if present
-            cleaned_content = content.strip()
-            
-            # Remove opening ```json or ``` markers
-            if cleaned_content.startswith("```json"):
-                cleaned_content = cleaned_content[7:]
-            elif cleaned_content.startswith("```"):
-                cleaned_content = cleaned_content[3:]
-            
-            # Remove closing ``` marker
-            if cleaned_content.endswith("```"):
-                cleaned_content = cleaned_content[:-3]
-            
-            cleaned_content = cleaned_content.strip()
-            
-            # Try to find JSON in the cleaned response
-            start_idx = cleaned_content.find("{")
-            end_idx = cleaned_content.rfind("}") + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = cleaned_content[start_idx:end_idx]
-                
-                # Try to repair common JSON issues
-                json_str = self._repair_json(json_str)
-                
-                # Parse the JSON
-                data = json.loads(json_str, strict=False)
-                
-                return DocumentsListOutput(**data)
-            
-            # If no JSON found, raise an error
-            raise ValueError("No valid JSON found in response")
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            print(f"Error position: line {e.lineno}, column {e.colno}")
-            print(f"Problematic content snippet around error:")
-            # Try to show context around the error
-            if hasattr(e, 'pos') and e.pos:
-                start = max(0, e.pos - 100)
-                end = min(len(content), e.pos + 100)
-                print(f"...{content[start:end]}...")
-            
-            # Return a more helpful error
-            return DocumentsListOutput(documents=[
-                DocumentOutput(
-                    document="error",
-                    text=f"Fehler beim JSON-Parsing: {str(e)}\n\nBitte kontaktieren Sie den Support.",
-                    improvements=["Bitte kontaktieren Sie den Support für weitere Hilfe."]
-                )
-            ])
-        except Exception as e:
-            print(f"Error parsing response: {e}")
-            import traceback
-            traceback.print_exc()
-            # Try to create a fallback structure
-            return DocumentsListOutput(documents=[
-                DocumentOutput(
-                    document="error",
-                    text=f"Fehler beim Parsen der Antwort: {str(e)}\n\nBitte kontaktieren Sie den Support.",
-                    improvements=["Bitte kontaktieren Sie den Support für weitere Hilfe."]
-                )
-            ])
-    
-    def _repair_json(self, json_str: str) -> str:
-        """Attempt to repair common JSON formatting issues."""
-        # This is a simple repair - remove unescaped control characters
-        import re
-        
-        # Replace unescaped newlines, tabs, etc. within strings
-        # This regex finds strings and fixes control characters within them
-        def fix_string(match):
-            string_content = match.group(0)
-            # Only fix if it's inside a string (between quotes)
-            if string_content.startswith('"') and string_content.endswith('"'):
-                # Replace control characters
-                fixed = string_content.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                return fixed
-            return string_content
-        
-        # Don't repair - this could break valid JSON
-        # Instead, just return as-is and let json.loads with strict=False handle it
-        return json_str
-    
     def _generate_fallback_improvements(self, document_type: str) -> List[str]:
         """Generate fallback improvements if AI doesn't provide any."""
         improvements_map = {
@@ -433,45 +654,74 @@ WICHTIG: Das improvements-Array MUSS für JEDES Dokument GENAU 3 Einträge haben
         documents: List[RequiredDocumentInput]
     ) -> List[GeneratedDocument]:
         """Generate placeholder documents as fallback."""
-        placeholders = []
-        for doc in documents:
-            placeholders.append(
-                GeneratedDocument(
-                    document=doc.document_type,
-                    text=f"{doc.document_type.upper()}\n\n{doc.description}\n\nBitte füllen Sie dieses Dokument manuell aus.",
-                    improvements=self._generate_fallback_improvements(doc.document_type)
-                )
-            )
-        return placeholders
+        return [self._generate_placeholder_document(doc) for doc in documents]
+    
+    def _generate_placeholder_document(self, doc: RequiredDocumentInput) -> GeneratedDocument:
+        """Generate a placeholder for a single document as fallback."""
+        return GeneratedDocument(
+            document=doc.document_type,
+            text=f"{doc.document_type.upper()}\n\n{doc.description}\n\nBitte füllen Sie dieses Dokument manuell aus.",
+            improvements=self._generate_fallback_improvements(doc.document_type),
+            source="fallback"
+        )
     
     async def proofread_document(
         self,
         document_text: str,
         document_type: str,
-        existing_improvements: List[str] | None = None
+        existing_improvements: List[str] | None = None,
+        mode: ProofreadMode = "full"
     ) -> List[str]:
         """
         Generate new improvement suggestions for an existing document.
         
+        Results are cached by document text, type and existing improvements,
+        so proofreading an unchanged document again costs no LLM call.
+        
+        In "diff" mode the document is split into paragraphs and only
+        paragraphs without cached suggestions are sent to the LLM; the
+        suggestions for unchanged paragraphs are reused and merged in.
+        
         Args:
             document_text: The current document text
             document_type: The type of document
             existing_improvements: Previously suggested improvements (optional)
+            mode: "full" (whole document) or "diff" (changed paragraphs only)
             
         Returns:
-            List of new improvement suggestions
+            List of improvement suggestions
         """
-        system_message = """Du bist ein erfahrener Lektor und Experte für Stiftungsanträge.
-Deine Aufgabe ist es, konstruktive Verbesserungsvorschläge für Antragsunterlagen zu geben.
-
-RICHTLINIEN:
-1. Analysiere den Text auf Verbesserungspotenziale
-2. Fokussiere auf: Klarheit, Präzision, Überzeugungskraft, Vollständigkeit
-3. Gib GENAU 3 konkrete Verbesserungsvorschläge
-4. Jeder Vorschlag sollte umsetzbar und spezifisch sein
-5. Vermeide bereits gemachte Vorschläge
-6. Priorisiere die 3 wichtigsten Verbesserungen"""
-
+        existing = existing_improvements or []
+        key = self._proofread_key(mode, document_type, document_text, sorted(existing))
+        cached = self._proofread_cache.get(key)
+        if cached is not None:
+            metrics.increment("proofread.cache_hits")
+            return list(cached)
+        metrics.increment("proofread.cache_misses")
+        
+        try:
+            if mode == "diff":
+                improvements, complete = await self._proofread_paragraphs(
+                    document_text, document_type, existing
+                )
+            else:
+                improvements = await self._proofread_full(document_text, document_type, existing)
+                complete = True
+        except Exception:
+            logger.exception(f"Proofreading {document_type} failed")
+            return []
+        
+        if improvements and complete:
+            self._proofread_cache.set(key, improvements)
+        return list(improvements)
+    
+    async def _proofread_full(
+        self,
+        document_text: str,
+        document_type: str,
+        existing_improvements: List[str]
+    ) -> List[str]:
+        """Ask for 3 new suggestions on the whole document."""
         human_message = f"""Analysiere folgenden Text und gib neue Verbesserungsvorschläge:
 
 DOKUMENTTYP: {document_type}
@@ -485,46 +735,124 @@ TEXT:
 
 Gib GENAU 3 neue, konkrete Verbesserungsvorschläge.
 Antworte mit einem JSON-Objekt im Format:
-{{{{"improvements": ["Vorschlag 1", "Vorschlag 2", "Vorschlag 3"]}}}}"""
-
-        try:
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", system_message),
-                ("human", human_message)
+{{"improvements": ["Vorschlag 1", "Vorschlag 2", "Vorschlag 3"]}}"""
+        
+        with span("llm.proofread", mode="full", document=document_type):
+            response = await self.llm.ainvoke([
+                SystemMessage(content=PROOFREAD_SYSTEM_PROMPT),
+                HumanMessage(content=human_message)
             ])
+        
+        # Parse response
+        content = str(response.content).strip()
+        
+        # Remove markdown code blocks if present
+        if content.startswith("```json"):
+            content = content[7:]
+        elif content.startswith("```"):
+            content = content[3:]
+        if content.endswith("```"):
+            content = content[:-3]
+        
+        content = content.strip()
+        
+        # Find JSON
+        start_idx = content.find("{")
+        end_idx = content.rfind("}") + 1
+        
+        if start_idx != -1 and end_idx > start_idx:
+            json_str = content[start_idx:end_idx]
+            data = json.loads(json_str, strict=False)
             
-            chain = prompt | self.llm
-            response = chain.invoke({})
-            
-            # Parse response
-            content = response.content.strip()
-            
-            # Remove markdown code blocks if present
-            if content.startswith("```json"):
-                content = content[7:]
-            elif content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
-            content = content.strip()
-            
-            # Find JSON
-            start_idx = content.find("{")
-            end_idx = content.rfind("}") + 1
-            
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = content[start_idx:end_idx]
-                data = json.loads(json_str, strict=False)
-                
-                improvements = data.get("improvements", [])
-                # Limit to 3 improvements
-                return improvements[:3]
-            
-            return []
-            
-        except Exception as e:
-            print(f"Error in proofread_document: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            improvements = data.get("improvements", [])
+            # Limit to 3 improvements
+            return improvements[:3]
+        
+        return []
+    
+    async def _proofread_paragraphs(
+        self,
+        document_text: str,
+        document_type: str,
+        existing_improvements: List[str]
+    ) -> Tuple[List[str], bool]:
+        """
+        Review only paragraphs whose suggestions are not cached yet.
+        
+        Suggestions for changed paragraphs come first, followed by those of
+        unchanged paragraphs; duplicates are dropped. Only paragraphs the
+        review actually covers are cached; the returned flag is False when
+        the review left out (e.g. truncated) some of the changed paragraphs.
+        """
+        paragraphs = split_paragraphs(document_text)
+        keys = [self._proofread_key("paragraph", document_type, p) for p in paragraphs]
+        per_paragraph: Dict[int, List[str]] = {}
+        changed: List[int] = []
+        for i, key in enumerate(keys):
+            cached = self._proofread_cache.get(key)
+            if cached is None:
+                changed.append(i)
+            else:
+                per_paragraph[i] = cached
+        metrics.increment("proofread.paragraphs_reused", len(per_paragraph))
+        metrics.increment("proofread.paragraphs_analyzed", len(changed))
+        
+        fresh: List[str] = []
+        complete = True
+        reviewed = 0
+        if changed:
+            numbered = "\n\n".join(f"[{n}]\n{paragraphs[i]}" for n, i in enumerate(changed, 1))
+            human_message = f"""DOKUMENTTYP: {document_type}
+
+Diese Absätze wurden geändert oder sind neu. Gib für jeden Absatz bis zu 2 konkrete Verbesserungsvorschläge (oder keine, wenn er gut ist):
+
+{numbered}
+
+{f'''BEREITS VORHANDENE VORSCHLÄGE (nicht wiederholen):
+{chr(10).join(f"- {imp}" for imp in existing_improvements)}
+''' if existing_improvements else ''}"""
+            with span("llm.proofread", mode="diff", document=document_type, paragraphs=len(changed)):
+                review = ParagraphReviewOutput.model_validate(
+                    await self.paragraph_review_llm.ainvoke([
+                        SystemMessage(content=PARAGRAPH_REVIEW_SYSTEM_PROMPT),
+                        HumanMessage(content=human_message)
+                    ])
+                )
+            by_number = {item.paragraph: item.improvements[:2] for item in review.paragraphs}
+            for n, i in enumerate(changed, 1):
+                suggestions = by_number.get(n)
+                if suggestions is None:
+                    # Not reviewed; leave it uncached so the next call retries it
+                    complete = False
+                    continue
+                reviewed += 1
+                self._proofread_cache.set(keys[i], suggestions)
+                fresh.extend(suggestions)
+            if not complete:
+                metrics.increment("proofread.partial_reviews")
+                logger.warning(
+                    f"Paragraph review of {document_type} covered {reviewed} of {len(changed)} paragraphs"
+                )
+        
+        merged: List[str] = []
+        for improvement in fresh + [imp for i in sorted(per_paragraph) for imp in per_paragraph[i]]:
+            if improvement not in merged:
+                merged.append(improvement)
+        return merged[:PROOFREAD_MAX_IMPROVEMENTS], complete
+    
+    @staticmethod
+    def _proofread_key(*parts: Any) -> str:
+        raw = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# Global service instance
+_document_generation_service = None
+
+
+def get_document_generation_service() -> DocumentGenerationService:
+    """Get or create the global document generation service instance."""
+    global _document_generation_service
+    if _document_generation_service is None:
+        _document_generation_service = DocumentGenerationService()
+    return _document_generation_service
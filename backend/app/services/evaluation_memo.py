@@ -0,0 +1,138 @@
+"""
+Memoization of single-foundation LLM evaluations.
+
+Evaluations are keyed by (project fingerprint, foundation_id, foundation
+revision), so a project is never re-evaluated against a foundation whose
+prompt-relevant data did not change. Like the scoring cache, an in-process
+LRU sits in front of a TTL-indexed MongoDB collection.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.project_description import ProjectDescription
+from app.models.scores import FoundationEvaluation
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so cosmetic edits keep the fingerprint."""
+    return " ".join(text.lower().split())
+
+
+def project_fingerprint(project: ProjectDescription) -> str:
+    """Stable hash of the normalized project description."""
+    canonical = json.dumps(
+        {
+            "name": _normalize_text(project.name),
+            "description": _normalize_text(project.description),
+            "target_group": _normalize_text(project.target_group),
+            "charitable_purpose": sorted(p.value for p in project.charitable_purpose),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class EvaluationMemo:
+    """Two-level (memory + MongoDB) store for FoundationEvaluation results."""
+
+    def __init__(self):
+        self._memory: LRUCache[str, FoundationEvaluation] = LRUCache(
+            max_size=settings.EVALUATION_MEMO_MAX_ENTRIES,
+            ttl_seconds=settings.EVALUATION_MEMO_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def make_key(fingerprint: str, foundation_id: str, revision: str) -> str:
+        """Key of one (project, foundation, revision) evaluation."""
+        raw = f"{fingerprint}:{foundation_id}:{revision}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get_many(
+        self,
+        db: AsyncIOMotorDatabase,
+        fingerprint: str,
+        foundations: List[Tuple[str, str]],
+    ) -> Dict[str, FoundationEvaluation]:
+        """
+        Look up evaluations for (foundation_id, revision) pairs.
+
+        Returns:
+            Mapping from foundation_id to the memoized evaluation (hits only)
+        """
+        found: Dict[str, FoundationEvaluation] = {}
+        remote_keys: Dict[str, str] = {}
+        for foundation_id, revision in foundations:
+            key = self.make_key(fingerprint, foundation_id, revision)
+            evaluation = self._memory.get(key)
+            if evaluation is not None:
+                found[foundation_id] = evaluation
+            else:
+                remote_keys[key] = foundation_id
+
+        if remote_keys:
+            cursor = db.foundation_evaluations.find(
+                {"_id": {"$in": list(remote_keys)}}, {"evaluation": 1}
+            )
+            async for doc in cursor:
+                evaluation = FoundationEvaluation(**doc["evaluation"])
+                self._memory.set(doc["_id"], evaluation)
+                found[remote_keys[doc["_id"]]] = evaluation
+
+        metrics.increment("evaluation_memo.hits", len(found))
+        metrics.increment("evaluation_memo.misses", len(foundations) - len(found))
+        return found
+
+    async def set(
+        self,
+        db: AsyncIOMotorDatabase,
+        fingerprint: str,
+        revision: str,
+        evaluation: FoundationEvaluation,
+    ) -> None:
+        """Store one evaluation in memory and MongoDB."""
+        key = self.make_key(fingerprint, evaluation.foundation_id, revision)
+        self._memory.set(key, evaluation)
+        try:
+            await db.foundation_evaluations.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "foundation_id": evaluation.foundation_id,
+                    "evaluation": evaluation.model_dump(),
+                    "created_at": datetime.utcnow(),
+                },
+                upsert=True,
+            )
+        except Exception:
+            # A failed memo write must never fail the scoring request
+            logger.exception("Failed to persist foundation evaluation")
+
+
+async def ensure_evaluation_memo_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create the TTL index that expires memoized evaluations."""
+    await db.foundation_evaluations.create_index(
+        "created_at", expireAfterSeconds=settings.EVALUATION_MEMO_TTL_SECONDS
+    )
+
+
+# Global memo instance
+_evaluation_memo = None
+
+
+def get_evaluation_memo() -> EvaluationMemo:
+    """Get or create the global evaluation memo instance."""
+    global _evaluation_memo
+    if _evaluation_memo is None:
+        _evaluation_memo = EvaluationMemo()
+    return _evaluation_memo
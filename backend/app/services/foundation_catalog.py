@@ -0,0 +1,222 @@
+"""
+Process-local foundation catalog and its versioning.
+
+Every write to the `foundations` collection must call bump_catalog_version so
+that caches derived from foundation data (e.g. scoring results, the in-memory
+catalog) are invalidated across all workers.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.metrics import metrics
+from app.core.config import settings
+from app.services.bm25_index import BM25Index
+from app.services.foundation_projections import FoundationView, projection_for
+from app.services.vector_index import VectorIndex, get_vector_index
+
+logger = logging.getLogger(__name__)
+
+CATALOG_META_ID = "foundations"
+
+# Callbacks run in this process after the catalog version was bumped
+_invalidation_listeners: List[Callable[[int], None]] = []
+
+
+def on_catalog_change(listener: Callable[[int], None]) -> None:
+    """Register a callback that is called with the new version after a bump."""
+    _invalidation_listeners.append(listener)
+
+
+async def get_catalog_version(db: AsyncIOMotorDatabase) -> int:
+    """Return the current foundation catalog version (0 if never bumped)."""
+    meta = await db.catalog_meta.find_one({"_id": CATALOG_META_ID}, {"version": 1})
+    return int(meta.get("version", 0)) if meta else 0
+
+
+async def bump_catalog_version(db: AsyncIOMotorDatabase) -> int:
+    """Increment the catalog version after foundation data changed."""
+    meta = await db.catalog_meta.find_one_and_update(
+        {"_id": CATALOG_META_ID},
+        {
+            "$inc": {"version": 1},
+            "$set": {"updated_at": datetime.utcnow().isoformat()},
+        },
+        upsert=True,
+        return_document=True,
+    )
+    version = int(meta["version"])
+    logger.info(f"Foundation catalog version bumped to {version}")
+
+    for listener in _invalidation_listeners:
+        listener(version)
+    return version
+
+
+@dataclass(frozen=True, slots=True)
+class FoundationRecord:
+    """Compact in-memory view of a foundation (no descriptions or projects)."""
+    id: str
+    name: str
+    purposes: Tuple[str, ...]
+    scope: Optional[str]
+    category: Optional[str]
+    min_amount: Optional[float]
+    max_amount: Optional[float]
+
+
+class FoundationCatalog:
+    """
+    Compact records of all foundations plus an inverted index from
+    charitable purpose to foundation IDs.
+
+    The catalog is loaded at startup and reloaded when the catalog version in
+    MongoDB changes; the version is checked at most every
+    FOUNDATION_CATALOG_REFRESH_SECONDS. Each (re)load also updates the BM25
+    search index, re-analyzing only foundations whose texts changed, and
+    checks that the vector index was built from the same catalog version;
+    `vector_index` is None (BM25 only) when it was not.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.records: Dict[str, FoundationRecord] = {}
+        self.search_index = BM25Index()
+        self.vector_index: Optional[VectorIndex] = None
+        self._purpose_index: Dict[str, Set[str]] = {}
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        on_catalog_change(lambda version: self.mark_stale())
+
+    async def load(self, db: AsyncIOMotorDatabase) -> None:
+        """(Re)build the catalog from the foundations collection."""
+        version = await get_catalog_version(db)
+        records: Dict[str, FoundationRecord] = {}
+        purpose_index: Dict[str, Set[str]] = {}
+        search_fields: Dict[str, Dict[str, str]] = {}
+
+        async for doc in db.foundations.find({}, projection_for(FoundationView.CATALOG)):
+            record = self._to_record(doc)
+            records[record.id] = record
+            for purpose in record.purposes:
+                purpose_index.setdefault(purpose, set()).add(record.id)
+            search_fields[record.id] = self._search_fields(doc)
+
+        # From here on nothing awaits: the search index is updated and swapped
+        # together with the records, so concurrent searches never rank against
+        # a half-updated index (the cursor above yields to the event loop)
+        reindexed = sum(
+            self.search_index.upsert(foundation_id, fields)
+            for foundation_id, fields in search_fields.items()
+        )
+        self.search_index.retain(set(records))
+        self.records = records
+        self._purpose_index = purpose_index
+        self.version = version
+        self.vector_index = self._vector_index_for(version)
+        self._checked_at = time.monotonic()
+        logger.info(
+            f"Loaded foundation catalog v{version}: {len(records)} foundations, {len(purpose_index)} purposes, {reindexed} re-indexed"
+        )
+
+    async def ensure_fresh(self, db: AsyncIOMotorDatabase) -> None:
+        """Reload the catalog if it was never loaded or its version changed."""
+        if (
+            self.version is not None
+            and time.monotonic() - self._checked_at
+            < settings.FOUNDATION_CATALOG_REFRESH_SECONDS
+        ):
+            return
+
+        async with self._lock:
+            # Another coroutine may have refreshed while we waited
+            if (
+                self.version is not None
+                and time.monotonic() - self._checked_at
+                < settings.FOUNDATION_CATALOG_REFRESH_SECONDS
+            ):
+                return
+            if self.version is None or await get_catalog_version(db) != self.version:
+                await self.load(db)
+            else:
+                self._checked_at = time.monotonic()
+
+    def mark_stale(self) -> None:
+        """Force a version check on the next ensure_fresh call."""
+        self._checked_at = 0.0
+
+    @staticmethod
+    def _vector_index_for(version: int) -> Optional[VectorIndex]:
+        """The vector index if semantic retrieval is enabled and it was built from this catalog version."""
+        if not settings.SEMANTIC_RETRIEVAL_ENABLED:
+            return None
+        index = get_vector_index()
+        if index is None:
+            return None
+        built_from = index.meta.get("catalog_version")
+        if built_from != version:
+            # Foundations added, removed or rewritten since the build would be
+            # missing from or misranked by the semantic ranking
+            metrics.increment("catalog.stale_vector_index")
+            logger.warning(
+                f"Vector index was built from foundation catalog v{built_from}, but the catalog "
+                f"is v{version}; semantic retrieval disabled, using BM25 only. "
+                "Rebuild it with: python -m app.build_vector_index"
+            )
+            return None
+        return index
+
+    def ids_for_purposes(self, purposes: Iterable[str]) -> Set[str]:
+        """IDs of foundations supporting ANY of the given purposes."""
+        ids: Set[str] = set()
+        for purpose in purposes:
+            ids |= self._purpose_index.get(purpose, set())
+        return ids
+
+    @staticmethod
+    def _search_fields(doc: dict) -> Dict[str, str]:
+        """Texts of a foundation document for the BM25 index."""
+        past_projects = doc.get("past_projects") or []
+        return {
+            "name": doc.get("name") or "",
+            "short_description": doc.get("short_description") or "",
+            "long_description": doc.get("long_description") or "",
+            "purposes": " ".join(doc.get("gemeinnuetzige_zwecke") or []),
+            "past_projects": " ".join(
+                f"{p.get('name', '')} {p.get('description', '')}"
+                for p in past_projects
+                if isinstance(p, dict)
+            ),
+        }
+
+    @staticmethod
+    def _to_record(doc: dict) -> FoundationRecord:
+        """Convert a projected foundation document to a FoundationRecord."""
+        foerderbereich = doc.get("foerderbereich") or {}
+        foerderhoehe = doc.get("foerderhoehe") or {}
+        return FoundationRecord(
+            id=doc["_id"],
+            name=doc.get("name", ""),
+            purposes=tuple(doc.get("gemeinnuetzige_zwecke") or ()),
+            scope=foerderbereich.get("scope"),
+            category=foerderhoehe.get("category"),
+            min_amount=foerderhoehe.get("min_amount"),
+            max_amount=foerderhoehe.get("max_amount"),
+        )
+
+
+# Global catalog instance
+_foundation_catalog = None
+
+
+def get_foundation_catalog() -> FoundationCatalog:
+    """Get or create the global foundation catalog instance."""
+    global _foundation_catalog
+    if _foundation_catalog is None:
+        _foundation_catalog = FoundationCatalog()
+    return _foundation_catalog
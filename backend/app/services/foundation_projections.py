@@ -0,0 +1,79 @@
+"""
+Field projections for reading foundations from MongoDB.
+
+Each view lists only the fields its consumer actually uses, so large
+descriptions and embedded past projects are not transferred, decoded and
+allocated for callers that never read them.
+"""
+
+from enum import StrEnum
+from typing import Any, Dict, Optional
+
+# Past projects included in views that only need a preview
+PAST_PROJECTS_PREVIEW = 3
+
+
+class FoundationView(StrEnum):
+    """Named projections of a foundation document."""
+    LIST = "list"          # listing cards: no descriptions, process or projects
+    SUMMARY = "summary"    # everything, but only a preview of past projects
+    DETAIL = "detail"      # the full document
+    PROMPT = "prompt"      # fields used to describe a foundation to the LLM
+    CATALOG = "catalog"    # in-memory catalog records + search index texts
+    EMBEDDING = "embedding"  # texts embedded into the vector index
+
+
+PROJECTIONS: Dict[FoundationView, Optional[Dict[str, Any]]] = {
+    FoundationView.LIST: {
+        "name": 1,
+        "short_description": 1,
+        "legal_form": 1,
+        "gemeinnuetzige_zwecke": 1,
+        "foerderbereich.scope": 1,
+        "foerderhoehe": 1,
+        "logo_url": 1,
+        "website": 1,
+    },
+    FoundationView.SUMMARY: {
+        "past_projects": {"$slice": PAST_PROJECTS_PREVIEW},
+    },
+    FoundationView.DETAIL: None,
+    FoundationView.PROMPT: {
+        "name": 1,
+        "long_description": 1,
+        "gemeinnuetzige_zwecke": 1,
+        "foerderbereich.scope": 1,
+        "foerderhoehe.min_amount": 1,
+        "foerderhoehe.max_amount": 1,
+        "past_projects": {"$slice": PAST_PROJECTS_PREVIEW},
+    },
+    FoundationView.CATALOG: {
+        "name": 1,
+        "short_description": 1,
+        "long_description": 1,
+        "gemeinnuetzige_zwecke": 1,
+        "foerderbereich.scope": 1,
+        "foerderhoehe.category": 1,
+        "foerderhoehe.min_amount": 1,
+        "foerderhoehe.max_amount": 1,
+        "past_projects.name": 1,
+        "past_projects.description": 1,
+    },
+    FoundationView.EMBEDDING: {
+        "name": 1,
+        "short_description": 1,
+        "long_description": 1,
+        "past_projects.name": 1,
+        "past_projects.description": 1,
+    },
+}
+
+
+def projection_for(view: FoundationView) -> Optional[Dict[str, Any]]:
+    """
+    MongoDB projection for a view (None means the full document).
+
+    A fresh dict is returned so callers may extend it (e.g. with a textScore).
+    """
+    projection = PROJECTIONS[view]
+    return dict(projection) if projection is not None else None
@@ -0,0 +1,218 @@
+"""
+Conversion of foundation documents into FoundationScore responses.
+
+Kept apart from the scoring service so reading stored results (sessions,
+cached scores) rebuilds scores from the catalog without touching the LLM
+stack.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.models.scores import FoundationEvaluation, FoundationScore, MatchItem
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_foundation_score(
+    foundation: Dict[str, Any], match_score: float, matches: List[Dict[str, Any]]
+) -> FoundationScore:
+    """Rebuild a FoundationScore from a foundation document and stored match items."""
+    items = [MatchItem(**m) for m in matches]
+    evaluation = FoundationEvaluation(
+        foundation_id=str(foundation.get("_id") or foundation.get("id", "N/A")),
+        match_score=match_score,
+        fits=[m.text for m in items if m.type == "fit"],
+        mismatches=[m.text for m in items if m.type == "mismatch"],
+        questions=[m.text for m in items if m.type == "question"],
+    )
+    return to_foundation_score(foundation, evaluation)
+
+
+def to_foundation_score(
+    foundation: Dict[str, Any], evaluation: FoundationEvaluation
+) -> FoundationScore:
+    """Convert foundation document and LLM evaluation to FoundationScore."""
+    foundation_id = foundation.get("_id") or foundation.get("id", "N/A")
+    logger.debug(
+        f"Converting foundation {foundation_id} to FoundationScore object."
+    )
+
+    # Convert evaluation matches to MatchItem list
+    matches = []
+    for fit_text in evaluation.fits:
+        matches.append(MatchItem(text=fit_text, type="fit"))
+    for mismatch_text in evaluation.mismatches:
+        matches.append(MatchItem(text=mismatch_text, type="mismatch"))
+    for question_text in evaluation.questions:
+        matches.append(MatchItem(text=question_text, type="question"))
+
+    # Get foundation details
+    zwecke = foundation.get("gemeinnuetzige_zwecke", [])
+    purpose = zwecke[0] if zwecke else "Allgemeine Förderung"
+
+    # Format funding amount
+    funding_amount = _format_funding_amount(foundation.get("foerderhoehe", {}))
+
+    # Handle foerderhoehe with category-based defaults
+    foerderhoehe_raw = foundation.get("foerderhoehe", {})
+    if not isinstance(foerderhoehe_raw, dict):
+        foerderhoehe_raw = {}
+
+    if foerderhoehe_raw:
+        category = foerderhoehe_raw.get("category")
+        min_amount = foerderhoehe_raw.get("min_amount")
+        max_amount = foerderhoehe_raw.get("max_amount")
+
+        if min_amount is None or max_amount is None:
+            logger.debug(
+                f"Applying default funding amounts for category '{category}' for foundation {foundation_id}."
+            )
+            category_lower = str(category).lower() if category else ""
+            if category_lower in ["large", "großförderung", "grossfoerderung"]:
+                foerderhoehe_raw["min_amount"] = (
+                    min_amount if min_amount is not None else 50000
+                )
+                foerderhoehe_raw["max_amount"] = (
+                    max_amount if max_amount is not None else 200000
+                )
+            elif category_lower in ["small", "kleinförderung", "kleinfoerderung"]:
+                foerderhoehe_raw["min_amount"] = (
+                    min_amount if min_amount is not None else 0
+                )
+                foerderhoehe_raw["max_amount"] = (
+                    max_amount if max_amount is not None else 5000
+                )
+            elif category_lower in [
+                "medium",
+                "mittelgroße förderung",
+                "mittelgrosse foerderung",
+            ]:
+                foerderhoehe_raw["min_amount"] = (
+                    min_amount if min_amount is not None else 5000
+                )
+                foerderhoehe_raw["max_amount"] = (
+                    max_amount if max_amount is not None else 50000
+                )
+
+    # Sanitize antragsprozess to remove AI reasoning contamination
+    antragsprozess_raw = foundation.get("antragsprozess")
+    antragsprozess_clean = (
+        _sanitize_antragsprozess(antragsprozess_raw)
+        if isinstance(antragsprozess_raw, dict)
+        else {}
+    )
+
+    score = FoundationScore(
+        id=foundation_id,
+        name=foundation.get("name", "Unbekannter Name"),
+        logo="/hero-avatar.svg",
+        purpose=purpose,
+        description=foundation.get(
+            "short_description", "Keine Beschreibung verfügbar."
+        ),
+        funding_amount=funding_amount,
+        match_score=evaluation.match_score,
+        matches=matches,
+        long_description=foundation.get("long_description", ""),
+        legal_form=foundation.get("legal_form", "Stiftung"),
+        gemeinnuetzige_zwecke=zwecke,
+        antragsprozess=antragsprozess_clean,
+        foerderbereich=foundation.get("foerderbereich")
+        if isinstance(foundation.get("foerderbereich"), dict)
+        else {},
+        foerderhoehe=foerderhoehe_raw,
+        contact=foundation.get("contact")
+        if isinstance(foundation.get("contact"), dict)
+        else {},
+        past_projects=foundation.get("past_projects")
+        if isinstance(foundation.get("past_projects"), list)
+        else [],
+        website=foundation.get("website", ""),
+    )
+    logger.debug(f"Successfully created FoundationScore for {foundation_id}.")
+    return score
+
+
+def _sanitize_rolling_info(rolling_info: Optional[str]) -> Optional[str]:
+    """
+    Clean up rolling_info field to remove AI reasoning contamination.
+
+    Removes internal notes, translations, and reasoning that may have been
+    included in the data from AI-generated content.
+    """
+    if not rolling_info:
+        return rolling_info
+
+    # List of markers that indicate reasoning contamination
+    contamination_markers = [
+        "Translation:",
+        "Text used:",
+        "Note:",
+        "JSON Construction:",
+        "Wait,",
+        "Snippet",
+        "Setting deadline_type",
+        "(Translation:",
+        "Decision timeline:",
+        "Required documents:",
+        "Evaluation process:"
+    ]
+
+    # Find the earliest contamination marker
+    earliest_pos = len(rolling_info)
+    for marker in contamination_markers:
+        pos = rolling_info.find(marker)
+        if pos != -1 and pos < earliest_pos:
+            earliest_pos = pos
+
+    # Clean the text up to the contamination marker
+    clean_text = rolling_info[:earliest_pos].strip()
+
+    # Remove trailing incomplete sentences
+    if clean_text and not clean_text.endswith(('.', '!', '?')):
+        # Find the last complete sentence
+        last_period = clean_text.rfind('.')
+        if last_period > 0:
+            clean_text = clean_text[:last_period + 1]
+
+    # If we cleaned too much or got empty string, provide fallback
+    if not clean_text or len(clean_text) < 10:
+        return "Anträge sind fortlaufend möglich"
+
+    # Limit to first 2-3 sentences if still too long
+    if len(clean_text) > 300:
+        sentences = clean_text.split('. ')
+        clean_text = '. '.join(sentences[:2]) + '.'
+
+    return clean_text
+
+
+def _sanitize_antragsprozess(antragsprozess: Dict[str, Any]) -> Dict[str, Any]:
+    """Sanitize application process data, particularly the rolling_info field."""
+    if not isinstance(antragsprozess, dict):
+        return antragsprozess
+
+    # Create a copy to avoid modifying the original
+    sanitized = antragsprozess.copy()
+
+    # Clean the rolling_info field if it exists
+    if "rolling_info" in sanitized and sanitized["rolling_info"]:
+        sanitized["rolling_info"] = _sanitize_rolling_info(sanitized["rolling_info"])
+
+    return sanitized
+
+
+def _format_funding_amount(foerderhoehe: Dict[str, Any]) -> str:
+    """Format funding amount for display."""
+    if not isinstance(foerderhoehe, dict):
+        return "Förderhöhe nicht angegeben"
+
+    max_amount = foerderhoehe.get("max_amount")
+
+    if not max_amount:
+        return "Förderhöhe nicht angegeben"
+
+    # Format with dots as thousands separators (German style)
+    formatted = f"{max_amount:,.0f}".replace(",", ".")
+    return f"Bis zu {formatted} €"
@@ -0,0 +1,84 @@
+"""
+Executors for each JobType.
+
+Each handler runs the same pipeline as the corresponding synchronous
+endpoint and returns that endpoint's response body as the job result.
+"""
+
+from typing import Any, Dict
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+
+from app.models.document_generation import GenerateDocumentsResponse
+from app.models.jobs import Job, JobType
+from app.models.project_description import ProjectDescription
+from app.models.scores import FoundationScoresResponse
+from app.services.document_generation_service import (
+    GENERATION_SESSION_PARTS,
+    generation_summary_message,
+    get_document_generation_service,
+)
+from app.services.job_service import JobError, JobHandler
+from app.services.scoring_service import score_foundations
+from app.services.session_service import SessionService
+
+
+async def run_score_foundations(db: AsyncIOMotorDatabase, job: Job) -> Dict[str, Any]:
+    """Score foundations for the session's project description."""
+    session = await db.sessions.find_one(
+        {"session_id": job.session_id}, {"_id": 0, "project_description": 1}
+    )
+    if not session:
+        raise JobError(f"Session {job.session_id} not found")
+    if not session.get("project_description"):
+        raise JobError(f"Session {job.session_id} has no project description yet")
+
+    try:
+        project = ProjectDescription(**session["project_description"])
+    except ValidationError as e:
+        raise JobError(f"Invalid project description: {e}")
+    scored_foundations = await score_foundations(
+        project, job.params.get("limit", 5), db, job.session_id
+    )
+
+    return FoundationScoresResponse(
+        success=True,
+        count=len(scored_foundations),
+        foundations=scored_foundations,
+        query_summary=f"Found {len(scored_foundations)} matching foundations"
+    ).model_dump(mode="json")
+
+
+async def run_generate_documents(db: AsyncIOMotorDatabase, job: Job) -> Dict[str, Any]:
+    """Generate application documents, saving each to the session as it lands."""
+    session_service = SessionService(db)
+    doc_service = get_document_generation_service()
+
+    session_data = await session_service.get_session(
+        job.session_id, include=GENERATION_SESSION_PARTS
+    )
+    if not session_data:
+        raise JobError(f"Session {job.session_id} not found")
+
+    internal_request = doc_service.build_request(session_data, job.foundation_id or "")
+    if internal_request is None:
+        raise JobError(f"Foundation {job.foundation_id} not found in session results")
+
+    generated_docs = []
+    async for generated in doc_service.iter_documents(internal_request):
+        await session_service.store_generated_document(
+            job.session_id, job.foundation_id or "", generated
+        )
+        generated_docs.append(generated)
+
+    return GenerateDocumentsResponse(
+        success=True,
+        documents=doc_service.in_required_order(internal_request, generated_docs),
+        message=generation_summary_message(generated_docs)
+    ).model_dump(mode="json")
+
+
+JOB_HANDLERS: Dict[JobType, JobHandler] = {
+    JobType.SCORE_FOUNDATIONS: run_score_foundations,
+    JobType.GENERATE_DOCUMENTS: run_generate_documents,
+}
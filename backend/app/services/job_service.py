@@ -0,0 +1,317 @@
+"""
+Background jobs for long LLM-bound operations.
+
+Jobs are stored in the `jobs` collection and executed by an in-process
+worker pool. A worker claims a job by taking a time-limited lease that it
+keeps renewing while the job runs; if the worker dies, the lease expires
+and another worker (in any process) picks the job up again. Failed jobs
+are retried with exponential backoff up to JOB_MAX_ATTEMPTS.
+
+While a job is queued or running it holds an idempotency key derived from
+its type, session, foundation and parameters (unique index), so duplicate
+submissions coalesce onto the existing job.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.logging import request_context
+from app.core.metrics import metrics
+from app.models.jobs import Job, JobStatus, JobType, SubmitJobRequest
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncIOMotorDatabase, Job], Awaitable[Dict[str, Any]]]
+
+# Fields returned to API clients (lease bookkeeping stays internal)
+JOB_PROJECTION = {
+    "_id": 0,
+    "job_id": 1,
+    "type": 1,
+    "status": 1,
+    "session_id": 1,
+    "foundation_id": 1,
+    "params": 1,
+    "attempts": 1,
+    "result": 1,
+    "error": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+TERMINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobError(Exception):
+    """A job failure that retrying cannot fix (e.g. the session does not exist)."""
+
+
+class JobService:
+    """Submission, lookup and lease-based state transitions of jobs."""
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        self.db = database
+        self.collection = self.db.jobs
+
+    @staticmethod
+    def idempotency_key(request: SubmitJobRequest) -> str:
+        """Key under which identical submissions coalesce."""
+        raw = json.dumps(
+            {
+                "type": request.type.value,
+                "session_id": request.session_id,
+                "foundation_id": request.foundation_id,
+                "params": JobService._params(request),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _params(request: SubmitJobRequest) -> Dict[str, Any]:
+        if request.type == JobType.SCORE_FOUNDATIONS:
+            return {"limit": request.limit}
+        return {}
+
+    async def submit(self, request: SubmitJobRequest) -> Tuple[Job, bool]:
+        """
+        Queue a job, or return the active job with the same idempotency key.
+
+        Returns:
+            (job, created) - created is False if the submission was coalesced
+        """
+        key = self.idempotency_key(request)
+        now = datetime.utcnow()
+
+        # A retry covers the race where the active job finishes in between
+        for _ in range(2):
+            job_doc = {
+                "job_id": str(uuid.uuid4()),
+                "type": request.type.value,
+                "status": JobStatus.QUEUED.value,
+                "session_id": request.session_id,
+                "foundation_id": request.foundation_id,
+                "params": self._params(request),
+                "attempts": 0,
+                "result": None,
+                "error": None,
+                "created_at": now.isoformat(),
+                "updated_at": now.isoformat(),
+                "active_key": key,
+                "run_at": now,
+            }
+            try:
+                await self.collection.insert_one(job_doc)
+                metrics.increment("jobs.submitted")
+                return Job(**job_doc), True
+            except DuplicateKeyError:
+                existing = await self.collection.find_one({"active_key": key}, JOB_PROJECTION)
+                if existing:
+                    metrics.increment("jobs.coalesced")
+                    return Job(**existing), False
+
+        raise RuntimeError("Could not submit job")
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        """Retrieve a job by ID."""
+        job_doc = await self.collection.find_one({"job_id": job_id}, JOB_PROJECTION)
+        return Job(**job_doc) if job_doc else None
+
+    async def claim(self, worker_id: str) -> Optional[Job]:
+        """Lease the next runnable job (queued and due, or with an expired lease)."""
+        now = datetime.utcnow()
+        job_doc = await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": JobStatus.QUEUED.value, "run_at": {"$lte": now}},
+                    {"status": JobStatus.RUNNING.value, "lease_expires_at": {"$lt": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                    "updated_at": now.isoformat(),
+                },
+                "$inc": {"attempts": 1},
+            },
+            projection=JOB_PROJECTION,
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return Job(**job_doc) if job_doc else None
+
+    async def renew_lease(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease of a running job; False if the lease was lost."""
+        result = await self.collection.update_one(
+            {"job_id": job_id, "lease_owner": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": {
+                "lease_expires_at": datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+            }},
+        )
+        return result.matched_count > 0
+
+    async def complete(self, job: Job, worker_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job as succeeded (only if this worker still holds the lease)."""
+        await self._finish(job, worker_id, JobStatus.SUCCEEDED, {"result": result, "error": None})
+        metrics.increment("jobs.succeeded")
+
+    async def fail(self, job: Job, worker_id: str, error: str, retry: bool = True) -> None:
+        """Requeue a failed job with backoff, or mark it failed after the last attempt."""
+        if retry and job.attempts < settings.JOB_MAX_ATTEMPTS:
+            delay = settings.JOB_RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            now = datetime.utcnow()
+            await self.collection.update_one(
+                {"job_id": job.job_id, "lease_owner": worker_id},
+                {
+                    "$set": {
+                        "status": JobStatus.QUEUED.value,
+                        "error": error,
+                        "run_at": now + timedelta(seconds=delay),
+                        "updated_at": now.isoformat(),
+                    },
+                    "$unset": {"lease_owner": "", "lease_expires_at": ""},
+                },
+            )
+            metrics.increment("jobs.retried")
+            return
+
+        await self._finish(job, worker_id, JobStatus.FAILED, {"error": error})
+        metrics.increment("jobs.failed")
+
+    async def _finish(
+        self, job: Job, worker_id: str, status: JobStatus, fields: Dict[str, Any]
+    ) -> None:
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"job_id": job.job_id, "lease_owner": worker_id},
+            {
+                "$set": {
+                    "status": status.value,
+                    "finished_at": now,
+                    "updated_at": now.isoformat(),
+                    **fields,
+                },
+                # Release the idempotency key so the operation can be re-run
+                "$unset": {"active_key": "", "lease_owner": "", "lease_expires_at": ""},
+            },
+        )
+
+
+async def ensure_job_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create job lookup, claiming, idempotency and expiry indexes."""
+    await db.jobs.create_index("job_id", unique=True)
+    await db.jobs.create_index(
+        "active_key",
+        unique=True,
+        partialFilterExpression={"active_key": {"$exists": True}},
+    )
+    await db.jobs.create_index([("status", 1), ("run_at", 1)])
+    await db.jobs.create_index("finished_at", expireAfterSeconds=settings.JOB_TTL_SECONDS)
+
+
+class JobWorkerPool:
+    """In-process workers that claim and execute jobs."""
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+
+    def start(
+        self, db: AsyncIOMotorDatabase, handlers: Dict[JobType, JobHandler], workers: int
+    ) -> None:
+        """Start `workers` worker loops (no-op if already running)."""
+        if self._tasks:
+            return
+        for _ in range(workers):
+            worker_id = uuid.uuid4().hex[:12]
+            self._tasks.append(asyncio.create_task(self._run(db, handlers, worker_id)))
+        logger.info(f"Started {workers} job worker(s)")
+
+    async def stop(self) -> None:
+        """
+        Cancel all workers. Jobs they were running keep their lease until it
+        expires and are then picked up again.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(
+        self, db: AsyncIOMotorDatabase, handlers: Dict[JobType, JobHandler], worker_id: str
+    ) -> None:
+        service = JobService(db)
+        while True:
+            try:
+                job = await service.claim(worker_id)
+            except Exception:
+                logger.exception("Failed to claim a job")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+                continue
+            # Logs and spans of the job carry its ID like a request's
+            with request_context(f"job-{job.job_id}"):
+                await self._execute(db, service, handlers, job, worker_id)
+
+    async def _execute(
+        self,
+        db: AsyncIOMotorDatabase,
+        service: JobService,
+        handlers: Dict[JobType, JobHandler],
+        job: Job,
+        worker_id: str,
+    ) -> None:
+        if job.attempts > settings.JOB_MAX_ATTEMPTS:
+            # Lease expired on the last attempt (worker crashed or hung)
+            await service.fail(job, worker_id, job.error or "Job lease expired", retry=False)
+            return
+
+        logger.info(f"Running job {job.job_id} ({job.type}, attempt {job.attempts})")
+        heartbeat = asyncio.create_task(self._keep_lease(service, job.job_id, worker_id))
+        try:
+            result = await handlers[job.type](db, job)
+            await service.complete(job, worker_id, result)
+        except asyncio.CancelledError:
+            raise
+        except JobError as e:
+            await service.fail(job, worker_id, str(e), retry=False)
+        except Exception as e:
+            logger.exception(f"Job {job.job_id} failed")
+            await service.fail(job, worker_id, f"{type(e).__name__}: {e}")
+        finally:
+            heartbeat.cancel()
+
+    @staticmethod
+    async def _keep_lease(service: JobService, job_id: str, worker_id: str) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+            try:
+                if not await service.renew_lease(job_id, worker_id):
+                    logger.warning(f"Lost lease on job {job_id}")
+                    return
+            except Exception:
+                logger.exception(f"Failed to renew lease on job {job_id}")
+
+
+# Global worker pool instance
+_job_worker_pool = None
+
+
+def get_job_worker_pool() -> JobWorkerPool:
+    """Get or create the global job worker pool."""
+    global _job_worker_pool
+    if _job_worker_pool is None:
+        _job_worker_pool = JobWorkerPool()
+    return _job_worker_pool
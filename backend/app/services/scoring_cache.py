@@ -0,0 +1,121 @@
+"""
+Content-addressed cache for foundation scoring results.
+
+Results are keyed by a canonical hash of the project description, the
+requested limit and the foundation catalog version. Lookups go through an
+in-process LRU first and fall back to the `scoring_cache` collection, whose
+entries expire via a TTL index. Bumping the catalog version changes every
+key, so stale results are never served after the catalog changed.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.project_description import ProjectDescription
+from app.models.scores import FoundationScore
+from app.services.foundation_catalog import on_catalog_change
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached payload or the scoring pipeline changes shape
+CACHE_SCHEMA_VERSION = 1
+
+
+class ScoringCache:
+    """Two-level (memory + MongoDB) cache for scored foundation lists."""
+
+    def __init__(self):
+        self._memory: LRUCache[str, List[FoundationScore]] = LRUCache(
+            max_size=settings.SCORING_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.SCORING_CACHE_TTL_SECONDS,
+        )
+        on_catalog_change(lambda version: self._memory.clear())
+
+    @staticmethod
+    def make_key(project: ProjectDescription, limit: int, catalog_version: int) -> str:
+        """Build the canonical cache key for a scoring request."""
+        payload = project.model_dump(mode="json")
+        # Purposes are a set semantically; their order must not change the key
+        payload["charitable_purpose"] = sorted(payload["charitable_purpose"])
+        canonical = json.dumps(
+            {
+                "schema": CACHE_SCHEMA_VERSION,
+                "project": payload,
+                "limit": limit,
+                "catalog_version": catalog_version,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get(
+        self, db: AsyncIOMotorDatabase, key: str
+    ) -> Optional[List[FoundationScore]]:
+        """Return cached scores for `key`, or None on a miss."""
+        cached = self._memory.get(key)
+        if cached is not None:
+            metrics.increment("scoring_cache.hits.memory")
+            return cached
+
+        doc = await db.scoring_cache.find_one({"_id": key}, {"scores": 1})
+        if doc is None:
+            metrics.increment("scoring_cache.misses")
+            return None
+
+        scores = [FoundationScore(**score) for score in doc.get("scores", [])]
+        self._memory.set(key, scores)
+        metrics.increment("scoring_cache.hits.mongo")
+        return scores
+
+    async def set(
+        self,
+        db: AsyncIOMotorDatabase,
+        key: str,
+        scores: List[FoundationScore],
+        catalog_version: int,
+    ) -> None:
+        """Store scores in memory and MongoDB."""
+        self._memory.set(key, scores)
+        try:
+            await db.scoring_cache.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "catalog_version": catalog_version,
+                    "scores": [score.model_dump() for score in scores],
+                    "created_at": datetime.utcnow(),
+                },
+                upsert=True,
+            )
+            metrics.increment("scoring_cache.writes")
+        except Exception:
+            # A failed cache write must never fail the scoring request
+            logger.exception("Failed to persist scoring result to cache")
+
+
+async def ensure_scoring_cache_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create the TTL index that expires cached scoring results."""
+    await db.scoring_cache.create_index(
+        "created_at", expireAfterSeconds=settings.SCORING_CACHE_TTL_SECONDS
+    )
+
+
+# Global cache instance
+_scoring_cache = None
+
+
+def get_scoring_cache() -> ScoringCache:
+    """Get or create the global scoring cache instance."""
+    global _scoring_cache
+    if _scoring_cache is None:
+        _scoring_cache = ScoringCache()
+    return _scoring_cache
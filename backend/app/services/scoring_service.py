@@ -2,15 +2,14 @@
 Service for scoring and matching foundations to user projects using AI.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from pydantic import SecretStr
 
 from app.models.scores import (
-    MatchItem,
     FoundationScore,
     FoundationEvaluation,
     ScoringResponse,
@@ -18,6 +17,22 @@ from app.models.scores import (
 from app.models.project_description import ProjectDescription
 from app.core.config import settings
 from app.core.database import get_database
+from app.core.llm import LLM_MODEL, get_chat_model
+from app.core.logging import span
+from app.core.metrics import metrics
+from app.core.singleflight import flight_key, singleflight
+from app.services.evaluation_memo import get_evaluation_memo, project_fingerprint
+from app.services.foundation_catalog import (
+    get_catalog_version,
+    get_foundation_catalog,
+)
+from app.services.foundation_projections import FoundationView, projection_for
+from app.services.foundation_scores import to_foundation_score
+from app.services.scoring_cache import ScoringCache, get_scoring_cache
+from app.services.vector_index import (
+    get_query_embeddings,
+    reciprocal_rank_fusion,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -36,12 +51,8 @@ class ScoringService:
             )
 
         try:
-            self.llm = ChatOpenAI(
-                model="anthropic/claude-haiku-4-5",
-                api_key=SecretStr(settings.REQUESTY_API_KEY),
-                base_url=settings.REQUESTY_BASE_URL,
-            )
-            logger.info("Requesty AI model initialized: anthropic/claude-haiku-4-5")
+            self.llm = get_chat_model()
+            logger.info(f"Requesty AI model initialized: {LLM_MODEL}")
         except Exception as e:
             logger.exception("Failed to initialize Requesty AI")
             raise
@@ -49,29 +60,130 @@ class ScoringService:
         # Set up structured output using modern LangChain pattern
         self.structured_llm = self.llm.with_structured_output(ScoringResponse)
 
+        # Bound the number of in-flight LLM calls so a burst of scoring
+        # requests cannot exhaust the upstream rate limit
+        self._llm_semaphore = asyncio.Semaphore(settings.SCORING_MAX_CONCURRENCY)
+
     async def score_foundations(
         self,
         project: ProjectDescription,
         limit: int = 5,
         db: AsyncIOMotorDatabase = None,
+        session_id: Optional[str] = None,
     ) -> List[FoundationScore]:
         """
         Score and rank foundations based on project description using AI.
 
+        Concurrent calls for the same session, project and limit share one
+        scoring run (single-flight).
+
         Args:
             project: The project description to match against
             limit: Maximum number of foundations to return (default: 5)
             db: Optional database instance (will use get_database() if not provided)
+            session_id: Session the request belongs to (scopes coalescing)
 
         Returns:
             List of FoundationScore objects, sorted by match score (highest first)
         """
+        key = flight_key("score_foundations", session_id, None, project.model_dump(), limit)
+        scored = await singleflight.do(key, lambda: self._score_foundations(project, limit, db))
+        return list(scored)
+
+    async def _score_foundations(
+        self,
+        project: ProjectDescription,
+        limit: int,
+        db: Optional[AsyncIOMotorDatabase],
+    ) -> List[FoundationScore]:
+        logger.info("Starting foundation scoring process...")
+        try:
+            scored_foundations = [
+                scored
+                async for scored in self.stream_foundation_scores(project, limit, db)
+            ]
+        except Exception as e:
+            logger.exception("FATAL: Error in LLM evaluation")
+            # Re-raise the exception to avoid fallback
+            raise
+
         logger.info(
-            "Starting foundation scoring process in STRICT mode (fallbacks disabled)..."
+            f"Scoring successful, returning top {limit} of {len(scored_foundations)} foundations."
         )
+        return self.rank_scores(scored_foundations, limit)
+
+    async def stream_foundation_scores(
+        self,
+        project: ProjectDescription,
+        limit: int = 5,
+        db: AsyncIOMotorDatabase = None,
+    ) -> AsyncIterator[FoundationScore]:
+        """
+        Score foundations like score_foundations, but yield each candidate's
+        FoundationScore as soon as its evaluation finishes.
+
+        Scores arrive in completion order and cover all candidates (up to
+        limit * 2); use rank_scores on the collected results for the final
+        ranking.
+        """
+        logger.info("Starting streaming foundation scoring process...")
         if db is None:
             db = get_database()
 
+        cache_entry = await self._get_cache_entry(project, limit, db)
+        if cache_entry:
+            cache_key, catalog_version = cache_entry
+            cached = await get_scoring_cache().get(db, cache_key)
+            if cached is not None:
+                logger.info("Streaming foundation scores from cache")
+                for scored in cached:
+                    yield scored
+                return
+
+        with span("search.candidates", limit=limit) as candidates_span:
+            candidate_foundations = await self._select_candidates(project, limit, db)
+            candidates_span["candidates"] = len(candidate_foundations)
+        if not candidate_foundations:
+            return
+
+        # Step 3: Use LLM to score and analyze foundations
+        logger.info("Step 3: Evaluating with LLM...")
+        scored_foundations: List[FoundationScore] = []
+        async for scored in self._iter_scores(project, candidate_foundations, db):
+            scored_foundations.append(scored)
+            yield scored
+
+        if cache_entry and len(scored_foundations) == len(candidate_foundations):
+            await get_scoring_cache().set(
+                db, cache_key, scored_foundations, catalog_version
+            )
+
+    async def _get_cache_entry(
+        self, project: ProjectDescription, limit: int, db: AsyncIOMotorDatabase
+    ) -> Optional[Tuple[str, int]]:
+        """Return (cache key, catalog version), or None if caching is disabled."""
+        if not settings.SCORING_CACHE_ENABLED:
+            return None
+        catalog_version = await get_catalog_version(db)
+        return ScoringCache.make_key(project, limit, catalog_version), catalog_version
+
+    @staticmethod
+    def rank_scores(scores: List[FoundationScore], limit: int) -> List[FoundationScore]:
+        """Sort scores by match score (highest first) and keep the top `limit`."""
+        return sorted(scores, key=lambda x: x.match_score, reverse=True)[:limit]
+
+    async def _select_candidates(
+        self,
+        project: ProjectDescription,
+        limit: int,
+        db: AsyncIOMotorDatabase,
+    ) -> List[Dict[str, Any]]:
+        """
+        Select the candidate foundations that will be evaluated by the LLM.
+
+        Returns:
+            Up to limit * 2 foundation documents, most relevant first
+        """
         # Step 1: Filter by charitable purpose (exact match)
         # Project can have multiple charitable purposes - match if ANY of them match
         charitable_purpose_strings = [
@@ -91,14 +203,22 @@ class ScoringService:
             f"Found {len(matching_foundations)} foundations matching charitable purposes: {charitable_purpose_strings}"
         )
 
-        # Step 2: Text search on long_description + past_projects
+        # Step 2: Text search on descriptions + past_projects
         search_text = f"{project.name} {project.description} {project.target_group}"
-        scored_candidates = await self._text_search_foundations(
-            db,
-            matching_foundations,
-            search_text,
-            limit * 2,  # Get more candidates for LLM evaluation
-        )
+        if settings.SCORING_CANDIDATE_SOURCE == "mongo_text":
+            scored_candidates = await self._text_search_foundations(
+                db,
+                matching_foundations,
+                search_text,
+                limit * 2,  # Get more candidates for LLM evaluation
+            )
+        else:
+            scored_candidates = await self._bm25_search_foundations(
+                db,
+                matching_foundations,
+                search_text,
+                limit * 2,  # Get more candidates for LLM evaluation
+            )
 
         if not scored_candidates:
             logger.warning("No foundations found after text search")
@@ -111,25 +231,7 @@ class ScoringService:
         logger.info(
             f"Selected {len(candidate_foundations)} candidate foundations for LLM evaluation"
         )
-
-        # Step 3: Use LLM to score and analyze foundations
-        logger.info("Step 3: Evaluating with LLM...")
-        try:
-            scored_foundations = await self._evaluate_with_llm(
-                project, candidate_foundations
-            )
-
-            # Sort by match score and limit
-            scored_foundations.sort(key=lambda x: x.match_score, reverse=True)
-            logger.info(
-                f"LLM evaluation successful, returning {len(scored_foundations)} sorted foundations."
-            )
-            return scored_foundations[:limit]
-
-        except Exception as e:
-            logger.exception("FATAL: Error in LLM evaluation")
-            # Re-raise the exception to avoid fallback
-            raise
+        return candidate_foundations
 
     async def _filter_by_charitable_purpose(
         self, db: AsyncIOMotorDatabase, charitable_purposes: List[str]
@@ -138,7 +240,8 @@ class ScoringService:
         Filter foundations by exact match on charitable purpose(s).
 
         Matches foundations where ANY of the provided charitable purposes
-        appears in the foundation's gemeinnuetzige_zwecke list.
+        appears in the foundation's gemeinnuetzige_zwecke list. The lookup
+        is served from the in-memory foundation catalog.
 
         Args:
             charitable_purposes: List of charitable purpose strings to match
@@ -150,27 +253,9 @@ class ScoringService:
             f"Filtering foundations by charitable purposes: {charitable_purposes}..."
         )
         try:
-            # Find foundations where ANY of the charitable purposes appears in gemeinnuetzige_zwecke
-            cursor = db.foundations.find(
-                {"gemeinnuetzige_zwecke": {"$in": charitable_purposes}}
-            )
-
-            foundations = await cursor.to_list(length=None)
-            logger.debug(f"Found {len(foundations)} raw documents from database.")
-
-            foundation_ids = []
-            for foundation in foundations:
-                if foundation is None:
-                    logger.debug("Skipping a None foundation document.")
-                    continue
-
-                f_id = foundation.get("_id") or foundation.get("id")
-                if f_id:
-                    foundation_ids.append(f_id)
-                else:
-                    logger.warning(
-                        f"Found foundation document without _id or id: {foundation}"
-                    )
+            catalog = get_foundation_catalog()
+            await catalog.ensure_fresh(db)
+            foundation_ids = sorted(catalog.ids_for_purposes(charitable_purposes))
 
             logger.info(
                 f"Successfully filtered and found {len(foundation_ids)} foundation IDs."
@@ -180,6 +265,73 @@ class ScoringService:
             logger.exception("FATAL: Error filtering by charitable purpose")
             raise
 
+    async def _bm25_search_foundations(
+        self,
+        db: AsyncIOMotorDatabase,
+        foundation_ids: List[str],
+        search_text: str,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank foundations with the local BM25 index of the foundation catalog,
+        fused with embedding similarity if SEMANTIC_RETRIEVAL_ENABLED is set and
+        the vector index was built from the current catalog version.
+
+        Only the top `limit` hits are loaded, in the prompt view.
+
+        Returns list of foundation documents sorted by relevance.
+        """
+        logger.info(f"Performing BM25 search for: '{search_text[:100]}...'")
+        if not foundation_ids:
+            logger.warning(
+                "No foundation IDs provided for text search. Returning empty list."
+            )
+            return []
+
+        catalog = get_foundation_catalog()
+        await catalog.ensure_fresh(db)
+
+        vector_index = catalog.vector_index
+        if vector_index is None:
+            ranked = catalog.search_index.search(
+                search_text, limit=limit, candidate_ids=foundation_ids
+            )
+            ranked_ids = [foundation_id for foundation_id, _ in ranked]
+        else:
+            # Rank a wider pool from each retriever before fusing
+            pool = limit * 4
+            lexical = catalog.search_index.search(
+                search_text, limit=pool, candidate_ids=foundation_ids
+            )
+            lexical_ids = [f_id for f_id, _ in lexical]
+            try:
+                query_vector = await asyncio.wait_for(
+                    get_query_embeddings().aembed_query(search_text),
+                    timeout=settings.EMBEDDING_TIMEOUT,
+                )
+                semantic = vector_index.search(
+                    query_vector, limit=pool, candidate_ids=foundation_ids
+                )
+            except Exception:
+                # The lexical ranking alone is still a usable candidate list
+                metrics.increment("scoring.semantic_fallbacks")
+                logger.exception("Semantic retrieval failed; using the BM25 ranking only")
+                ranked_ids = lexical_ids[:limit]
+            else:
+                ranked_ids = reciprocal_rank_fusion(
+                    [lexical_ids, [f_id for f_id, _ in semantic]],
+                    weights=[1.0, settings.SEMANTIC_WEIGHT],
+                )[:limit]
+
+        if not ranked_ids:
+            logger.warning("BM25 search returned no results.")
+            return []
+
+        documents = await self._load_foundations(db, ranked_ids, FoundationView.PROMPT)
+
+        logger.info(f"Candidate search successful, found {len(ranked_ids)} results.")
+        return [documents[f_id] for f_id in ranked_ids if f_id in documents]
+
     async def _text_search_foundations(
         self,
         db: AsyncIOMotorDatabase,
@@ -205,8 +357,10 @@ class ScoringService:
             # Note: $text must be at top level
             query = {"$text": {"$search": search_text}, "_id": {"$in": foundation_ids}}
 
+            projection = projection_for(FoundationView.PROMPT)
+            projection["score"] = {"$meta": "textScore"}
             cursor = (
-                db.foundations.find(query, {"score": {"$meta": "textScore"}})
+                db.foundations.find(query, projection)
                 .sort([("score", {"$meta": "textScore"})])
                 .limit(limit)
             )
@@ -230,20 +384,213 @@ class ScoringService:
             # A text index is required for this functionality.
             raise
 
+    async def _iter_scores(
+        self,
+        project: ProjectDescription,
+        candidate_foundations: List[Dict[str, Any]],
+        db: AsyncIOMotorDatabase,
+    ) -> AsyncIterator[FoundationScore]:
+        """
+        Yield a FoundationScore per candidate, reusing memoized evaluations.
+
+        Only candidates without an evaluation for this project fingerprint and
+        foundation revision are sent to the LLM; fresh evaluations are
+        memoized as they arrive.
+
+        Candidates only carry the prompt view; the full documents needed for
+        FoundationScore are loaded concurrently with the LLM evaluation.
+        """
+        memo = get_evaluation_memo() if settings.EVALUATION_MEMO_ENABLED else None
+        fingerprint = project_fingerprint(project)
+        revisions = {
+            foundation.get("_id") or foundation.get("id"): self._foundation_revision(
+                foundation
+            )
+            for foundation in candidate_foundations
+        }
+        details_task = asyncio.create_task(
+            self._load_foundations(db, list(revisions), FoundationView.DETAIL)
+        )
+
+        async def to_score(
+            foundation: Dict[str, Any], evaluation: FoundationEvaluation
+        ) -> FoundationScore:
+            details = await details_task
+            foundation_id = foundation.get("_id") or foundation.get("id")
+            return to_foundation_score(
+                details.get(foundation_id, foundation), evaluation
+            )
+
+        try:
+            to_evaluate = candidate_foundations
+            if memo:
+                memoized = await memo.get_many(db, fingerprint, list(revisions.items()))
+                logger.info(
+                    f"Reusing {len(memoized)} memoized evaluations, evaluating {len(candidate_foundations) - len(memoized)} foundations with LLM"
+                )
+                to_evaluate = []
+                for foundation in candidate_foundations:
+                    evaluation = memoized.get(foundation.get("_id") or foundation.get("id"))
+                    if evaluation:
+                        yield await to_score(foundation, evaluation)
+                    else:
+                        to_evaluate.append(foundation)
+
+            if not to_evaluate:
+                return
+
+            if settings.SCORING_FANOUT_ENABLED:
+                evaluated = self._iter_evaluations(project, to_evaluate)
+            else:
+                evaluated = self._iter_pairs(
+                    await self._evaluate_with_llm(project, to_evaluate)
+                )
+
+            async for foundation, evaluation in evaluated:
+                if memo:
+                    await memo.set(
+                        db, fingerprint, revisions[evaluation.foundation_id], evaluation
+                    )
+                yield await to_score(foundation, evaluation)
+        finally:
+            details_task.cancel()
+
+    async def _load_foundations(
+        self, db: AsyncIOMotorDatabase, foundation_ids: List[str], view: FoundationView
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load foundations by ID in the given view, keyed by ID."""
+        with span("mongo.load_foundations", view=view.value, count=len(foundation_ids)):
+            cursor = db.foundations.find(
+                {"_id": {"$in": foundation_ids}}, projection_for(view)
+            )
+            return {doc["_id"]: doc async for doc in cursor}
+
+    @staticmethod
+    async def _iter_pairs(
+        pairs: List[Tuple[Dict[str, Any], FoundationEvaluation]]
+    ) -> AsyncIterator[Tuple[Dict[str, Any], FoundationEvaluation]]:
+        """Expose an already evaluated list through the async iterator interface."""
+        for pair in pairs:
+            yield pair
+
+    def _foundation_revision(self, foundation: Dict[str, Any]) -> str:
+        """Hash of exactly the foundation data the LLM sees for evaluation."""
+        prompt_text = self._format_foundations_for_prompt([foundation])
+        return hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+
     async def _evaluate_with_llm(
         self, project: ProjectDescription, candidate_foundations: List[Dict[str, Any]]
-    ) -> List[FoundationScore]:
+    ) -> List[Tuple[Dict[str, Any], FoundationEvaluation]]:
         """
-        Use LLM to evaluate and score candidate foundations.
+        Use LLM to evaluate all candidate foundations in a single call.
         Raises:
             ValueError: If the LLM fails to evaluate one of the candidate foundations.
         """
         logger.info(f"Evaluating {len(candidate_foundations)} candidates with LLM...")
+        evaluation_map = await self._request_evaluations(project, candidate_foundations)
+
+        # Pair candidates with their evaluations, ensuring all were evaluated
+        evaluated = []
+        for foundation in candidate_foundations:
+            foundation_id = foundation.get("_id") or foundation.get("id")
+            if not foundation_id:
+                continue
+
+            evaluation = evaluation_map.get(foundation_id)
+
+            if evaluation:
+                evaluated.append((foundation, evaluation))
+            else:
+                # If LLM didn't evaluate this foundation, it's a critical error
+                error_msg = f"FATAL: LLM failed to return an evaluation for foundation ID: {foundation_id}. Halting process."
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+
+        return evaluated
+
+    async def _iter_evaluations(
+        self, project: ProjectDescription, candidate_foundations: List[Dict[str, Any]]
+    ) -> AsyncIterator[Tuple[Dict[str, Any], FoundationEvaluation]]:
+        """
+        Evaluate candidates in batches of SCORING_BATCH_SIZE and yield each
+        (foundation, evaluation) pair as soon as its batch returns.
+
+        Foundations the LLM skipped (or whose batch failed) are retried up to
+        SCORING_MAX_RETRIES times; anything still missing afterwards is logged
+        and left out instead of failing the whole run.
+        """
+        pending = [
+            f for f in candidate_foundations if f.get("_id") or f.get("id")
+        ]
+        batch_size = max(1, settings.SCORING_BATCH_SIZE)
+
+        for attempt in range(settings.SCORING_MAX_RETRIES + 1):
+            if not pending:
+                return
+            if attempt:
+                logger.info(
+                    f"Retrying evaluation for {len(pending)} missing foundations (attempt {attempt + 1})..."
+                )
+
+            batches = [
+                pending[i : i + batch_size] for i in range(0, len(pending), batch_size)
+            ]
+            logger.info(
+                f"Evaluating {len(pending)} candidates in {len(batches)} concurrent batches..."
+            )
+            tasks = [
+                asyncio.create_task(self._evaluate_batch(project, batch))
+                for batch in batches
+            ]
+            missing: List[Dict[str, Any]] = []
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    batch, evaluation_map = await next_done
+                    for foundation in batch:
+                        foundation_id = foundation.get("_id") or foundation.get("id")
+                        evaluation = evaluation_map.get(foundation_id)
+                        if evaluation:
+                            yield foundation, evaluation
+                        else:
+                            missing.append(foundation)
+            finally:
+                # The consumer may stop early (e.g. a closed stream)
+                for task in tasks:
+                    task.cancel()
+            pending = missing
+
+        if pending:
+            missing_ids = [f.get("_id") or f.get("id") for f in pending]
+            logger.error(
+                f"LLM failed to evaluate foundations after retries, skipping: {missing_ids}"
+            )
+
+    async def _evaluate_batch(
+        self, project: ProjectDescription, batch: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, FoundationEvaluation]]:
+        """
+        Evaluate a single batch of foundations.
+
+        Errors are logged and reported as an empty result so that the
+        foundations of a failed batch are retried like skipped ones.
+        """
+        try:
+            return batch, await self._request_evaluations(project, batch)
+        except Exception:
+            batch_ids = [f.get("_id") or f.get("id") for f in batch]
+            logger.exception(f"LLM evaluation failed for batch {batch_ids}")
+            return batch, {}
+
+    async def _request_evaluations(
+        self, project: ProjectDescription, foundations: List[Dict[str, Any]]
+    ) -> Dict[str, FoundationEvaluation]:
+        """Run one LLM call for the given foundations, keyed by foundation_id."""
         # Build prompt with project and foundation details
         prompt = self._create_scoring_prompt()
 
         # Format foundations for prompt
-        foundations_text = self._format_foundations_for_prompt(candidate_foundations)
+        with span("prompt.scoring", foundations=len(foundations)):
+            foundations_text = self._format_foundations_for_prompt(foundations)
         logger.debug(f"Formatted prompt text length: {len(foundations_text)}")
 
         # Invoke LLM with structured output
@@ -253,47 +600,46 @@ class ScoringService:
         )
 
         logger.info("Invoking LLM for foundation evaluation...")
-        parsed_output: ScoringResponse = chain.invoke(
-            {
-                "project_name": project.name,
-                "project_description": project.description,
-                "target_group": project.target_group,
-                "charitable_purpose": charitable_purposes_str,
-                "foundations": foundations_text,
-            }
-        )
+        with span("llm.score_batch", foundations=len(foundations)):
+            parsed_output: ScoringResponse = await self._invoke_llm(
+                chain,
+                {
+                    "project_name": project.name,
+                    "project_description": project.description,
+                    "target_group": project.target_group,
+                    "charitable_purpose": charitable_purposes_str,
+                    "foundations": foundations_text,
+                },
+            )
 
         logger.info(f"LLM evaluated {len(parsed_output.evaluations)} foundations.")
-        if len(parsed_output.evaluations) != len(candidate_foundations):
+        if len(parsed_output.evaluations) != len(foundations):
             logger.warning(
-                f"LLM returned a different number of evaluations ({len(parsed_output.evaluations)}) than candidates provided ({len(candidate_foundations)})."
+                f"LLM returned a different number of evaluations ({len(parsed_output.evaluations)}) than candidates provided ({len(foundations)})."
             )
 
         # Create a mapping from foundation_id to evaluation
-        evaluation_map = {
-            eval.foundation_id: eval for eval in parsed_output.evaluations
-        }
+        return {eval.foundation_id: eval for eval in parsed_output.evaluations}
 
-        # Convert to FoundationScore objects, ensuring all candidates were evaluated
-        scored_foundations = []
-        for foundation in candidate_foundations:
-            foundation_id = foundation.get("_id") or foundation.get("id")
-            if not foundation_id:
-                continue
-
-            evaluation = evaluation_map.get(foundation_id)
-
-            if evaluation:
-                # Convert evaluation to FoundationScore
-                scored = self._convert_to_foundation_score(foundation, evaluation)
-                scored_foundations.append(scored)
-            else:
-                # If LLM didn't evaluate this foundation, it's a critical error
-                error_msg = f"FATAL: LLM failed to return an evaluation for foundation ID: {foundation_id}. Halting process."
-                logger.error(error_msg)
-                raise ValueError(error_msg)
+    async def _invoke_llm(self, chain, inputs: Dict[str, Any]) -> ScoringResponse:
+        """
+        Invoke the scoring chain without blocking the event loop.
 
-        return scored_foundations
+        Calls are limited by the service-wide semaphore and each call is
+        cancelled after SCORING_LLM_TIMEOUT seconds.
+        Raises:
+            TimeoutError: If the LLM does not answer within the timeout.
+        """
+        async with self._llm_semaphore:
+            try:
+                return await asyncio.wait_for(
+                    chain.ainvoke(inputs), timeout=settings.SCORING_LLM_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"LLM evaluation timed out after {settings.SCORING_LLM_TIMEOUT}s"
+                )
+                raise
 
     def _create_scoring_prompt(self) -> ChatPromptTemplate:
         """Create the prompt template for foundation scoring."""
@@ -352,7 +698,6 @@ WICHTIG:
             foerderhoehe = foundation.get("foerderhoehe") or {}
             min_amount = foerderhoehe.get("min_amount") or 0
             max_amount = foerderhoehe.get("max_amount") or 0
-            antragsprozess = foundation.get("antragsprozess", {})
 
             # Format past projects
             past_projects = foundation.get("past_projects", [])
@@ -376,191 +721,6 @@ Beschreibung: {long_desc[:500]}{"..." if len(long_desc) > 500 else ""}
 
         return "\n".join(formatted)
 
-    def _convert_to_foundation_score(
-        self, foundation: Dict[str, Any], evaluation: FoundationEvaluation
-    ) -> FoundationScore:
-        """Convert foundation document and LLM evaluation to FoundationScore."""
-        foundation_id = foundation.get("_id") or foundation.get("id", "N/A")
-        logger.debug(
-            f"Converting foundation {foundation_id} to FoundationScore object."
-        )
-
-        # Convert evaluation matches to MatchItem list
-        matches = []
-        for fit_text in evaluation.fits:
-            matches.append(MatchItem(text=fit_text, type="fit"))
-        for mismatch_text in evaluation.mismatches:
-            matches.append(MatchItem(text=mismatch_text, type="mismatch"))
-        for question_text in evaluation.questions:
-            matches.append(MatchItem(text=question_text, type="question"))
-
-        # Get foundation details
-        zwecke = foundation.get("gemeinnuetzige_zwecke", [])
-        purpose = zwecke[0] if zwecke else "Allgemeine Förderung"
-
-        # Format funding amount
-        funding_amount = self._format_funding_amount(foundation.get("foerderhoehe", {}))
-
-        # Handle foerderhoehe with category-based defaults
-        foerderhoehe_raw = foundation.get("foerderhoehe", {})
-        if not isinstance(foerderhoehe_raw, dict):
-            foerderhoehe_raw = {}
-
-        if foerderhoehe_raw:
-            category = foerderhoehe_raw.get("category")
-            min_amount = foerderhoehe_raw.get("min_amount")
-            max_amount = foerderhoehe_raw.get("max_amount")
-
-            if min_amount is None or max_amount is None:
-                logger.debug(
-                    f"Applying default funding amounts for category '{category}' for foundation {foundation_id}."
-                )
-                category_lower = str(category).lower() if category else ""
-                if category_lower in ["large", "großförderung", "grossfoerderung"]:
-                    foerderhoehe_raw["min_amount"] = (
-                        min_amount if min_amount is not None else 50000
-                    )
-                    foerderhoehe_raw["max_amount"] = (
-                        max_amount if max_amount is not None else 200000
-                    )
-                elif category_lower in ["small", "kleinförderung", "kleinfoerderung"]:
-                    foerderhoehe_raw["min_amount"] = (
-                        min_amount if min_amount is not None else 0
-                    )
-                    foerderhoehe_raw["max_amount"] = (
-                        max_amount if max_amount is not None else 5000
-                    )
-                elif category_lower in [
-                    "medium",
-                    "mittelgroße förderung",
-                    "mittelgrosse foerderung",
-                ]:
-                    foerderhoehe_raw["min_amount"] = (
-                        min_amount if min_amount is not None else 5000
-                    )
-                    foerderhoehe_raw["max_amount"] = (
-                        max_amount if max_amount is not None else 50000
-                    )
-
-        # Sanitize antragsprozess to remove AI reasoning contamination
-        antragsprozess_raw = foundation.get("antragsprozess")
-        antragsprozess_clean = (
-            self._sanitize_antragsprozess(antragsprozess_raw)
-            if isinstance(antragsprozess_raw, dict)
-            else {}
-        )
-
-        score = FoundationScore(
-            id=foundation_id,
-            name=foundation.get("name", "Unbekannter Name"),
-            logo="/hero-avatar.svg",
-            purpose=purpose,
-            description=foundation.get(
-                "short_description", "Keine Beschreibung verfügbar."
-            ),
-            funding_amount=funding_amount,
-            match_score=evaluation.match_score,
-            matches=matches,
-            long_description=foundation.get("long_description", ""),
-            legal_form=foundation.get("legal_form", "Stiftung"),
-            gemeinnuetzige_zwecke=zwecke,
-            antragsprozess=antragsprozess_clean,
-            foerderbereich=foundation.get("foerderbereich")
-            if isinstance(foundation.get("foerderbereich"), dict)
-            else {},
-            foerderhoehe=foerderhoehe_raw,
-            contact=foundation.get("contact")
-            if isinstance(foundation.get("contact"), dict)
-            else {},
-            past_projects=foundation.get("past_projects")
-            if isinstance(foundation.get("past_projects"), list)
-            else [],
-            website=foundation.get("website", ""),
-        )
-        logger.debug(f"Successfully created FoundationScore for {foundation_id}.")
-        return score
-
-    def _sanitize_rolling_info(self, rolling_info: Optional[str]) -> Optional[str]:
-        """
-        Clean up rolling_info field to remove AI reasoning contamination.
-        
-        Removes internal notes, translations, and reasoning that may have been
-        included in the data from AI-generated content.
-        """
-        if not rolling_info:
-            return rolling_info
-        
-        # List of markers that indicate reasoning contamination
-        contamination_markers = [
-            "Translation:",
-            "Text used:",
-            "Note:",
-            "JSON Construction:",
-            "Wait,",
-            "Snippet",
-            "Setting deadline_type",
-            "(Translation:",
-            "Decision timeline:",
-            "Required documents:",
-            "Evaluation process:"
-        ]
-        
-        # Find the earliest contamination marker
-        earliest_pos = len(rolling_info)
-        for marker in contamination_markers:
-            pos = rolling_info.find(marker)
-            if pos != -1 and pos < earliest_pos:
-                earliest_pos = pos
-        
-        # Clean the text up to the contamination marker
-        clean_text = rolling_info[:earliest_pos].strip()
-        
-        # Remove trailing incomplete sentences
-        if clean_text and not clean_text.endswith(('.', '!', '?')):
-            # Find the last complete sentence
-            last_period = clean_text.rfind('.')
-            if last_period > 0:
-                clean_text = clean_text[:last_period + 1]
-        
-        # If we cleaned too much or got empty string, provide fallback
-        if not clean_text or len(clean_text) < 10:
-            return "Anträge sind fortlaufend möglich"
-        
-        # Limit to first 2-3 sentences if still too long
-        if len(clean_text) > 300:
-            sentences = clean_text.split('. ')
-            clean_text = '. '.join(sentences[:2]) + '.'
-        
-        return clean_text
-
-    def _sanitize_antragsprozess(self, antragsprozess: Dict[str, Any]) -> Dict[str, Any]:
-        """Sanitize application process data, particularly the rolling_info field."""
-        if not isinstance(antragsprozess, dict):
-            return antragsprozess
-        
-        # Create a copy to avoid modifying the original
-        sanitized = antragsprozess.copy()
-        
-        # Clean the rolling_info field if it exists
-        if "rolling_info" in sanitized and sanitized["rolling_info"]:
-            sanitized["rolling_info"] = self._sanitize_rolling_info(sanitized["rolling_info"])
-        
-        return sanitized
-
-    def _format_funding_amount(self, foerderhoehe: Dict[str, Any]) -> str:
-        """Format funding amount for display."""
-        if not isinstance(foerderhoehe, dict):
-            return "Förderhöhe nicht angegeben"
-
-        max_amount = foerderhoehe.get("max_amount")
-
-        if not max_amount:
-            return "Förderhöhe nicht angegeben"
-
-        # Format with dots as thousands separators (German style)
-        formatted = f"{max_amount:,.0f}".replace(",", ".")
-        return f"Bis zu {formatted} €"
-
 
 # Global service instance
 _scoring_service = None
@@ -575,7 +735,10 @@ def get_scoring_service() -> ScoringService:
 
 
 async def score_foundations(
-    project: ProjectDescription, limit: int = 5, db: AsyncIOMotorDatabase = None
+    project: ProjectDescription,
+    limit: int = 5,
+    db: AsyncIOMotorDatabase = None,
+    session_id: Optional[str] = None,
 ) -> List[FoundationScore]:
     """
     Convenience function to score foundations.
@@ -584,9 +747,28 @@ async def score_foundations(
         project: The project description to match against
         limit: Maximum number of foundations to return
         db: Optional database instance
+        session_id: Session the request belongs to (scopes coalescing)
 
     Returns:
         List of FoundationScore objects, sorted by match score
     """
     service = get_scoring_service()
-    return await service.score_foundations(project, limit, db)
+    return await service.score_foundations(project, limit, db, session_id)
+
+
+def stream_foundation_scores(
+    project: ProjectDescription, limit: int = 5, db: AsyncIOMotorDatabase = None
+) -> AsyncIterator[FoundationScore]:
+    """
+    Convenience function to stream foundation scores as they are evaluated.
+
+    Args:
+        project: The project description to match against
+        limit: Maximum number of foundations in the final ranking
+        db: Optional database instance
+
+    Returns:
+        Async iterator of FoundationScore objects in completion order
+    """
+    service = get_scoring_service()
+    return service.stream_foundation_scores(project, limit, db)
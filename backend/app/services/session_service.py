@@ -2,12 +2,58 @@
 Session service for managing user sessions and state persistence.
 """
 
+import logging
 import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Optional, Dict, Any, Iterable, List
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
-from app.models.session import SessionData, CreateSessionRequest, ApplicationDocument
+from app.core.config import settings
+from app.core.logging import span
+from app.models.document_generation import GeneratedDocument
+from app.models.session import (
+    SessionData,
+    SessionSummary,
+    CreateSessionRequest,
+    ApplicationDocument,
+    AppendMessagesOperation,
+    ReplaceDocumentOperation,
+    SessionOperation,
+    SetCurrentFoundationOperation,
+    SetDocumentsOperation,
+    SetFoundationResultsOperation,
+    SetProjectQueryOperation,
+)
+from app.services.conversation_store import get_conversation_store
+from app.services.session_storage import (
+    SESSION_PARTS,
+    SUMMARY_FIELDS,
+    delete_parts,
+    in_transaction,
+    initial_title_fields,
+    insert_messages,
+    load_documents,
+    load_parts,
+    refresh_document_summary,
+    replace_documents,
+    replace_results,
+    set_title,
+    summary_fields,
+    title_fields,
+    upsert_document,
+    write_parts,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SessionVersionConflict(Exception):
+    """The session was modified since the version the client based its change on."""
+    
+    def __init__(self, current_version: int):
+        super().__init__(f"Session is at version {current_version}")
+        self.current_version = current_version
 
 
 class SessionService:
@@ -26,24 +72,43 @@ class SessionService:
         application_docs_dict = {}
         for foundation_id, docs in request.application_documents.items():
             application_docs_dict[foundation_id] = [doc.model_dump() for doc in docs]
+        chat_messages = [msg.model_dump() for msg in request.chat_messages]
         
         session_doc = {
             "session_id": session_id,
-            "chat_messages": [msg.model_dump() for msg in request.chat_messages],
-            "foundation_results": request.foundation_results,
             "current_foundation_id": request.current_foundation_id,
             "project_query": request.project_query,
-            "application_documents": application_docs_dict,
+            "message_count": len(chat_messages),
+            **initial_title_fields(None, request.project_query, chat_messages),
+            **summary_fields(request.current_foundation_id, application_docs_dict),
+            "version": 0,
             "created_at": now,
             "updated_at": now
         }
         
-        await self.collection.insert_one(session_doc)
+        async def write(mongo_session: AsyncIOMotorClientSession) -> None:
+            # insert_one adds _id to the document it is given; keep session_doc clean for retries
+            await self.collection.insert_one(dict(session_doc), session=mongo_session)
+            await write_parts(
+                self.db,
+                session_id,
+                chat_messages,
+                request.foundation_results,
+                application_docs_dict,
+                mongo_session
+            )
         
-        return SessionData(**session_doc)
+        await in_transaction(self.db, write)
+        
+        return SessionData(
+            **session_doc,
+            chat_messages=chat_messages,
+            foundation_results=request.foundation_results,
+            application_documents=application_docs_dict
+        )
     
     async def update_session(self, session_id: str, request: CreateSessionRequest) -> Optional[SessionData]:
-        """Update an existing session."""
+        """Update an existing session (session document and all parts in one transaction)."""
         now = datetime.utcnow().isoformat()
         
         # Convert application_documents to dict format for storage
@@ -51,182 +116,361 @@ class SessionService:
         application_docs_dict = {}
         for foundation_id, docs in request.application_documents.items():
             application_docs_dict[foundation_id] = [doc.model_dump() for doc in docs]
+        chat_messages = [msg.model_dump() for msg in request.chat_messages]
         
-        update_doc = {
-            "$set": {
-                "chat_messages": [msg.model_dump() for msg in request.chat_messages],
-                "foundation_results": request.foundation_results,
-                "current_foundation_id": request.current_foundation_id,
-                "project_query": request.project_query,
-                "application_documents": application_docs_dict,
-                "updated_at": now
-            }
-        }
+        async def write(mongo_session: AsyncIOMotorClientSession) -> bool:
+            result = await self.collection.update_one(
+                {"session_id": session_id},
+                {
+                    "$set": {
+                        "current_foundation_id": request.current_foundation_id,
+                        "project_query": request.project_query,
+                        "message_count": len(chat_messages),
+                        **summary_fields(request.current_foundation_id, application_docs_dict),
+                        "updated_at": now
+                    },
+                    # The summary covered the old transcript, which is replaced wholesale
+                    "$unset": {"conversation_summary": ""},
+                    "$inc": {"version": 1}
+                },
+                session=mongo_session
+            )
+            if not result.matched_count:
+                return False
+            await write_parts(
+                self.db,
+                session_id,
+                chat_messages,
+                request.foundation_results,
+                application_docs_dict,
+                mongo_session
+            )
+            await set_title(
+                self.db,
+                session_id,
+                initial_title_fields(None, request.project_query, chat_messages),
+                mongo_session
+            )
+            return True
         
-        result = await self.collection.find_one_and_update(
-            {"session_id": session_id},
-            update_doc,
-            return_document=True
-        )
+        if not await in_transaction(self.db, write):
+            return None
+        get_conversation_store().invalidate(session_id)
         
-        if result:
-            return SessionData(**result)
-        return None
+        return await self.get_session(session_id)
+    
+    async def patch_session(
+        self,
+        session_id: str,
+        operations: List[SessionOperation],
+        expected_version: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply delta operations to a session.
+        
+        The session document is updated once (scalar fields, version and
+        message count, conditioned on expected_version); appended messages
+        and replaced documents are written as individual rows of
+        session_messages / session_documents, so the write scales with the
+        change rather than the session. All of it is one transaction: a
+        failed or conflicting patch leaves the session untouched.
+        
+        Args:
+            session_id: The session to update
+            operations: Operations, applied in order
+            expected_version: If given, only apply if the session is at this version
+            
+        Returns:
+            {"version", "updated_at"} after the update, or None if the session does not exist
+            
+        Raises:
+            SessionVersionConflict: expected_version does not match
+            ValueError: an operation addresses an invalid foundation_id
+        """
+        set_fields: Dict[str, Any] = {}
+        messages: List[Dict[str, Any]] = []
+        foundation_results: Optional[List[Dict[str, Any]]] = None
+        document_ops: List[SessionOperation] = []
+        title: Dict[str, Any] = {}
+        
+        for op in operations:
+            if isinstance(op, AppendMessagesOperation):
+                messages.extend(msg.model_dump() for msg in op.messages)
+            elif isinstance(op, SetCurrentFoundationOperation):
+                set_fields["current_foundation_id"] = op.foundation_id
+                if op.foundation_id:
+                    set_fields["last_foundation_id"] = op.foundation_id
+            elif isinstance(op, SetProjectQueryOperation):
+                set_fields["project_query"] = op.project_query
+                title = title_fields(op.project_query, "project_query") or title
+            elif isinstance(op, SetFoundationResultsOperation):
+                foundation_results = op.foundation_results
+            elif isinstance(op, (SetDocumentsOperation, ReplaceDocumentOperation)):
+                _check_foundation_id(op.foundation_id)
+                document_ops.append(op)
+                set_fields["last_foundation_id"] = op.foundation_id
+                if isinstance(op, ReplaceDocumentOperation) or op.documents:
+                    set_fields["has_documents"] = True
+                    set_fields["last_document_foundation_id"] = op.foundation_id
+        
+        query: Dict[str, Any] = {"session_id": session_id}
+        if expected_version is not None:
+            # Sessions created before versioning have no version field
+            query["version"] = {"$in": [0, None]} if expected_version == 0 else expected_version
+        set_fields["updated_at"] = datetime.utcnow().isoformat()
+        
+        async def write(mongo_session: AsyncIOMotorClientSession) -> Optional[Dict[str, Any]]:
+            result = await self.collection.find_one_and_update(
+                query,
+                {"$set": set_fields, "$inc": {"version": 1, "message_count": len(messages)}},
+                projection={"_id": 0, "version": 1, "updated_at": 1, "message_count": 1},
+                return_document=ReturnDocument.AFTER,
+                session=mongo_session
+            )
+            if not result:
+                current = await self.collection.find_one(
+                    {"session_id": session_id}, {"_id": 0, "version": 1}, session=mongo_session
+                )
+                if current is None:
+                    return None
+                raise SessionVersionConflict(current.get("version", 0))
+            
+            session_title = title
+            if messages:
+                start_seq = result["message_count"] - len(messages)
+                await insert_messages(self.db, session_id, start_seq, messages, mongo_session)
+                if start_seq == 0:
+                    session_title = title or initial_title_fields(None, None, messages)
+            if foundation_results is not None:
+                await replace_results(self.db, session_id, foundation_results, mongo_session)
+            for op in document_ops:
+                if isinstance(op, SetDocumentsOperation):
+                    await replace_documents(
+                        self.db,
+                        session_id,
+                        op.foundation_id,
+                        [doc.model_dump() for doc in op.documents],
+                        mongo_session
+                    )
+                else:
+                    await upsert_document(
+                        self.db, session_id, op.foundation_id, op.document.model_dump(), mongo_session
+                    )
+            for op in document_ops:
+                if isinstance(op, SetDocumentsOperation) and not op.documents:
+                    await refresh_document_summary(self.db, session_id, op.foundation_id, mongo_session)
+            await set_title(self.db, session_id, session_title, mongo_session)
+            return {"version": result["version"], "updated_at": result["updated_at"]}
+        
+        with span("mongo.patch_session", operations=len(operations)):
+            patched = await in_transaction(self.db, write)
+        if patched and messages:
+            get_conversation_store().invalidate(session_id)
+        return patched
     
-    async def get_session(self, session_id: str) -> Optional[SessionData]:
-        """Retrieve a session by ID."""
-        session_doc = await self.collection.find_one({"session_id": session_id})
+    async def get_session(
+        self,
+        session_id: str,
+        include: Iterable[str] = SESSION_PARTS
+    ) -> Optional[SessionData]:
+        """
+        Retrieve a session by ID.
+        
+        Args:
+            session_id: The session to read
+            include: Which of chat_messages / foundation_results /
+                application_documents to load (the others are left empty)
+        """
+        with span("mongo.get_session"):
+            session_doc = await self.collection.find_one({"session_id": session_id}, {"_id": 0})
         
         if session_doc:
-            # Ensure application_documents exists for backward compatibility
-            if "application_documents" not in session_doc:
-                session_doc["application_documents"] = {}
-            return SessionData(**session_doc)
+            parts = await load_parts(self.db, [session_id], include)
+            return SessionData(**session_doc, **parts[session_id])
         return None
     
     async def delete_session(self, session_id: str) -> bool:
-        """Delete a session."""
-        result = await self.collection.delete_one({"session_id": session_id})
-        return result.deleted_count > 0
+        """Delete a session and its parts."""
+        async def write(mongo_session: AsyncIOMotorClientSession) -> bool:
+            result = await self.collection.delete_one({"session_id": session_id}, session=mongo_session)
+            await delete_parts(self.db, session_id, mongo_session)
+            return result.deleted_count > 0
+        
+        deleted = await in_transaction(self.db, write)
+        get_conversation_store().invalidate(session_id)
+        return deleted
     
     async def list_recent_sessions(self, limit: int = 3) -> list[SessionData]:
         """List recent sessions ordered by updated_at."""
-        cursor = self.collection.find().sort("updated_at", -1).limit(limit)
+        session_docs = await self.collection.find({}, {"_id": 0}).sort("updated_at", -1).to_list(length=limit)
+        parts = await load_parts(self.db, [doc["session_id"] for doc in session_docs])
         sessions = []
         
-        async for session_doc in cursor:
-            # Ensure application_documents exists for backward compatibility
-            if "application_documents" not in session_doc:
-                session_doc["application_documents"] = {}
-            
-            # Debug: Check what's in application_documents before parsing
-            app_docs_raw = session_doc.get("application_documents", {})
-            print(f"🔍 [list_recent_sessions] Session {session_doc.get('session_id')}: application_documents type={type(app_docs_raw)}, keys={list(app_docs_raw.keys()) if isinstance(app_docs_raw, dict) else 'N/A'}")
-            if isinstance(app_docs_raw, dict) and app_docs_raw:
-                for foundation_id, docs in app_docs_raw.items():
-                    print(f"  📄 Foundation {foundation_id}: {len(docs) if isinstance(docs, list) else 'N/A'} documents")
-                    if isinstance(docs, list) and docs:
-                        print(f"    First doc type: {type(docs[0])}, keys: {list(docs[0].keys()) if isinstance(docs[0], dict) else 'N/A'}")
-            
+        for session_doc in session_docs:
+            session_doc.update(parts[session_doc["session_id"]])
             try:
-                session_data = SessionData(**session_doc)
-                # Debug: Check what's in application_documents after parsing
-                parsed_app_docs = session_data.application_documents
-                print(f"✅ [list_recent_sessions] After parsing: {len(parsed_app_docs)} foundation keys")
-                if parsed_app_docs:
-                    for foundation_id, docs in parsed_app_docs.items():
-                        print(f"  📄 Foundation {foundation_id}: {len(docs)} ApplicationDocument objects")
-                sessions.append(session_data)
-            except Exception as e:
-                print(f"❌ [list_recent_sessions] Error parsing session {session_doc.get('session_id')}: {e}")
-                import traceback
-                traceback.print_exc()
-                # Still add it but with empty application_documents
+                sessions.append(SessionData(**session_doc))
+            except ValueError:
+                # Still list it, without the documents that failed to parse
+                logger.exception(f"Invalid application documents in session {session_doc['session_id']}")
                 session_doc["application_documents"] = {}
-            sessions.append(SessionData(**session_doc))
+                sessions.append(SessionData(**session_doc))
         
         return sessions
     
+    async def list_session_summaries(self, limit: int = 10) -> List[SessionSummary]:
+        """
+        List recent sessions as summaries, ordered by updated_at.
+        
+        Reads only the precomputed summary fields, all of which are in the
+        session_summaries index (no session parts are loaded).
+        """
+        cursor = self.collection.find(
+            {}, {"_id": 0, **{field: 1 for field in SUMMARY_FIELDS}}
+        ).sort("updated_at", -1).limit(limit)
+        return [SessionSummary(**session_doc) async for session_doc in cursor]
+    
+    async def upsert_application_document(
+        self,
+        session_id: str,
+        foundation_id: str,
+        document: ApplicationDocument
+    ) -> bool:
+        """
+        Store one application document for a foundation, replacing any
+        existing document of the same type.
+        
+        Returns:
+            False if the session does not exist
+        """
+        async def write(mongo_session: AsyncIOMotorClientSession) -> bool:
+            result = await self.collection.update_one(
+                {"session_id": session_id},
+                {
+                    "$set": {
+                        "updated_at": datetime.utcnow().isoformat(),
+                        "last_foundation_id": foundation_id,
+                        "has_documents": True,
+                        "last_document_foundation_id": foundation_id
+                    },
+                    "$inc": {"version": 1}
+                },
+                session=mongo_session
+            )
+            if not result.matched_count:
+                return False
+            await upsert_document(
+                self.db, session_id, foundation_id, document.model_dump(), mongo_session
+            )
+            return True
+        
+        return await in_transaction(self.db, write)
+    
+    async def store_generated_document(
+        self,
+        session_id: str,
+        foundation_id: str,
+        generated: GeneratedDocument
+    ) -> bool:
+        """
+        Save a freshly generated document to the session. Placeholders
+        (source="fallback") are skipped so they never overwrite earlier drafts.
+        """
+        if generated.source != "model":
+            return False
+        return await self.upsert_application_document(
+            session_id,
+            foundation_id,
+            ApplicationDocument(
+                document_type=generated.document,
+                content=generated.text,
+                improvements=generated.improvements
+            )
+        )
+    
     async def update_application_documents(
         self, 
         session_id: str, 
         foundation_id: str, 
         documents: list[ApplicationDocument]
     ) -> Optional[SessionData]:
-        """Update application documents for a specific foundation in a session."""
-        now = datetime.utcnow().isoformat()
+        """
+        Update application documents for a specific foundation in a session.
         
-        # Convert documents to dict format
-        documents_dict = [doc.model_dump() for doc in documents]
-        print(f"📝 Updating application documents for session {session_id}, foundation {foundation_id}")
-        print(f"📄 Documents to save: {len(documents_dict)} documents")
+        One transaction with one session update and one bulk write of the
+        foundation's rows in session_documents (plus a lookup of other
+        foundations' documents and a summary update when the list is
+        empty, see refresh_document_summary); the returned
+        SessionData only contains this foundation's documents (no chat
+        messages or foundation results). With SESSION_DEBUG_VERIFY_WRITES
+        the stored documents are read back and compared.
         
-        # First, ensure the session exists and get current application_documents
-        session_doc = await self.collection.find_one({"session_id": session_id})
-        if not session_doc:
-            print(f"❌ Session not found: {session_id}")
-            return None
-        
-        # Get existing application_documents or initialize empty dict
-        existing_app_docs = session_doc.get("application_documents", {})
-        if not isinstance(existing_app_docs, dict):
-            existing_app_docs = {}
+        Returns:
+            None if the session does not exist
+        """
+        _check_foundation_id(foundation_id)
+        documents_dict = [doc.model_dump() for doc in documents]
         
-        print(f"📦 Existing application_documents keys: {list(existing_app_docs.keys())}")
+        set_fields: Dict[str, Any] = {
+            "updated_at": datetime.utcnow().isoformat(),
+            "last_foundation_id": foundation_id
+        }
+        if documents_dict:
+            set_fields["has_documents"] = True
+            set_fields["last_document_foundation_id"] = foundation_id
         
-        # Update the specific foundation's documents
-        existing_app_docs[foundation_id] = documents_dict
+        async def write(mongo_session: AsyncIOMotorClientSession) -> Optional[Dict[str, Any]]:
+            result = await self.collection.find_one_and_update(
+                {"session_id": session_id},
+                {"$set": set_fields, "$inc": {"version": 1}},
+                projection={
+                    "_id": 0,
+                    "session_id": 1,
+                    "current_foundation_id": 1,
+                    "project_query": 1,
+                    "version": 1,
+                    "created_at": 1,
+                    "updated_at": 1
+                },
+                return_document=ReturnDocument.AFTER,
+                session=mongo_session
+            )
+            if not result:
+                return None
+            await replace_documents(self.db, session_id, foundation_id, documents_dict, mongo_session)
+            if not documents_dict:
+                await refresh_document_summary(self.db, session_id, foundation_id, mongo_session)
+            return result
         
-        print(f"💾 Saving {len(documents_dict)} documents for foundation {foundation_id}")
+        result = await in_transaction(self.db, write)
+        if not result:
+            return None
         
-        # Use $set to update the entire application_documents field
-        update_doc = {
-            "$set": {
-                "application_documents": existing_app_docs,
-                "updated_at": now
-            }
-        }
+        if settings.SESSION_DEBUG_VERIFY_WRITES:
+            await self._verify_documents(session_id, foundation_id, documents_dict)
         
-        result = await self.collection.find_one_and_update(
-            {"session_id": session_id},
-            update_doc,
-            return_document=True
+        return SessionData(**result, application_documents={foundation_id: documents_dict})
+    
+    async def _verify_documents(
+        self,
+        session_id: str,
+        foundation_id: str,
+        expected: List[Dict[str, Any]]
+    ) -> None:
+        """Read back a foundation's documents and log any mismatch (debug only)."""
+        stored_docs = await load_documents(self.db, [session_id], foundation_id)
+        stored = stored_docs[session_id].get(foundation_id, [])
+        if stored == expected:
+            logger.debug(f"Verified {len(expected)} documents of {session_id}/{foundation_id}")
+            return
+        logger.warning(
+            f"Document write verification failed for {session_id}/{foundation_id}: "
+            f"expected types {[d.get('document_type') for d in expected]}, "
+            f"stored {[d.get('document_type') for d in stored or []]}"
         )
-        
-        if result:
-            # Verify the save worked immediately after update
-            saved_docs = result.get("application_documents", {}).get(foundation_id, [])
-            print(f"✅ Saved {len(saved_docs)} documents. Verification: {len(saved_docs) == len(documents_dict)}")
-            
-            # First, check raw MongoDB document
-            print(f"🔍 Checking raw MongoDB document...")
-            raw_doc = await self.collection.find_one({"session_id": session_id})
-            if raw_doc:
-                raw_app_docs = raw_doc.get("application_documents", {})
-                print(f"📦 Raw MongoDB: application_documents type={type(raw_app_docs)}, keys={list(raw_app_docs.keys()) if isinstance(raw_app_docs, dict) else 'N/A'}")
-                if isinstance(raw_app_docs, dict) and foundation_id in raw_app_docs:
-                    raw_foundation_docs = raw_app_docs[foundation_id]
-                    print(f"📄 Raw MongoDB: foundation {foundation_id} has {len(raw_foundation_docs) if isinstance(raw_foundation_docs, list) else 'N/A'} documents")
-                    if isinstance(raw_foundation_docs, list) and raw_foundation_docs:
-                        print(f"  First raw doc: {type(raw_foundation_docs[0])}, keys: {list(raw_foundation_docs[0].keys()) if isinstance(raw_foundation_docs[0], dict) else 'N/A'}")
-                        if isinstance(raw_foundation_docs[0], dict):
-                            print(f"  First raw doc content: document_type={raw_foundation_docs[0].get('document_type')}, content_length={len(raw_foundation_docs[0].get('content', ''))}")
-            
-            # Retrieve the session again using the same method as get_session to verify persistence
-            print(f"🔍 Retrieving session again using get_session method to verify persistence...")
-            verification_session = await self.get_session(session_id)
-            if verification_session:
-                verified_docs = verification_session.application_documents.get(foundation_id, [])
-                print(f"🔍 Retrieved {len(verified_docs)} documents from DB using get_session. Match: {len(verified_docs) == len(documents_dict)}")
-                
-                if len(verified_docs) != len(documents_dict):
-                    print(f"⚠️ WARNING: Document count mismatch! Expected {len(documents_dict)}, got {len(verified_docs)}")
-                    print(f"📋 Expected document types: {[d.get('document_type', 'unknown') for d in documents_dict]}")
-                    print(f"📋 Retrieved document types: {[doc.document_type for doc in verified_docs]}")
-                    print(f"📋 Expected document contents length: {[len(d.get('content', '')) for d in documents_dict]}")
-                    print(f"📋 Retrieved document contents length: {[len(doc.content) for doc in verified_docs]}")
-                else:
-                    print(f"✅ Verification successful: All {len(verified_docs)} documents persisted correctly")
-                    # Also verify content matches
-                    content_matches = all(
-                        any(
-                            doc.document_type == d.get('document_type') and 
-                            doc.content == d.get('content')
-                            for doc in verified_docs
-                        )
-                        for d in documents_dict
-                    )
-                    if content_matches:
-                        print(f"✅ Content verification: All document contents match")
-                    else:
-                        print(f"⚠️ WARNING: Content mismatch detected!")
-            else:
-                print(f"❌ ERROR: Could not retrieve session for verification using get_session!")
-            
-            # Ensure application_documents exists for backward compatibility
-            if "application_documents" not in result:
-                result["application_documents"] = {}
-            
-            return SessionData(**result)
-        return None
 
+
+def _check_foundation_id(foundation_id: str) -> None:
+    """Foundation IDs are used as keys of SessionData.application_documents."""
+    if not foundation_id or "." in foundation_id or foundation_id.startswith("$"):
+        raise ValueError(f"Invalid foundation_id: {foundation_id!r}")
@@ -0,0 +1,421 @@
+"""
+Normalized storage of a session's large parts.
+
+The `sessions` document only holds scalar state (current foundation,
+project query/description, summary, version, message_count, timestamps).
+Its growing parts live in their own collections, indexed by session_id:
+
+- `session_messages`: one document per chat message, ordered by `seq`
+- `session_results`: one document per foundation result, ordered by `rank`;
+  scored foundations are stored as a reference plus match score and match
+  items and rebuilt from the `foundations` collection when read
+- `session_documents`: one document per application document draft
+
+The session document also carries the summary fields the session picker
+lists (title, message_count, last_foundation_id, has_documents,
+last_document_foundation_id), kept up to date by the writes that change
+them.
+
+The write helpers take an optional `mongo_session`; every write that
+touches the session document and its parts runs them in one transaction
+(`in_transaction`).
+
+Run `python -m app.migrate_sessions` to move sessions written with the
+embedded layout into these collections.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from pymongo import DeleteMany, InsertOne
+
+from app.core.logging import span
+from app.services.foundation_scores import rebuild_foundation_score
+
+
+# Parts of SessionData stored outside the session document
+SESSION_PARTS = ("chat_messages", "foundation_results", "application_documents")
+
+# Session fields returned by the summary listing; all of them are in the
+# summary index, so listing recent sessions is a covered index scan
+SUMMARY_FIELDS = (
+    "session_id",
+    "title",
+    "message_count",
+    "updated_at",
+    "last_foundation_id",
+    "has_documents",
+    "last_document_foundation_id",
+)
+SUMMARY_INDEX = "session_summaries"
+
+# Title sources, weakest first: a title only replaces one from a weaker source
+TITLE_SOURCES = ("first_message", "project_query", "project_description")
+TITLE_MAX_LENGTH = 80
+
+T = TypeVar("T")
+
+
+async def ensure_session_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create the indexes sessions and their parts are read by."""
+    await db.sessions.create_index("session_id")
+    summary_keys = [
+        ("updated_at", -1), *((field, 1) for field in SUMMARY_FIELDS if field != "updated_at")
+    ]
+    async for index in db.sessions.list_indexes():
+        # An index built for an older SUMMARY_FIELDS no longer covers the listing
+        if index["name"] == SUMMARY_INDEX and list(index["key"].items()) != summary_keys:
+            await db.sessions.drop_index(SUMMARY_INDEX)
+    await db.sessions.create_index(summary_keys, name=SUMMARY_INDEX)
+    await db.session_messages.create_index([("session_id", 1), ("seq", 1)], unique=True)
+    await db.session_results.create_index([("session_id", 1), ("rank", 1)])
+    await db.session_documents.create_index(
+        [("session_id", 1), ("foundation_id", 1), ("document_type", 1)], unique=True
+    )
+
+
+async def in_transaction(
+    db: AsyncIOMotorDatabase, write: Callable[[AsyncIOMotorClientSession], Awaitable[T]]
+) -> T:
+    """
+    Run a multi-collection write in one MongoDB transaction.
+
+    The session document and its parts are committed together or not at
+    all. `write` is re-run from scratch on transient errors (e.g. a write
+    conflict with a concurrent chat turn), so it must not depend on state
+    from an earlier attempt.
+    """
+    async with await db.client.start_session() as mongo_session:
+        return await mongo_session.with_transaction(write)
+
+
+# --- Summary fields --------------------------------------------------------
+
+def title_fields(text: Optional[str], source: str) -> Dict[str, Any]:
+    """$set fields for a title from the given source (empty if there is no text)."""
+    title = " ".join((text or "").split())
+    if not title:
+        return {}
+    if len(title) > TITLE_MAX_LENGTH:
+        title = title[:TITLE_MAX_LENGTH - 1].rstrip() + "…"
+    return {"title": title, "title_rank": TITLE_SOURCES.index(source)}
+
+
+def project_title(project_description: Dict[str, Any]) -> Optional[str]:
+    """Title of a stored project description: its name, else its description."""
+    return project_description.get("name") or project_description.get("description")
+
+
+async def set_title(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    fields: Dict[str, Any],
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """Apply title_fields unless the session's title comes from a stronger source."""
+    if not fields:
+        return
+    await db.sessions.update_one(
+        {
+            "session_id": session_id,
+            "$or": [
+                {"title_rank": {"$exists": False}},
+                {"title_rank": {"$lte": fields["title_rank"]}},
+            ],
+        },
+        {"$set": fields},
+        session=mongo_session,
+    )
+
+
+def initial_title_fields(
+    project_description: Optional[Dict[str, Any]],
+    project_query: Optional[str],
+    chat_messages: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Title fields of a session written as a whole, from its strongest source."""
+    first_user_message = next(
+        (m.get("content") for m in chat_messages if m.get("role") == "user"), None
+    )
+    return (
+        title_fields(project_title(project_description or {}), "project_description")
+        or title_fields(project_query, "project_query")
+        or title_fields(first_user_message, "first_message")
+    )
+
+
+def summary_fields(
+    current_foundation_id: Optional[str],
+    application_documents: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Foundation summary fields of a session written as a whole."""
+    with_documents = [fid for fid, docs in application_documents.items() if docs]
+    fields: Dict[str, Any] = {"has_documents": bool(with_documents)}
+    last_foundation_id = current_foundation_id or next(iter(with_documents), None)
+    if last_foundation_id:
+        fields["last_foundation_id"] = last_foundation_id
+    # Only ever a foundation that has documents (None if there are none)
+    if current_foundation_id in with_documents:
+        fields["last_document_foundation_id"] = current_foundation_id
+    else:
+        fields["last_document_foundation_id"] = next(iter(with_documents), None)
+    return fields
+
+
+async def refresh_document_summary(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    removed_foundation_id: str,
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """
+    Update has_documents and last_document_foundation_id after all documents
+    of `removed_foundation_id` were deleted: the latter moves to another
+    foundation with documents if it pointed at the removed one.
+    """
+    remaining = await db.session_documents.find_one(
+        {"session_id": session_id}, {"_id": 0, "foundation_id": 1}, session=mongo_session
+    )
+    if remaining is None:
+        await db.sessions.update_one(
+            {"session_id": session_id},
+            {"$set": {"has_documents": False, "last_document_foundation_id": None}},
+            session=mongo_session,
+        )
+        return
+    await db.sessions.update_one(
+        {"session_id": session_id, "last_document_foundation_id": {"$in": [removed_foundation_id, None]}},
+        {"$set": {"last_document_foundation_id": remaining["foundation_id"]}},
+        session=mongo_session,
+    )
+
+
+# --- Chat messages ---------------------------------------------------------
+
+async def insert_messages(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    start_seq: int,
+    messages: List[Dict[str, Any]],
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """Store messages with consecutive sequence numbers starting at start_seq."""
+    if not messages:
+        return
+    await db.session_messages.insert_many([
+        {"session_id": session_id, "seq": start_seq + i, **message}
+        for i, message in enumerate(messages)
+    ], session=mongo_session)
+
+
+async def replace_messages(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    messages: List[Dict[str, Any]],
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """Replace a session's transcript."""
+    await db.session_messages.delete_many({"session_id": session_id}, session=mongo_session)
+    await insert_messages(db, session_id, 0, messages, mongo_session)
+
+
+async def load_messages(
+    db: AsyncIOMotorDatabase, session_ids: Iterable[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Transcripts of the given sessions, in order."""
+    by_session: Dict[str, List[Dict[str, Any]]] = {sid: [] for sid in session_ids}
+    cursor = db.session_messages.find(
+        {"session_id": {"$in": list(by_session)}},
+        {"_id": 0, "session_id": 1, "role": 1, "content": 1, "timestamp": 1},
+    ).sort([("session_id", 1), ("seq", 1)])
+    async for message in cursor:
+        by_session[message.pop("session_id")].append(message)
+    return by_session
+
+
+# --- Foundation results ----------------------------------------------------
+
+async def replace_results(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    results: List[Dict[str, Any]],
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """
+    Replace a session's foundation results.
+
+    Results that are scored foundations of the catalog (id, match_score,
+    matches) are stored by reference; anything else is kept as a snapshot.
+    """
+    ids = [r.get("id") for r in results if isinstance(r, dict) and r.get("id")]
+    known = {
+        f["_id"]
+        async for f in db.foundations.find({"_id": {"$in": ids}}, {"_id": 1}, session=mongo_session)
+    } if ids else set()
+
+    rows = []
+    for rank, result in enumerate(results):
+        if (
+            result.get("id") in known
+            and isinstance(result.get("match_score"), (int, float))
+            and isinstance(result.get("matches"), list)
+        ):
+            rows.append({
+                "session_id": session_id,
+                "rank": rank,
+                "foundation_id": result["id"],
+                "name": result.get("name"),
+                "match_score": result["match_score"],
+                "matches": result["matches"],
+            })
+        else:
+            rows.append({"session_id": session_id, "rank": rank, "snapshot": result})
+
+    await db.session_results.delete_many({"session_id": session_id}, session=mongo_session)
+    if rows:
+        await db.session_results.insert_many(rows, session=mongo_session)
+
+
+async def load_results(
+    db: AsyncIOMotorDatabase, session_ids: Iterable[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Foundation results of the given sessions, rebuilt from the catalog."""
+    by_session: Dict[str, List[Dict[str, Any]]] = {sid: [] for sid in session_ids}
+    rows = await db.session_results.find(
+        {"session_id": {"$in": list(by_session)}}, {"_id": 0}
+    ).sort([("session_id", 1), ("rank", 1)]).to_list(length=None)
+
+    ids = list({row["foundation_id"] for row in rows if "foundation_id" in row})
+    foundations = {
+        f["_id"]: f async for f in db.foundations.find({"_id": {"$in": ids}})
+    } if ids else {}
+
+    for row in rows:
+        if "snapshot" in row:
+            by_session[row["session_id"]].append(row["snapshot"])
+            continue
+        foundation = foundations.get(row["foundation_id"])
+        if foundation is None:
+            # Removed from the catalog since: keep what the session itself knows
+            by_session[row["session_id"]].append({
+                "id": row["foundation_id"],
+                "name": row.get("name"),
+                "match_score": row["match_score"],
+                "matches": row["matches"],
+            })
+            continue
+        score = rebuild_foundation_score(foundation, row["match_score"], row["matches"])
+        by_session[row["session_id"]].append(score.model_dump())
+    return by_session
+
+
+# --- Application documents -------------------------------------------------
+
+async def replace_documents(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    foundation_id: str,
+    documents: List[Dict[str, Any]],
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """Replace all documents of one foundation (kept in the given order, one per type)."""
+    by_type = {document["document_type"]: document for document in documents}
+    # One ordered bulk write: a single round-trip however many documents there are
+    await db.session_documents.bulk_write([
+        DeleteMany({"session_id": session_id, "foundation_id": foundation_id}),
+        *(
+            InsertOne({"session_id": session_id, "foundation_id": foundation_id, **document})
+            for document in by_type.values()
+        ),
+    ], session=mongo_session)
+
+
+async def upsert_document(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    foundation_id: str,
+    document: Dict[str, Any],
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """Replace one document by type, appending it if the foundation has none of that type."""
+    await db.session_documents.update_one(
+        {
+            "session_id": session_id,
+            "foundation_id": foundation_id,
+            "document_type": document["document_type"],
+        },
+        {"$set": document},
+        upsert=True,
+        session=mongo_session,
+    )
+
+
+async def load_documents(
+    db: AsyncIOMotorDatabase,
+    session_ids: Iterable[str],
+    foundation_id: Optional[str] = None,
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Documents of the given sessions by foundation (optionally one foundation only)."""
+    by_session: Dict[str, Dict[str, List[Dict[str, Any]]]] = {sid: {} for sid in session_ids}
+    query: Dict[str, Any] = {"session_id": {"$in": list(by_session)}}
+    if foundation_id is not None:
+        query["foundation_id"] = foundation_id
+    # _id order is insertion order: replaced documents keep their position
+    cursor = db.session_documents.find(query).sort([("session_id", 1), ("_id", 1)])
+    async for document in cursor:
+        by_session[document["session_id"]].setdefault(document["foundation_id"], []).append({
+            "document_type": document["document_type"],
+            "content": document.get("content", ""),
+            "improvements": document.get("improvements", []),
+        })
+    return by_session
+
+
+# --- Whole sessions --------------------------------------------------------
+
+async def load_parts(
+    db: AsyncIOMotorDatabase,
+    session_ids: List[str],
+    include: Iterable[str] = SESSION_PARTS,
+) -> Dict[str, Dict[str, Any]]:
+    """Load the requested parts of several sessions with one query per part."""
+    include = set(include)
+    parts: Dict[str, Dict[str, Any]] = {sid: {} for sid in session_ids}
+    with span("mongo.session_parts", sessions=len(session_ids), parts=sorted(include)):
+        if "chat_messages" in include:
+            for sid, messages in (await load_messages(db, session_ids)).items():
+                parts[sid]["chat_messages"] = messages
+        if "foundation_results" in include:
+            for sid, results in (await load_results(db, session_ids)).items():
+                parts[sid]["foundation_results"] = results
+        if "application_documents" in include:
+            for sid, documents in (await load_documents(db, session_ids)).items():
+                parts[sid]["application_documents"] = documents
+    return parts
+
+
+async def write_parts(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    chat_messages: List[Dict[str, Any]],
+    foundation_results: List[Dict[str, Any]],
+    application_documents: Dict[str, List[Dict[str, Any]]],
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """Replace all parts of a session (create, full update, migration)."""
+    with span("mongo.write_session_parts", messages=len(chat_messages)):
+        await replace_messages(db, session_id, chat_messages, mongo_session)
+        await replace_results(db, session_id, foundation_results, mongo_session)
+        await db.session_documents.delete_many({"session_id": session_id}, session=mongo_session)
+        for foundation_id, documents in application_documents.items():
+            await replace_documents(db, session_id, foundation_id, documents, mongo_session)
+
+
+async def delete_parts(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    mongo_session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """Remove all parts of a session."""
+    await db.session_messages.delete_many({"session_id": session_id}, session=mongo_session)
+    await db.session_results.delete_many({"session_id": session_id}, session=mongo_session)
+    await db.session_documents.delete_many({"session_id": session_id}, session=mongo_session)
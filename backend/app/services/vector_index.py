@@ -0,0 +1,236 @@
+"""
+Embedding-based semantic retrieval of foundations.
+
+Foundation texts (descriptions + past projects) are embedded offline with
+`python -m app.build_vector_index` into a normalized float32 matrix that is
+memory-mapped at runtime, so ranking a query against all foundations is a
+single matrix-vector product. NumPy is an optional dependency
+(`pip install .[semantic]`); without it semantic retrieval stays disabled.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+from pydantic import SecretStr
+
+from app.core.config import settings
+from app.services.bm25_index import fold_umlauts
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on installed extras
+    np = None
+
+logger = logging.getLogger(__name__)
+
+LOCAL_EMBEDDING_MODEL = "local-hashing"
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic local embedding model (hashed character trigrams).
+
+    Stand-in for a real embedding model in tests and offline setups. Shared
+    trigrams give related German word forms such as "Jugendliche" and
+    "Jugendhilfe" a non-zero similarity.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in re.findall(r"\w+", fold_umlauts(text.lower())):
+            padded = f" {token} "
+            for i in range(len(padded) - 2):
+                digest = hashlib.md5(padded[i : i + 3].encode("utf-8")).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+                vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+def get_embeddings() -> Embeddings:
+    """Create the embedding model configured by EMBEDDING_MODEL."""
+    if settings.EMBEDDING_MODEL == LOCAL_EMBEDDING_MODEL:
+        return HashingEmbeddings()
+
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(
+        model=settings.EMBEDDING_MODEL,
+        api_key=SecretStr(settings.REQUESTY_API_KEY),
+        base_url=settings.REQUESTY_BASE_URL,
+    )
+
+
+def foundation_embedding_text(foundation: Dict) -> str:
+    """Text that represents a foundation in the embedding space."""
+    parts = [
+        foundation.get("name") or "",
+        foundation.get("short_description") or "",
+        foundation.get("long_description") or "",
+    ]
+    for project in foundation.get("past_projects") or []:
+        if isinstance(project, dict):
+            parts.append(f"{project.get('name', '')}: {project.get('description', '')}")
+    return "\n".join(part for part in parts if part)
+
+
+class VectorIndex:
+    """Row-normalized embedding matrix with the foundation ID of each row."""
+
+    def __init__(self, ids: List[str], matrix, meta: Optional[Dict] = None):
+        if np is None:
+            raise RuntimeError("Semantic retrieval requires numpy (pip install .[semantic])")
+        self.ids = ids
+        self.matrix = matrix
+        self.meta = meta or {}
+        self.dimensions = int(matrix.shape[1]) if len(matrix.shape) == 2 else 0
+        self._rows = {foundation_id: row for row, foundation_id in enumerate(ids)}
+
+    @classmethod
+    def from_vectors(
+        cls, ids: List[str], vectors: List[List[float]], meta: Optional[Dict] = None
+    ) -> "VectorIndex":
+        """Build an index from raw embeddings (rows are L2-normalized)."""
+        if np is None:
+            raise RuntimeError("Semantic retrieval requires numpy (pip install .[semantic])")
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return cls(ids, matrix / norms, meta)
+
+    def save(self, path: Path) -> None:
+        """Write `<path>.npy` (matrix) and `<path>.json` (ids + metadata)."""
+        if np is None:
+            raise RuntimeError("Semantic retrieval requires numpy (pip install .[semantic])")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path.with_suffix(".npy"), self.matrix)
+        path.with_suffix(".json").write_text(
+            json.dumps({"ids": self.ids, "meta": self.meta}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "VectorIndex":
+        """Memory-map an index written by save()."""
+        if np is None:
+            raise RuntimeError("Semantic retrieval requires numpy (pip install .[semantic])")
+        header = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        matrix = np.load(path.with_suffix(".npy"), mmap_mode="r")
+        return cls(header["ids"], matrix, header.get("meta"))
+
+    def search(
+        self,
+        query_vector: List[float],
+        limit: int,
+        candidate_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank foundations by cosine similarity to the query.
+
+        Returns:
+            (foundation_id, similarity) pairs, best first
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape != (self.dimensions,):
+            raise ValueError(
+                f"Query vector has {query.size} dimensions, the index {self.dimensions}"
+            )
+        norm = np.linalg.norm(query)
+        if not norm or not self.ids:
+            return []
+        similarities = self.matrix @ (query / norm)
+
+        if candidate_ids is not None:
+            rows = np.fromiter(
+                (self._rows[f_id] for f_id in candidate_ids if f_id in self._rows),
+                dtype=np.int64,
+            )
+        else:
+            rows = np.arange(len(self.ids))
+        if not rows.size:
+            return []
+
+        scores = similarities[rows]
+        top = min(limit, rows.size)
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(self.ids[rows[i]], float(scores[i])) for i in best]
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[str]], weights: List[float], k: int = 60
+) -> List[str]:
+    """Fuse several rankings (best first) into one using weighted RRF."""
+    fused: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, foundation_id in enumerate(ranking):
+            fused[foundation_id] = fused.get(foundation_id, 0.0) + weight / (k + rank + 1)
+    return sorted(fused, key=fused.get, reverse=True)
+
+
+# Global index instance (None if not built or not loadable)
+_vector_index = None
+_vector_index_loaded = False
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Load the vector index from VECTOR_INDEX_PATH once; None if unavailable."""
+    global _vector_index, _vector_index_loaded
+    if not _vector_index_loaded:
+        _vector_index_loaded = True
+        path = Path(settings.VECTOR_INDEX_PATH)
+        try:
+            index = VectorIndex.load(path)
+            model = index.meta.get("model")
+            dimensions = index.meta.get("dimensions", index.dimensions)
+            if model != settings.EMBEDDING_MODEL or dimensions != index.dimensions:
+                # Cosine scores across embedding spaces are meaningless
+                logger.error(
+                    f"Vector index at {path} was built with {model} ({dimensions} dimensions, "
+                    f"matrix {index.dimensions}), but EMBEDDING_MODEL is {settings.EMBEDDING_MODEL}; "
+                    "semantic retrieval disabled. Rebuild it with: python -m app.build_vector_index"
+                )
+            else:
+                _vector_index = index
+                logger.info(
+                    f"Loaded vector index with {len(index.ids)} foundations from {path}"
+                )
+        except Exception:
+            logger.exception(
+                f"Vector index at {path} is unavailable; semantic retrieval disabled. "
+                "Build it with: python -m app.build_vector_index"
+            )
+    return _vector_index
+
+
+# Global embedding model instance
+_embeddings = None
+
+
+def get_query_embeddings() -> Embeddings:
+    """Get or create the embedding model used for queries."""
+    global _embeddings
+    if _embeddings is None:
+        _embeddings = get_embeddings()
+    return _embeddings
@@ -29,10 +29,11 @@ export const DocumentEditor = ({
         document_text: draft.content,
         document_type: documentType,
         existing_improvements: draft.improvements || [],
+        mode: "diff",
       });
 
       if (response && response.success && response.improvements.length > 0) {
-        // Replace improvements with new ones
+        // Replace improvements with the merged suggestions
         onImprovementsUpdate(response.improvements);
       } else {
         alert("Keine neuen Verbesserungsvorschläge gefunden.");
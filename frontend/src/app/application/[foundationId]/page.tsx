@@ -7,7 +7,7 @@ import { SubmissionModal } from "./components/SubmissionModal";
 import { SuccessModal } from "./components/SuccessModal";
 import { Toast } from "./components/Toast";
 import type { Foundation, RequiredDocument } from "@/app/chat/components/FoundationCard";
-import { getFoundationScores, generateDocuments, updateApplicationDocuments } from "@/app/chat/services/api";
+import { getFoundationScores, generateDocumentsStream, updateApplicationDocuments } from "@/app/chat/services/api";
 import { useSession } from "@/app/chat/context/SessionContext";
 
 export type DocumentDraft = {
@@ -115,40 +115,42 @@ export default function ApplicationPage() {
           setGeneratingDrafts(true);
 
           try {
-            // Simplified API call - only need session_id and foundation_id
-            const draftsResponse = await generateDocuments(sessionId, foundationId);
+            // Start with empty drafts and fill them as documents stream in
+            setDocumentDrafts(
+              requiredDocs.map((doc: RequiredDocument) => ({
+                document_type: doc.document_type,
+                content: "",
+                improvements: [],
+              }))
+            );
 
-            if (draftsResponse && draftsResponse.success) {
-              // Map generated documents to drafts
-              const drafts: DocumentDraft[] = draftsResponse.documents.map(doc => ({
+            const draftsResponse = await generateDocumentsStream(sessionId, foundationId, (doc) => {
+              const draft: DocumentDraft = {
                 document_type: doc.document,
                 content: doc.text,
                 improvements: doc.improvements || [],
-              }));
-              setDocumentDrafts(drafts);
-              // initializedFoundationRef.current is already set
-            } else {
+              };
+              setDocumentDrafts(prev => {
+                const index = prev.findIndex(d => d.document_type === draft.document_type);
+                if (index === -1) {
+                  return [...prev, draft];
+                }
+                const next = [...prev];
+                next[index] = draft;
+                return next;
+              });
+              // Show the editor as soon as the first document is available
+              setGeneratingDrafts(false);
+            });
+
+            // Drafts were filled as documents arrived; documents that did not
+            // arrive (failed stream) stay empty so the user can write them
+            if (!draftsResponse || !draftsResponse.success) {
               console.error("Failed to generate document drafts");
-              // Initialize with empty drafts
-              setDocumentDrafts(
-                requiredDocs.map((doc: RequiredDocument) => ({
-                  document_type: doc.document_type,
-                  content: "",
-                  improvements: [],
-                }))
-              );
-              // initializedFoundationRef.current is already set
             }
+            // initializedFoundationRef.current is already set
           } catch (error) {
             console.error("Error generating document drafts:", error);
-            // Initialize with empty drafts on error
-            setDocumentDrafts(
-              requiredDocs.map((doc: RequiredDocument) => ({
-                document_type: doc.document_type,
-                content: "",
-                improvements: [],
-              }))
-            );
             // initializedFoundationRef.current is already set
           } finally {
             setGeneratingDrafts(false);
@@ -2,7 +2,7 @@
 
 import { useState, useEffect, useRef } from "react";
 import { useRouter } from "next/navigation";
-import { listRecentSessions, type SessionListItem } from "../services/api";
+import { listSessionSummaries, type SessionSummary } from "../services/api";
 import { useSession } from "../context/SessionContext";
 
 type SessionSelectorProps = {
@@ -12,33 +12,18 @@ type SessionSelectorProps = {
 export const SessionSelector = ({ disabled }: SessionSelectorProps) => {
   const router = useRouter();
   const [isOpen, setIsOpen] = useState(false);
-  const [sessions, setSessions] = useState<SessionListItem[]>([]);
+  const [sessions, setSessions] = useState<SessionSummary[]>([]);
   const [isLoading, setIsLoading] = useState(false);
   const [loadingSessionId, setLoadingSessionId] = useState<string | null>(null);
   const dropdownRef = useRef<HTMLDivElement>(null);
   const { sessionId: currentSessionId, loadSession } = useSession();
 
   // Check if session has application documents
-  const hasApplicationDocuments = (session: SessionListItem): boolean => {
-    if (!session.application_documents) return false;
-    const docs = session.application_documents;
-    return Object.keys(docs).length > 0 && 
-           Object.values(docs).some(docList => docList && docList.length > 0);
-  };
+  const hasApplicationDocuments = (session: SessionSummary): boolean => session.has_documents;
 
-  // Get the first foundation ID with application documents
-  const getFirstFoundationId = (session: SessionListItem): string | null => {
-    if (!session.application_documents) return null;
-    const foundationIds = Object.keys(session.application_documents);
-    if (foundationIds.length > 0) {
-      const firstId = foundationIds[0];
-      const docs = session.application_documents[firstId];
-      if (docs && docs.length > 0) {
-        return firstId;
-      }
-    }
-    return session.current_foundation_id || null;
-  };
+  // Foundation to open the application page for (always one with documents)
+  const getDocumentFoundationId = (session: SessionSummary): string | null =>
+    session.last_document_foundation_id || null;
 
   // Load sessions when dropdown opens
   useEffect(() => {
@@ -64,7 +49,7 @@ export const SessionSelector = ({ disabled }: SessionSelectorProps) => {
   const loadSessions = async () => {
     setIsLoading(true);
     try {
-      const response = await listRecentSessions(3);
+      const response = await listSessionSummaries(3);
       if (response?.success) {
         setSessions(response.sessions);
       }
@@ -75,7 +60,7 @@ export const SessionSelector = ({ disabled }: SessionSelectorProps) => {
     }
   };
 
-  const handleSelectSession = async (session: SessionListItem) => {
+  const handleSelectSession = async (session: SessionSummary) => {
     if (session.session_id === currentSessionId) {
       setIsOpen(false);
       return;
@@ -95,7 +80,7 @@ export const SessionSelector = ({ disabled }: SessionSelectorProps) => {
       
       // If session has application documents, navigate to application page
       if (hasApplicationDocuments(session)) {
-        const foundationId = getFirstFoundationId(session);
+        const foundationId = getDocumentFoundationId(session);
         if (foundationId) {
           console.log("📄 Session has application documents, navigating to application page");
           router.push(`/application/${foundationId}`);
@@ -132,22 +117,7 @@ export const SessionSelector = ({ disabled }: SessionSelectorProps) => {
     });
   };
 
-  const getSessionPreview = (session: SessionListItem) => {
-    if (session.project_query) {
-      return session.project_query.length > 50 
-        ? session.project_query.substring(0, 50) + "..." 
-        : session.project_query;
-    }
-    if (session.chat_messages.length > 0) {
-      const firstUserMsg = session.chat_messages.find(m => m.role === "user");
-      if (firstUserMsg) {
-        return firstUserMsg.content.length > 50
-          ? firstUserMsg.content.substring(0, 50) + "..."
-          : firstUserMsg.content;
-      }
-    }
-    return "Neue Sitzung";
-  };
+  const getSessionPreview = (session: SessionSummary) => session.title || "Neue Sitzung";
 
   return (
     <div className="relative" ref={dropdownRef}>
@@ -1,17 +1,117 @@
 "use client";
 
-import { createContext, useContext, useState, useEffect, useCallback, ReactNode } from "react";
+import { createContext, useContext, useState, useEffect, useCallback, useRef, ReactNode } from "react";
 import { useRouter } from "next/navigation";
 import { 
   createSession, 
   updateSession, 
+  patchSession,
   getSession, 
+  SessionConflictError,
   type SessionData,
   type SessionResponse,
+  type SessionOperation,
   type ChatMessage,
   type ApplicationDocument
 } from "../services/api";
 
+// How often a save is rebased onto the server's session after a version conflict
+const MAX_CONFLICT_RETRIES = 3;
+
+// The parts of a session a save can change (chat messages are stored by the chat endpoint)
+type SessionSnapshot = {
+  foundationResults: any[];
+  projectQuery: string | null;
+  currentFoundationId: string | null;
+  applicationDocuments: Record<string, ApplicationDocument[]>;
+};
+
+const snapshotOf = (data: NonNullable<SessionResponse['data']>): SessionSnapshot => ({
+  foundationResults: data.foundation_results,
+  projectQuery: data.project_query || null,
+  currentFoundationId: data.current_foundation_id || null,
+  applicationDocuments: data.application_documents || {},
+});
+
+// Operations turning `from` into `to`; unchanged parts are recognized by identity
+const diffOperations = (from: SessionSnapshot, to: SessionSnapshot): SessionOperation[] => {
+  const operations: SessionOperation[] = [];
+  if (to.foundationResults !== from.foundationResults) {
+    operations.push({ op: "set_foundation_results", foundation_results: to.foundationResults });
+  }
+  if (to.projectQuery !== from.projectQuery) {
+    operations.push({ op: "set_project_query", project_query: to.projectQuery });
+  }
+  if (to.currentFoundationId !== from.currentFoundationId) {
+    operations.push({ op: "set_current_foundation", foundation_id: to.currentFoundationId });
+  }
+  for (const [foundationId, documents] of Object.entries(to.applicationDocuments)) {
+    if (documents !== from.applicationDocuments[foundationId]) {
+      operations.push({ op: "set_documents", foundation_id: foundationId, documents });
+    }
+  }
+  return operations;
+};
+
+const sameDocument = (a?: ApplicationDocument, b?: ApplicationDocument) =>
+  JSON.stringify(a) === JSON.stringify(b);
+
+// Three-way merge of one foundation's documents by document_type: documents
+// changed, added or removed locally win, everything else is taken from the server
+const mergeDocuments = (
+  base: ApplicationDocument[] = [],
+  local: ApplicationDocument[] = [],
+  server: ApplicationDocument[] = []
+): ApplicationDocument[] => {
+  const baseByType = new Map(base.map((doc) => [doc.document_type, doc]));
+  const localByType = new Map(local.map((doc) => [doc.document_type, doc]));
+  const merged: ApplicationDocument[] = [];
+  for (const doc of server) {
+    const localDoc = localByType.get(doc.document_type);
+    const baseDoc = baseByType.get(doc.document_type);
+    if (localDoc && !sameDocument(localDoc, baseDoc)) {
+      merged.push(localDoc);
+    } else if (!localDoc && baseDoc) {
+      continue; // removed locally
+    } else {
+      merged.push(doc);
+    }
+  }
+  const serverTypes = new Set(server.map((doc) => doc.document_type));
+  for (const doc of local) {
+    if (!serverTypes.has(doc.document_type) && !sameDocument(doc, baseByType.get(doc.document_type))) {
+      merged.push(doc);
+    }
+  }
+  return merged;
+};
+
+// Local changes (local vs. base) applied on top of the server's current session
+const rebaseSnapshot = (
+  base: SessionSnapshot,
+  local: SessionSnapshot,
+  server: SessionSnapshot
+): SessionSnapshot => {
+  const applicationDocuments = { ...server.applicationDocuments };
+  for (const [foundationId, documents] of Object.entries(local.applicationDocuments)) {
+    if (documents !== base.applicationDocuments[foundationId]) {
+      applicationDocuments[foundationId] = mergeDocuments(
+        base.applicationDocuments[foundationId],
+        documents,
+        server.applicationDocuments[foundationId]
+      );
+    }
+  }
+  return {
+    foundationResults:
+      local.foundationResults !== base.foundationResults ? local.foundationResults : server.foundationResults,
+    projectQuery: local.projectQuery !== base.projectQuery ? local.projectQuery : server.projectQuery,
+    currentFoundationId:
+      local.currentFoundationId !== base.currentFoundationId ? local.currentFoundationId : server.currentFoundationId,
+    applicationDocuments,
+  };
+};
+
 type SessionContextType = {
   sessionId: string | null;
   chatMessages: ChatMessage[];
@@ -56,6 +156,13 @@ export const SessionProvider = ({ children }: SessionProviderProps) => {
   const [applicationDocuments, setApplicationDocuments] = useState<Record<string, ApplicationDocument[]>>({});
   const [isInitialized, setIsInitialized] = useState(false);
 
+  // State as last persisted, so saves only send what changed since then
+  const savedRef = useRef<(SessionSnapshot & { version: number }) | null>(null);
+
+  const rememberSaved = useCallback((data: NonNullable<SessionResponse['data']>) => {
+    savedRef.current = { version: data.version ?? 0, ...snapshotOf(data) };
+  }, []);
+
   // Check if session has application documents
   const hasApplicationDocuments = (data: SessionResponse['data']): boolean => {
     if (!data || !data.application_documents) return false;
@@ -98,6 +205,7 @@ export const SessionProvider = ({ children }: SessionProviderProps) => {
         setCurrentFoundationId(response.data.current_foundation_id || null);
         setApplicationDocuments(response.data.application_documents || {});
         setSessionId(id);
+        rememberSaved(response.data);
         
         // If session has application documents and we should navigate, go to application page
         if (shouldNavigate && hasApplicationDocuments(response.data)) {
@@ -116,7 +224,16 @@ export const SessionProvider = ({ children }: SessionProviderProps) => {
     } catch (error) {
       console.error("❌ Error loading session:", error);
     }
-  }, [router]);
+  }, [router, rememberSaved]);
+
+  // Take over the server's changes merged in by a rebase, unless the
+  // respective state was changed again while the save was in flight
+  const adoptRebased = useCallback((local: SessionSnapshot, rebased: SessionSnapshot) => {
+    setFoundationResults((current) => current === local.foundationResults ? rebased.foundationResults : current);
+    setProjectQuery((current) => current === local.projectQuery ? rebased.projectQuery : current);
+    setCurrentFoundationId((current) => current === local.currentFoundationId ? rebased.currentFoundationId : current);
+    setApplicationDocuments((current) => current === local.applicationDocuments ? rebased.applicationDocuments : current);
+  }, []);
 
   // Save session to backend and localStorage
   const saveSession = useCallback(async () => {
@@ -137,16 +254,59 @@ export const SessionProvider = ({ children }: SessionProviderProps) => {
     });
 
     try {
-      if (sessionId) {
+      const saved = savedRef.current;
+      if (sessionId && saved) {
+        // Send only what changed; chat messages are stored by the chat endpoint
+        const local: SessionSnapshot = { foundationResults, projectQuery, currentFoundationId, applicationDocuments };
+        let target = local;
+        let version = saved.version;
+        let operations = diffOperations(saved, local);
+        if (operations.length === 0) return;
+
+        for (let attempt = 0; ; attempt++) {
+          if (operations.length === 0) {
+            // Everything we changed is already on the server
+            savedRef.current = { version, ...target };
+            adoptRebased(local, target);
+            break;
+          }
+          try {
+            const response = await patchSession(sessionId, operations, version);
+            if (response?.success) {
+              savedRef.current = { version: response.version, ...target };
+              if (target !== local) adoptRebased(local, target);
+              console.log("✅ Session updated:", response.session_id, "version", response.version);
+            }
+            break;
+          } catch (error) {
+            if (!(error instanceof SessionConflictError)) throw error;
+            if (attempt >= MAX_CONFLICT_RETRIES) {
+              // Keep the local changes; the next save rebases them again
+              console.error("❌ Session keeps changing elsewhere; changes not saved yet:", sessionId);
+              break;
+            }
+            // Modified elsewhere since we loaded it: rebase our changes onto the current session
+            const latest = await getSession(sessionId);
+            if (!latest?.success || !latest.data) throw error;
+            const server = snapshotOf(latest.data);
+            target = rebaseSnapshot(saved, local, server);
+            version = latest.data.version ?? 0;
+            operations = diffOperations(server, target);
+            console.log("🔀 Session changed elsewhere, rebased", operations.length, "operation(s) onto version", version);
+          }
+        }
+      } else if (sessionId) {
         // Update existing session
         const response = await updateSession(sessionId, sessionData);
-        if (response?.success) {
+        if (response?.success && response.data) {
+          rememberSaved(response.data);
           console.log("✅ Session updated:", response.session_id);
         }
       } else {
         // Create new session
         const response = await createSession(sessionData);
         if (response?.success) {
+          if (response.data) rememberSaved(response.data);
           setSessionId(response.session_id);
           localStorage.setItem("sessionId", response.session_id);
           console.log("✅ Session created:", response.session_id);
@@ -155,7 +315,7 @@ export const SessionProvider = ({ children }: SessionProviderProps) => {
     } catch (error) {
       console.error("❌ Error saving session:", error);
     }
-  }, [sessionId, chatMessages, foundationResults, currentFoundationId, projectQuery, applicationDocuments]);
+  }, [sessionId, chatMessages, foundationResults, currentFoundationId, projectQuery, applicationDocuments, rememberSaved, adoptRebased]);
 
   // Load session ID from localStorage on mount
   useEffect(() => {
@@ -189,6 +349,7 @@ export const SessionProvider = ({ children }: SessionProviderProps) => {
     try {
       const response = await createSession(sessionData);
       if (response?.success) {
+        if (response.data) rememberSaved(response.data);
         setSessionId(response.session_id);
         localStorage.setItem("sessionId", response.session_id);
         console.log("✅ New session created:", response.session_id);
@@ -200,10 +361,11 @@ export const SessionProvider = ({ children }: SessionProviderProps) => {
       console.error("❌ Error creating session:", error);
       throw error;
     }
-  }, [sessionId]);
+  }, [sessionId, rememberSaved]);
 
   // Clear session
   const clearSession = useCallback(() => {
+    savedRef.current = null;
     setSessionId(null);
     setChatMessages([]);
     setFoundationResults([]);
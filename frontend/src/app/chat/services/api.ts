@@ -136,12 +136,32 @@ export type SessionResponse = {
     current_foundation_id?: string;
     project_query?: string;
     application_documents?: Record<string, ApplicationDocument[]>;
+    version: number;
     created_at: string;
     updated_at: string;
   };
   message?: string;
 };
 
+// Delta operations for PATCH /sessions/{id}, applied in order
+export type SessionOperation =
+  | { op: "append_messages"; messages: ChatMessage[] }
+  | { op: "set_current_foundation"; foundation_id: string | null }
+  | { op: "set_project_query"; project_query: string | null }
+  | { op: "set_foundation_results"; foundation_results: any[] }
+  | { op: "set_documents"; foundation_id: string; documents: ApplicationDocument[] }
+  | { op: "replace_document"; foundation_id: string; document: ApplicationDocument };
+
+export type PatchSessionResponse = {
+  success: boolean;
+  session_id: string;
+  version: number;
+  updated_at: string;
+  message?: string;
+};
+
+export class SessionConflictError extends Error {}
+
 // Create a new session
 export const createSession = async (data: SessionData): Promise<SessionResponse | null> => {
   try {
@@ -189,6 +209,37 @@ export const updateSession = async (
   }
 };
 
+// Apply delta operations to a session; throws SessionConflictError if
+// expectedVersion is given and the session was modified in the meantime
+export const patchSession = async (
+  sessionId: string,
+  operations: SessionOperation[],
+  expectedVersion?: number
+): Promise<PatchSessionResponse | null> => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/api/v1/sessions/${sessionId}`, {
+      method: "PATCH",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ operations, expected_version: expectedVersion }),
+    });
+
+    if (response.status === 409) {
+      throw new SessionConflictError("Session was modified concurrently");
+    }
+    if (!response.ok) {
+      throw new Error(`Backend error: ${response.status}`);
+    }
+
+    return await response.json();
+  } catch (error) {
+    if (error instanceof SessionConflictError) throw error;
+    console.error("Error patching session:", error);
+    return null;
+  }
+};
+
 // Get a session by ID
 export const getSession = async (sessionId: string): Promise<SessionResponse | null> => {
   try {
@@ -253,25 +304,25 @@ export const updateApplicationDocuments = async (
 };
 
 // List recent sessions
-export type SessionListItem = {
+export type SessionSummary = {
   session_id: string;
-  project_query?: string;
-  created_at: string;
+  title?: string | null;
+  message_count: number;
   updated_at: string;
-  chat_messages: ChatMessage[];
-  application_documents?: Record<string, ApplicationDocument[]>;
-  current_foundation_id?: string;
+  last_foundation_id?: string | null;
+  has_documents: boolean;
+  last_document_foundation_id?: string | null;
 };
 
-export type SessionListResponse = {
+export type SessionSummaryListResponse = {
   success: boolean;
   count: number;
-  sessions: SessionListItem[];
+  sessions: SessionSummary[];
 };
 
-export const listRecentSessions = async (limit: number = 3): Promise<SessionListResponse | null> => {
+export const listSessionSummaries = async (limit: number = 3): Promise<SessionSummaryListResponse | null> => {
   try {
-    const response = await fetch(`${API_BASE_URL}/api/v1/sessions?limit=${limit}`);
+    const response = await fetch(`${API_BASE_URL}/api/v1/sessions/summaries?limit=${limit}`);
 
     if (!response.ok) {
       throw new Error(`Backend error: ${response.status}`);
@@ -300,6 +351,7 @@ export type GeneratedDocument = {
   document: string;  // document_type
   text: string;      // generated content
   improvements?: string[];  // list of improvement suggestions
+  source?: "model" | "fallback";  // "fallback" = placeholder after generation failed
 };
 
 export type GenerateDocumentsResponse = {
@@ -337,11 +389,74 @@ export const generateDocuments = async (
   }
 };
 
+// Generate document content as a Server-Sent Events stream.
+// onDocument is called for each document as soon as it is finished;
+// the backend also stores each document in the session when it lands.
+export const generateDocumentsStream = async (
+  sessionId: string,
+  foundationId: string,
+  onDocument: (document: GeneratedDocument) => void
+): Promise<GenerateDocumentsResponse | null> => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/api/v1/documents/generate/stream`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({
+        session_id: sessionId,
+        foundation_id: foundationId,
+      }),
+    });
+
+    if (!response.ok || !response.body) {
+      throw new Error(`Backend error: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let result: GenerateDocumentsResponse | null = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        const event = rawEvent.match(/^event: (.*)$/m)?.[1];
+        const data = rawEvent.match(/^data: (.*)$/m)?.[1];
+        if (!event || !data) continue;
+
+        if (event === "document") {
+          onDocument(JSON.parse(data));
+        } else if (event === "done") {
+          result = JSON.parse(data);
+        } else if (event === "error") {
+          throw new Error(JSON.parse(data).detail);
+        }
+      }
+    }
+
+    return result;
+  } catch (error) {
+    console.error("Error generating documents:", error);
+    return null;
+  }
+};
+
 // Proofread document and get improvement suggestions
 export type ProofreadDocumentRequest = {
   document_text: string;
   document_type: string;
   existing_improvements?: string[];
+  // "diff" only re-analyzes paragraphs changed since the last proofread
+  mode?: "full" | "diff";
 };
 
 export type ProofreadDocumentResponse = {